@@ -1,25 +1,97 @@
 import datetime
+import functools
+import gc
 import logging
 import os
+import secrets
+import tempfile
 import time
 from pathlib import Path
 
-from dotenv import load_dotenv
+import redis
 from flask import Flask, redirect, render_template, request, url_for
+from flask_compress import Compress
 from flask_jwt_extended import JWTManager
 
+from app.config import load_environment
+
 logger = logging.getLogger(__name__)
 
 
-def create_app():
+# moment().format() tokens and their strftime equivalents
+MOMENT_FORMATS = {
+    "MMM DD, YYYY": "%b %d, %Y",
+    "YYYY-MM-DD": "%Y-%m-%d",
+    "MM/DD/YYYY": "%m/%d/%Y",
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_date_value(date_obj, python_format):
+    """strftime a datetime or ISO 8601 string, cached since list pages
+    render the same post timestamps over and over"""
+    if isinstance(date_obj, str):
+        try:
+            date_obj = datetime.datetime.fromisoformat(
+                date_obj.replace("Z", "+00:00"))
+        except ValueError:
+            return date_obj
+
+    return date_obj.strftime(python_format)
+
+
+class MockMoment:
+    """Minimal moment.js stand-in returned by the moment() template global"""
+
+    __slots__ = ("date",)
+
+    def __init__(self, date):
+        self.date = date
+
+    def format(self, format_str):
+        if not self.date:
+            return datetime.datetime.now().strftime("%b %d, %Y")
+
+        python_format = MOMENT_FORMATS.get(format_str, "%b %d, %Y")
+        return _format_date_value(self.date, python_format)
+
+
+@functools.lru_cache(maxsize=1)
+def _generated_secret_key():
+    """Random signing key for development and tests when none is
+    configured, made once per process so sessions and JWTs agree across
+    create_app calls"""
+    logger.warning(
+        "No JWT_SECRET_KEY, FLASK_SECRET_KEY or SECRET_KEY set; using a "
+        "random key. Sessions and tokens won't survive a restart or work "
+        "across workers."
+    )
+    return secrets.token_hex(32)
+
+
+@functools.lru_cache(maxsize=1)
+def _tune_gc():
+    """Move the objects built at startup out of the collector's way.
+
+    Modules, blueprints, templates and config live for the whole process,
+    so they are frozen into the permanent generation instead of being
+    rescanned by every collection, and the young generation threshold is
+    raised so short requests trigger fewer collections. Runs once per
+    process; PYTHON_GC_TUNE=0 turns it off.
+    """
+    if os.getenv("PYTHON_GC_TUNE", "1") != "1":
+        return
+    gc.collect()
+    gc.freeze()
+    gen0, gen1, gen2 = gc.get_threshold()
+    gc.set_threshold(gen0 * 10, gen1 * 2, gen2 * 2)
+
+
+def create_app(test_config=None):
     """Application factory pattern"""
 
     # Load environment variables
-    env_path = Path(__file__).resolve().parent.parent / ".env"
-    if env_path.exists():
-        load_dotenv(dotenv_path=env_path)
-    else:
-        load_dotenv()
+    load_environment()
 
     # Get the correct static and template paths
     app_dir = Path(__file__).resolve().parent  # app directory
@@ -30,6 +102,11 @@ def create_app():
     app = Flask(__name__, static_folder=str(static_dir),
                 template_folder=str(templates_dir))
 
+    # Serialize jsonify responses and parse request bodies with orjson
+    from app.utils.json_provider import OrjsonProvider
+
+    app.json = OrjsonProvider(app)
+
     # Configuration
     app.config["SECRET_KEY"] = (
         os.getenv("JWT_SECRET_KEY")
@@ -49,18 +126,92 @@ def create_app():
     app.config["SESSION_COOKIE_SAMESITE"] = "Lax"
     app.config["MAX_COOKIE_SIZE"] = 4000
 
+    # Response compression (blog HTML/JSON and PDF downloads)
+    app.config["COMPRESS_MIMETYPES"] = [
+        "text/html",
+        "text/css",
+        "application/json",
+        "application/pdf",
+    ]
+    app.config["COMPRESS_LEVEL"] = 6
+    app.config["COMPRESS_MIN_SIZE"] = 1024
+
+    # Request bodies are a URL or a login form; larger ones get a 413
+    app.config["MAX_CONTENT_LENGTH"] = int(
+        os.getenv("MAX_CONTENT_LENGTH", str(16 * 1024)))
+
     # GA configuration
     app.config["GA_MEASUREMENT_ID"] = os.getenv("GA_MEASUREMENT_ID", "")
 
+    # Have the generate page submit jobs and poll instead of holding a
+    # worker thread for the whole generation. On by default when Redis is
+    # configured, since job results must be visible to every worker.
+    async_default = "true" if os.getenv("REDIS_URL") else "false"
+    app.config["ASYNC_BLOG_GENERATION"] = (
+        os.getenv("ASYNC_BLOG_GENERATION", async_default).lower() == "true"
+    )
+
+    # Item limit for the in-memory large data storage (LRU eviction)
+    app.config["TEMP_STORAGE_MAX_ITEMS"] = int(
+        os.getenv("TEMP_STORAGE_MAX_ITEMS", "1000"))
+
+    # Rendered PDFs are cached on disk by content, shared between workers;
+    # the least recently served beyond the limit are removed (0 disables)
+    app.config["PDF_CACHE_DIR"] = os.getenv("PDF_CACHE_DIR") or os.path.join(
+        tempfile.gettempdir(), "blog-pdf-cache")
+    app.config["PDF_CACHE_MAX_FILES"] = int(
+        os.getenv("PDF_CACHE_MAX_FILES", "64"))
+
+    # Processes rendering PDFs off the request threads (0 renders inline)
+    app.config["PDF_WORKERS"] = int(os.getenv("PDF_WORKERS", "0"))
+
+    # Seconds a CPU/memory/disk sample is reused by the health endpoints,
+    # so frequent probes don't each block on a fresh CPU measurement
+    app.config["HEALTH_STATS_TTL"] = float(
+        os.getenv("HEALTH_STATS_TTL", "5"))
+
+    # Overrides for isolated instances (e.g. TESTING for the test suite)
+    if test_config:
+        app.config.update(test_config)
+
+    # A random key only suits development and tests: each production
+    # worker would sign sessions and tokens with a different one
+    if not app.config["SECRET_KEY"]:
+        if not (app.debug or app.testing):
+            raise RuntimeError(
+                "No JWT_SECRET_KEY, FLASK_SECRET_KEY or SECRET_KEY set")
+        app.config["SECRET_KEY"] = _generated_secret_key()
+        app.config["JWT_SECRET_KEY"] = app.config["SECRET_KEY"]
+
     # In-memory storage for large session data
     app.temp_storage = {}
 
+    # Landing page HTML for anonymous visitors, rendered on first request
+    app.anonymous_index_html = None
+
+    # Recently verified JWT claims by token digest (see _decode_claims)
+    app.token_claims = {}
+
+    # Latest (expiry, stats) system sample served by the health endpoints
+    app.system_stats = None
+
+    # Shared Redis storage for large session data (used when configured)
+    redis_url = os.getenv("REDIS_URL")
+    app.redis_client = (
+        redis.Redis.from_url(redis_url, socket_keepalive=True)
+        if redis_url
+        else None
+    )
+
     # Set application start time
     app.start_time = time.time()
 
     # Initialize JWT
     JWTManager(app)
 
+    # Initialize response compression
+    Compress(app)
+
     # Register blueprints
     from app.routes.auth import auth_bp
     from app.routes.blog import blog_bp
@@ -75,65 +226,29 @@ def create_app():
     from app.monitoring.metrics import setup_metrics
     from app.monitoring.tracing import setup_tracing
 
-    setup_metrics(app)
+    # Logging first: the metrics log filter attaches to the queue handlers
+    # it installs, so request context is added before records are queued
     setup_logging(app)
+    setup_metrics(app)
     setup_tracing(app)
 
-    # Context processors
-    from app.utils.security import inject_config, inject_user
+    # Context processors (Flask already exposes config to templates)
+    from app.utils.security import inject_user
 
-    app.context_processor(inject_config)
     app.context_processor(inject_user)
 
     # Template helper functions
     @app.template_global()
     def format_date(date_obj=None):
         """Format date for template use"""
-        import datetime
-
         if date_obj is None:
-            date_obj = datetime.datetime.now(datetime.UTC)
-
-        if isinstance(date_obj, str):
-            try:
-                date_obj = datetime.datetime.fromisoformat(
-                    date_obj.replace("Z", "+00:00")
-                )
-            except (ValueError, TypeError):
-                return date_obj
+            return datetime.datetime.now(datetime.UTC).strftime("%b %d, %Y")
 
-        return date_obj.strftime("%b %d, %Y")
+        return _format_date_value(date_obj, "%b %d, %Y")
 
     @app.template_global()
     def moment(date_obj=None):
         """Moment.js style date formatting"""
-        import datetime
-
-        class MockMoment:
-            def __init__(self, date):
-                self.date = date
-
-            def format(self, format_str):
-                if not self.date:
-                    return datetime.datetime.now().strftime("%b %d, %Y")
-
-                if isinstance(self.date, str):
-                    try:
-                        self.date = datetime.datetime.fromisoformat(
-                            self.date.replace("Z", "+00:00")
-                        )
-                    except (ValueError, TypeError):
-                        return self.date
-
-                format_map = {
-                    "MMM DD, YYYY": "%b %d, %Y",
-                    "YYYY-MM-DD": "%Y-%m-%d",
-                    "MM/DD/YYYY": "%m/%d/%Y",
-                }
-
-                python_format = format_map.get(format_str, "%b %d, %Y")
-                return self.date.strftime(python_format)
-
         return MockMoment(date_obj)
 
     @app.template_filter("nl2br")
@@ -148,31 +263,25 @@ def create_app():
     def unauthorized(error):
         """Handle unauthorized access"""
         logger.warning(
-            f"Unauthorized access attempt from {request.remote_addr}")
+            "Unauthorized access attempt from %s", request.remote_addr)
         return redirect(url_for("auth.login"))
 
     @app.errorhandler(404)
     def not_found(error):
         """Handle 404 errors"""
-        logger.warning(f"404 error for {request.url}")
+        logger.warning("404 error for %s", request.url)
         return render_template("error.html", error="Page not found"), 404
 
     @app.errorhandler(500)
     def internal_error(error):
         """Handle 500 errors"""
-        logger.error(f"Internal server error: {error}", exc_info=True)
+        # Flask has already logged the traceback of an unhandled exception
+        # (app.log_exception) before this handler runs
+        logger.error("Internal server error: %s", error)
         return render_template(
             "error.html", error="Internal server error"), 500
 
-    # Application cleanup
-    @app.teardown_appcontext
-    def cleanup_app_context(error):
-        """Cleanup resources on app context teardown"""
-        import gc
-
-        try:
-            gc.collect()
-        except Exception:
-            pass
+    if not app.config.get("TESTING"):
+        _tune_gc()
 
     return app
@@ -1,19 +1,30 @@
 import datetime
+import functools
 import os
 from pathlib import Path
 
 from dotenv import load_dotenv
 
+ENV_PATH = Path(__file__).resolve().parent.parent / ".env"
+
+
+@functools.lru_cache(maxsize=1)
+def load_environment():
+    """Load the project's .env into os.environ, once per process.
+
+    Variables already set in the environment take precedence.
+    """
+    if ENV_PATH.exists():
+        load_dotenv(dotenv_path=ENV_PATH)
+    else:
+        load_dotenv()
+
 
 class Config:
     """Base configuration class"""
 
     # Load environment variables
-    env_path = Path(__file__).resolve().parent.parent / ".env"
-    if env_path.exists():
-        load_dotenv(dotenv_path=env_path)
-    else:
-        load_dotenv()
+    load_environment()
 
     # Security
     SECRET_KEY = (
@@ -37,6 +48,9 @@ class Config:
     # Database
     MONGODB_URI = os.getenv("MONGODB_URI")
 
+    # Shared storage for large session data
+    REDIS_URL = os.getenv("REDIS_URL")
+
     # External APIs
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     SUPADATA_API_KEY = os.getenv("SUPADATA_API_KEY")
@@ -48,6 +62,9 @@ class Config:
     LOKI_URL = os.getenv("LOKI_URL", "http://YOUR_DROPLET_IP:3100")
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     SHARED_LOG_PATH = os.getenv("SHARED_LOG_PATH", "/shared-logs")
+    PROMETHEUS_ENABLED = os.getenv("PROMETHEUS_ENABLED", "true")
+    REQUEST_TRACING_ENABLED = os.getenv("REQUEST_TRACING_ENABLED", "true")
+    REQUEST_TRACING_SAMPLE_RATE = os.getenv("REQUEST_TRACING_SAMPLE_RATE", "1.0")
 
 
 class DevelopmentConfig(Config):
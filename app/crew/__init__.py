@@ -1,10 +1,23 @@
-from .agents import create_agents
-from .crew import BlogGenerationCrew
-from .tasks import create_tasks
-from .tools import PDFGeneratorTool
+import importlib
+
+# Submodules are imported on first attribute access: agents, tasks and crew
+# pull in crewai, which should not be paid for by importers of tools alone.
+_LAZY_ATTRIBUTES = {
+    "create_agents": ".agents",
+    "BlogGenerationCrew": ".crew",
+    "create_tasks": ".tasks",
+    "PDFGeneratorTool": ".tools",
+}
 
 __all__ = [
     "create_agents",
     "create_tasks",
     "BlogGenerationCrew",
     "PDFGeneratorTool"]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
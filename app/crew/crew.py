@@ -16,7 +16,7 @@ class BlogGenerationCrew:
 
     def generate_blog(self, youtube_url: str, language: str = "en") -> str:
         try:
-            logger.info(f"Starting CrewAI blog generation for: {youtube_url}")
+            logger.info("Starting CrewAI blog generation for: %s", youtube_url)
 
             # Create agents and tasks fresh for each request
             transcriber, writer = create_agents()
@@ -54,14 +54,14 @@ class BlogGenerationCrew:
                 except (TypeError, ValueError, AttributeError) as e:
                     # Handle case where object claims to be iterable but isn't
                     logger.debug(
-                        f"Object appeared iterable but failed to iterate: {e}")
+                        "Object appeared iterable but failed to iterate: %s", e)
 
             logger.info(
-                f"CrewAI execution completed: {len(str(result))} characters")
+                "CrewAI execution completed: %s characters", len(str(result)))
             return str(result)
 
         except Exception as e:
-            logger.error(f"CrewAI blog generation failed: {str(e)}")
+            logger.error("CrewAI blog generation failed: %s", e)
             # Handle specific Mock iteration errors by providing more
             # meaningful message
             error_msg = str(e)
@@ -24,7 +24,7 @@ def create_tasks(transcriber, writer, youtube_url, language):
         ),
         agent=transcriber,
         callback=lambda task: logger.info(
-            f"Transcript task completed: {task.output[:100] if task.output else 'No output'}..."
+            "Transcript task completed: %s...", (task.output[:100] if task.output else 'No output')
         ),
     )
 
@@ -56,7 +56,7 @@ def create_tasks(transcriber, writer, youtube_url, language):
         agent=writer,
         context=[transcript_task],
         callback=lambda task: logger.info(
-            f"Blog task completed: {len(task.output) if task.output else 0} characters"
+            "Blog task completed: %s characters", (len(task.output) if task.output else 0)
         ),
     )
 
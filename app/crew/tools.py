@@ -1,4 +1,3 @@
-import gc
 import logging
 import re
 
@@ -20,6 +19,35 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# ASCII equivalents for common Unicode characters, applied with str.translate
+UNICODE_REPLACEMENTS = str.maketrans(
+    {
+        "\u2014": "--",  # em dash
+        "\u2013": "-",  # en dash
+        "\u2019": "'",  # right single quotation mark
+        "\u2018": "'",  # left single quotation mark
+        "\u201c": '"',  # left double quotation mark
+        "\u201d": '"',  # right double quotation mark
+        "\u2026": "...",  # horizontal ellipsis
+        "\u00a0": " ",  # non-breaking space
+        "\u2022": "*",  # bullet point
+        "\u2010": "-",  # hyphen
+        "\u00ad": "-",  # soft hyphen
+        "\u00b7": "*",  # middle dot
+        "\u25cf": "*",  # black circle
+        "\u2212": "-",  # minus sign
+        "\u00d7": "x",  # multiplication sign
+        "\u00f7": "/",  # division sign
+        "\u2190": "<-",  # leftwards arrow
+        "\u2192": "->",  # rightwards arrow
+        "\u2191": "^",  # upwards arrow
+        "\u2193": "v",  # downwards arrow
+    }
+)
+NON_ASCII_PATTERN = re.compile(r"[^\x00-\x7f]")
+TITLE_PATTERN = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+NUMBERED_ITEM_PATTERN = re.compile(r"(\d+\.\s+)(.+)")
+
 
 class PDFGeneratorTool:
     def __init__(self):
@@ -31,43 +59,15 @@ class PDFGeneratorTool:
             return text
 
         # Replace common Unicode characters with ASCII equivalents
-        unicode_replacements = {
-            "\u2014": "--",  # em dash
-            "\u2013": "-",  # en dash
-            "\u2019": "'",  # right single quotation mark
-            "\u2018": "'",  # left single quotation mark
-            "\u201c": '"',  # left double quotation mark
-            "\u201d": '"',  # right double quotation mark
-            "\u2026": "...",  # horizontal ellipsis
-            "\u00a0": " ",  # non-breaking space
-            "\u2022": "*",  # bullet point
-            "\u2010": "-",  # hyphen
-            "\u00ad": "-",  # soft hyphen
-            "\u00b7": "*",  # middle dot
-            "\u25cf": "*",  # black circle
-            "\u2212": "-",  # minus sign
-            "\u00d7": "x",  # multiplication sign
-            "\u00f7": "/",  # division sign
-            "\u2190": "<-",  # leftwards arrow
-            "\u2192": "->",  # rightwards arrow
-            "\u2191": "^",  # upwards arrow
-            "\u2193": "v",  # downwards arrow
-        }
-
-        for unicode_char, replacement in unicode_replacements.items():
-            text = text.replace(unicode_char, replacement)
-
-        # Remove any remaining non-ASCII characters but keep basic punctuation
-        cleaned_text = ""
-        for char in text:
-            if ord(char) < 128:
-                cleaned_text += char
-            elif char.isspace():
-                cleaned_text += " "
-            else:
-                cleaned_text += "?"  # Replace unknown chars with ?
+        text = text.translate(UNICODE_REPLACEMENTS)
+        if text.isascii():
+            return text
 
-        return cleaned_text
+        # Replace any remaining non-ASCII characters: whitespace becomes a
+        # space, anything else a "?"
+        return NON_ASCII_PATTERN.sub(
+            lambda match: " " if match.group().isspace() else "?", text
+        )
 
     def _add_header_footer(self, pdf: FPDF) -> None:
         """Add header and footer to PDF"""
@@ -83,163 +83,168 @@ class PDFGeneratorTool:
         pdf.set_text_color(128, 128, 128)
         pdf.cell(0, 10, f"Page {pdf.page_no()}", 0, 0, "C")
 
-    def generate_pdf_bytes(self, content: str) -> bytes:
-        """Generate PDF with proper width and formatting"""
-        pdf = None
-        try:
-            # Clean the content first
-            content = self._clean_unicode_text(content)
-
-            # Create PDF with A4 size and proper margins
-            pdf = FPDF(orientation="P", unit="mm", format="A4")
-            pdf.add_page()
-
-            # Set proper margins for full width utilization
-            pdf.set_margins(15, 15, 15)  # Left, Top, Right margins
-            pdf.set_auto_page_break(auto=True, margin=20)  # Bottom margin
-
-            # Calculate effective width
-            effective_width = pdf.w - 30  # 210mm - 30mm (margins)
-
-            # Extract and add title
-            title_match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
-            title = title_match.group(
-                1) if title_match else "Generated Blog Article"
-            title = self._clean_unicode_text(title)
-
-            # Title formatting
-            pdf.set_font("helvetica", "B", 18)
-            pdf.set_text_color(44, 62, 80)
-
-            # Check if title is too long and break it if necessary
-            title_width = pdf.get_string_width(title)
-            if title_width > effective_width:
-                # Break long titles into multiple lines
-                words = title.split()
-                lines = []
-                current_line = ""
-
-                for word in words:
-                    test_line = current_line + \
-                        (" " if current_line else "") + word
-                    if pdf.get_string_width(test_line) <= effective_width:
-                        current_line = test_line
+    def _build_pdf(self, content: str) -> FPDF:
+        """Lay out the blog content as an A4 document"""
+        # Clean the content first
+        content = self._clean_unicode_text(content)
+
+        # Create PDF with A4 size and proper margins
+        pdf = FPDF(orientation="P", unit="mm", format="A4")
+        pdf.add_page()
+
+        # Set proper margins for full width utilization
+        pdf.set_margins(15, 15, 15)  # Left, Top, Right margins
+        pdf.set_auto_page_break(auto=True, margin=20)  # Bottom margin
+
+        # Calculate effective width
+        effective_width = pdf.w - 30  # 210mm - 30mm (margins)
+
+        # Extract and add title
+        title_match = TITLE_PATTERN.search(content)
+        title = title_match.group(
+            1) if title_match else "Generated Blog Article"
+        title = self._clean_unicode_text(title)
+
+        # Title formatting
+        pdf.set_font("helvetica", "B", 18)
+        pdf.set_text_color(44, 62, 80)
+
+        # Check if title is too long and break it if necessary
+        title_width = pdf.get_string_width(title)
+        if title_width > effective_width:
+            # Break long titles into multiple lines
+            words = title.split()
+            lines = []
+            current_line = ""
+
+            for word in words:
+                test_line = current_line + \
+                    (" " if current_line else "") + word
+                if pdf.get_string_width(test_line) <= effective_width:
+                    current_line = test_line
+                else:
+                    if current_line:
+                        lines.append(current_line)
+                        current_line = word
                     else:
-                        if current_line:
-                            lines.append(current_line)
-                            current_line = word
-                        else:
-                            lines.append(word)
-
-                if current_line:
-                    lines.append(current_line)
-
-                # Output multi-line title
-                for i, line in enumerate(lines):
-                    pdf.cell(0, 12, line, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-                    if i < len(lines) - 1:
-                        pdf.ln(2)
-            else:
-                pdf.cell(0, 15, title, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+                        lines.append(word)
 
-            pdf.ln(10)
+            if current_line:
+                lines.append(current_line)
 
-            # Add a separator line
-            pdf.set_draw_color(102, 126, 234)
-            pdf.set_line_width(0.8)
-            pdf.line(15, pdf.get_y(), pdf.w - 15, pdf.get_y())
-            pdf.ln(8)
-
-            # Process content line by line
-            lines = content.split("\n")
-
-            for line in lines:
-                line = line.strip()
-
-                if not line:
-                    pdf.ln(4)
-                    continue
+            # Output multi-line title
+            for i, line in enumerate(lines):
+                pdf.cell(0, 12, line, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+                if i < len(lines) - 1:
+                    pdf.ln(2)
+        else:
+            pdf.cell(0, 15, title, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
 
-                # Skip the main title as it's already added
-                if line.startswith("# "):
-                    continue
+        pdf.ln(10)
 
-                # Handle main headings (##)
-                if line.startswith("## "):
-                    pdf.ln(6)
-                    pdf.set_font("helvetica", "B", 14)
-                    pdf.set_text_color(44, 62, 80)
-                    heading_text = self._clean_unicode_text(line[3:])
+        # Add a separator line
+        pdf.set_draw_color(102, 126, 234)
+        pdf.set_line_width(0.8)
+        pdf.line(15, pdf.get_y(), pdf.w - 15, pdf.get_y())
+        pdf.ln(8)
 
-                    if pdf.get_string_width(heading_text) > effective_width:
-                        pdf.multi_cell(0, 8, heading_text)
-                    else:
-                        pdf.cell(0, 10, heading_text, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-                    pdf.ln(4)
-                    continue
+        # Process content line by line
+        lines = content.split("\n")
 
-                # Handle sub-headings (###)
-                elif line.startswith("### "):
-                    pdf.ln(4)
-                    pdf.set_font("helvetica", "B", 12)
-                    pdf.set_text_color(52, 73, 94)
-                    heading_text = self._clean_unicode_text(line[4:])
+        for line in lines:
+            line = line.strip()
 
-                    if pdf.get_string_width(heading_text) > effective_width:
-                        pdf.multi_cell(0, 7, heading_text)
-                    else:
-                        pdf.cell(0, 8, heading_text, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-                    pdf.ln(3)
-                    continue
-
-                # Handle bullet lists
-                elif line.startswith("- "):
-                    pdf.set_font("helvetica", "", 11)
-                    pdf.set_text_color(0, 0, 0)
-                    list_text = self._clean_unicode_text(line[2:])
-
-                    pdf.set_x(25)
-                    pdf.cell(5, 6, "*", ln=False)
-                    pdf.set_x(30)
-
-                    available_width = effective_width - 15
-                    pdf.multi_cell(available_width, 6, list_text)
-                    pdf.ln(2)
-                    continue
+            if not line:
+                pdf.ln(4)
+                continue
 
-                # Handle numbered lists
-                elif re.match(r"^\d+\.\s+", line):
-                    pdf.set_font("helvetica", "", 11)
-                    pdf.set_text_color(0, 0, 0)
+            # Skip the main title as it's already added
+            if line.startswith("# "):
+                continue
 
-                    match = re.match(r"^(\d+\.\s+)(.+)", line)
-                    if match:
-                        number = match.group(1)
-                        text = self._clean_unicode_text(match.group(2))
+            # Handle main headings (##)
+            if line.startswith("## "):
+                pdf.ln(6)
+                pdf.set_font("helvetica", "B", 14)
+                pdf.set_text_color(44, 62, 80)
+                heading_text = self._clean_unicode_text(line[3:])
 
-                        pdf.set_x(25)
-                        number_width = pdf.get_string_width(number)
-                        pdf.cell(number_width + 2, 6, number, ln=False)
-                        pdf.set_x(25 + number_width + 2)
+                if pdf.get_string_width(heading_text) > effective_width:
+                    pdf.multi_cell(0, 8, heading_text)
+                else:
+                    pdf.cell(0, 10, heading_text, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+                pdf.ln(4)
+                continue
+
+            # Handle sub-headings (###)
+            elif line.startswith("### "):
+                pdf.ln(4)
+                pdf.set_font("helvetica", "B", 12)
+                pdf.set_text_color(52, 73, 94)
+                heading_text = self._clean_unicode_text(line[4:])
+
+                if pdf.get_string_width(heading_text) > effective_width:
+                    pdf.multi_cell(0, 7, heading_text)
+                else:
+                    pdf.cell(0, 8, heading_text, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+                pdf.ln(3)
+                continue
+
+            # Handle bullet lists
+            elif line.startswith("- "):
+                pdf.set_font("helvetica", "", 11)
+                pdf.set_text_color(0, 0, 0)
+                list_text = self._clean_unicode_text(line[2:])
+
+                pdf.set_x(25)
+                pdf.cell(5, 6, "*", ln=False)
+                pdf.set_x(30)
+
+                available_width = effective_width - 15
+                pdf.multi_cell(available_width, 6, list_text)
+                pdf.ln(2)
+                continue
+
+            # Handle numbered lists
+            elif line[0].isdigit() and (
+                match := NUMBERED_ITEM_PATTERN.match(line)
+            ):
+                pdf.set_font("helvetica", "", 11)
+                pdf.set_text_color(0, 0, 0)
+
+                number = match.group(1)
+                text = self._clean_unicode_text(match.group(2))
+
+                pdf.set_x(25)
+                number_width = pdf.get_string_width(number)
+                pdf.cell(number_width + 2, 6, number, ln=False)
+                pdf.set_x(25 + number_width + 2)
+
+                available_width = effective_width - (number_width + 12)
+                pdf.multi_cell(available_width, 6, text)
+                pdf.ln(2)
+                continue
+
+            # Handle regular paragraphs
+            else:
+                pdf.set_font("helvetica", "", 11)
+                pdf.set_text_color(0, 0, 0)
+                paragraph_text = self._clean_unicode_text(line)
 
-                        available_width = effective_width - (number_width + 12)
-                        pdf.multi_cell(available_width, 6, text)
-                        pdf.ln(2)
-                    continue
+                if paragraph_text:
+                    pdf.multi_cell(0, 7, paragraph_text, align="J")
+                    pdf.ln(4)
 
-                # Handle regular paragraphs
-                else:
-                    pdf.set_font("helvetica", "", 11)
-                    pdf.set_text_color(0, 0, 0)
-                    paragraph_text = self._clean_unicode_text(line)
+        # Add page numbers for multi-page documents
+        if pdf.page_no() > 1:
+            self._add_header_footer(pdf)
 
-                    if paragraph_text:
-                        pdf.multi_cell(0, 7, paragraph_text, align="J")
-                        pdf.ln(4)
+        return pdf
 
-            # Add page numbers for multi-page documents
-            if pdf.page_no() > 1:
-                self._add_header_footer(pdf)
+    def generate_pdf_bytes(self, content: str) -> bytes:
+        """Generate PDF with proper width and formatting"""
+        try:
+            pdf = self._build_pdf(content)
 
             # Generate PDF bytes
             try:
@@ -258,9 +263,14 @@ class PDFGeneratorTool:
                 return bytes(str(pdf_output), "latin1")
 
         except Exception as e:
-            logger.error(f"PDF generation failed: {str(e)}")
+            logger.error("PDF generation failed: %s", e)
+            raise RuntimeError(f"PDF generation error: {str(e)}")
+
+    def write_pdf(self, content: str, fileobj) -> None:
+        """Generate the PDF straight into a binary file object, without
+        copying the finished document into a bytes object first"""
+        try:
+            self._build_pdf(content).output(fileobj)
+        except Exception as e:
+            logger.error("PDF generation failed: %s", e)
             raise RuntimeError(f"PDF generation error: {str(e)}")
-        finally:
-            if pdf:
-                pdf = None
-            gc.collect()
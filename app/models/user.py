@@ -13,34 +13,43 @@ from werkzeug.security import check_password_hash, generate_password_hash
 logger = logging.getLogger(__name__)
 
 
-# Windows COM initialization for threading compatibility
-def _initialize_com_for_thread():
-    """Initialize COM for the current thread on Windows"""
+# Windows COM initialization for threading compatibility. The platform and
+# pythoncom availability are resolved once at import; elsewhere these are
+# no-ops.
+if sys.platform == "win32":
     try:
-        if sys.platform == "win32":
-            import pythoncom
-
-            pythoncom.CoInitialize()
-            logger.debug("COM initialized for thread")
+        import pythoncom
     except ImportError:
         # pythoncom not available, continue without COM init
-        pass
-    except Exception as e:
-        logger.warning(f"COM initialization failed: {e}")
+        pythoncom = None
+else:
+    pythoncom = None
 
+if pythoncom is not None:
 
-def _uninitialize_com_for_thread():
-    """Uninitialize COM for the current thread on Windows"""
-    try:
-        if sys.platform == "win32":
-            import pythoncom
+    def _initialize_com_for_thread():
+        """Initialize COM for the current thread on Windows"""
+        try:
+            pythoncom.CoInitialize()
+            logger.debug("COM initialized for thread")
+        except Exception as e:
+            logger.warning("COM initialization failed: %s", e)
 
+    def _uninitialize_com_for_thread():
+        """Uninitialize COM for the current thread on Windows"""
+        try:
             pythoncom.CoUninitialize()
             logger.debug("COM uninitialized for thread")
-    except ImportError:
-        pass
-    except Exception as e:
-        logger.warning(f"COM uninitialization failed: {e}")
+        except Exception as e:
+            logger.warning("COM uninitialization failed: %s", e)
+
+else:
+
+    def _initialize_com_for_thread():
+        """No COM to initialize on this platform"""
+
+    def _uninitialize_com_for_thread():
+        """No COM to uninitialize on this platform"""
 
 
 class MongoDBConnectionManager:
@@ -98,7 +107,7 @@ class MongoDBConnectionManager:
                 if len(self._mongodb_uri) > 40
                 else "***"
             )
-            logger.info(f"Connecting to MongoDB: {masked_uri}")
+            logger.info("Connecting to MongoDB: %s", masked_uri)
 
             # Use the simplest connection that we know works from testing
             logger.info("Attempting MongoDB connection...")
@@ -111,12 +120,12 @@ class MongoDBConnectionManager:
             logger.info("Testing MongoDB connection...")
             result = self.client.server_info()
             logger.info(
-                f"MongoDB server version: {result.get('version', 'unknown')}")
+                "MongoDB server version: %s", result.get('version', 'unknown'))
 
             # Test ping
             self.client.admin.command("ping")
             logger.info(
-                f"MongoDB connected successfully to database: {self._mongodb_db_name}")
+                "MongoDB connected successfully to database: %s", self._mongodb_db_name)
 
         except Exception as e:
             # Handle Windows encoding issues in error messages
@@ -130,9 +139,9 @@ class MongoDBConnectionManager:
                 error_trace = "Traceback unavailable due to encoding error"
 
             logger.error(
-                f"All MongoDB connection attempts failed: {error_str}")
-            logger.error(f"Error type: {error_type}")
-            logger.error(f"Full traceback: {error_trace}")
+                "All MongoDB connection attempts failed: %s", error_str)
+            logger.error("Error type: %s", error_type)
+            logger.error("Full traceback: %s", error_trace)
             self.close_connection()
 
             # Create a simplified error for Windows compatibility
@@ -156,7 +165,7 @@ class MongoDBConnectionManager:
                 self.db = None
                 logger.info("MongoDB connection closed successfully")
         except Exception as e:
-            logger.error(f"Error closing MongoDB connection: {str(e)}")
+            logger.error("Error closing MongoDB connection: %s", e)
 
     def get_database(self):
         """Get database instance"""
@@ -197,8 +206,9 @@ class BaseModel:
     """Base model class with common MongoDB operations"""
 
     def __init__(self, collection_name):
+        # No connection work here: models are created per request and
+        # get_collection() already checks the shared connection
         self.collection_name = collection_name
-        self._ensure_connection()
 
     def _ensure_connection(self):
         """Ensure MongoDB connection is available"""
@@ -206,7 +216,7 @@ class BaseModel:
             if not mongo_manager.is_connected():
                 mongo_manager.reconnect()
         except Exception as e:
-            logger.error(f"Failed to ensure MongoDB connection: {str(e)}")
+            logger.error("Failed to ensure MongoDB connection: %s", e)
             raise
 
     def get_collection(self):
@@ -216,7 +226,7 @@ class BaseModel:
             return mongo_manager.get_collection(self.collection_name)
         except Exception as e:
             logger.error(
-                f"Failed to get collection {self.collection_name}: {str(e)}")
+                "Failed to get collection %s: %s", self.collection_name, e)
             raise
 
     def __del__(self):
@@ -232,7 +242,6 @@ class User(BaseModel):
 
     def create_user(self, username, email, password):
         """Create a new user"""
-        collection = None
         try:
             collection = self.get_collection()
 
@@ -271,7 +280,7 @@ class User(BaseModel):
                     # Convert ObjectId to string and remove sensitive data
                     user["_id"] = str(user["_id"])
                     user.pop("password_hash", None)
-                    logger.info(f"User created successfully: {username}")
+                    logger.info("User created successfully: %s", username)
 
                     return {
                         "success": True,
@@ -282,14 +291,11 @@ class User(BaseModel):
             return {"success": False, "message": "Failed to create user"}
 
         except Exception as e:
-            logger.error(f"Create user error: {str(e)}")
+            logger.error("Create user error: %s", e)
             return {"success": False, "message": f"Database error: {str(e)}"}
-        finally:
-            collection = None
 
     def authenticate_user(self, email, password):
         """Authenticate user with email and password"""
-        collection = None
         try:
             collection = self.get_collection()
 
@@ -300,21 +306,18 @@ class User(BaseModel):
                 # Convert ObjectId to string and remove sensitive data
                 user["_id"] = str(user["_id"])
                 user.pop("password_hash", None)
-                logger.info(f"User authenticated successfully: {email}")
+                logger.info("User authenticated successfully: %s", email)
                 return user
 
-            logger.warning(f"Authentication failed for: {email}")
+            logger.warning("Authentication failed for: %s", email)
             return None
 
         except Exception as e:
-            logger.error(f"Authentication error: {str(e)}")
+            logger.error("Authentication error: %s", e)
             return None
-        finally:
-            collection = None
 
     def get_user_by_id(self, user_id):
         """Get user by ID"""
-        collection = None
         try:
             collection = self.get_collection()
 
@@ -323,7 +326,7 @@ class User(BaseModel):
                 try:
                     user_id = ObjectId(user_id)
                 except Exception:
-                    logger.error(f"Invalid ObjectId format: {user_id}")
+                    logger.error("Invalid ObjectId format: %s", user_id)
                     return None
 
             user = collection.find_one({"_id": user_id})
@@ -337,14 +340,11 @@ class User(BaseModel):
             return None
 
         except Exception as e:
-            logger.error(f"Get user by ID error: {str(e)}")
+            logger.error("Get user by ID error: %s", e)
             return None
-        finally:
-            collection = None
 
     def update_user(self, user_id, update_data):
         """Update user information"""
-        collection = None
         try:
             collection = self.get_collection()
 
@@ -361,10 +361,8 @@ class User(BaseModel):
             return result.modified_count > 0
 
         except Exception as e:
-            logger.error(f"Update user error: {str(e)}")
+            logger.error("Update user error: %s", e)
             return False
-        finally:
-            collection = None
 
 
 class BlogPost(BaseModel):
@@ -374,9 +372,9 @@ class BlogPost(BaseModel):
         super().__init__("blog_posts")
         logger.debug("BlogPost model initialized")
 
-    def create_post(self, user_id, youtube_url, title, content, video_id):
-        """Create a new blog post"""
-        collection = None
+    def create_post(self, user_id, youtube_url, title, content, video_id,
+                    word_count=None):
+        """Create a new blog post (word_count is computed if not given)"""
         try:
             collection = self.get_collection()
 
@@ -390,7 +388,10 @@ class BlogPost(BaseModel):
                 "title": title,
                 "content": content,
                 "video_id": video_id,
-                "word_count": len(content.split()),
+                "word_count": (
+                    word_count if word_count is not None
+                    else len(content.split())
+                ),
                 "created_at": datetime.datetime.now(datetime.UTC),
                 "updated_at": datetime.datetime.now(datetime.UTC),
             }
@@ -401,20 +402,17 @@ class BlogPost(BaseModel):
                 # Convert ObjectIds to strings
                 post_data["_id"] = str(result.inserted_id)
                 post_data["user_id"] = str(post_data["user_id"])
-                logger.info(f"Blog post created successfully: {title}")
+                logger.info("Blog post created successfully: %s", title)
                 return post_data
 
             return None
 
         except Exception as e:
-            logger.error(f"Create blog post error: {str(e)}")
+            logger.error("Create blog post error: %s", e)
             return None
-        finally:
-            collection = None
 
     def get_user_posts(self, user_id, limit=50, skip=0):
         """Get all posts for a user with pagination"""
-        collection = None
         try:
             collection = self.get_collection()
 
@@ -437,14 +435,11 @@ class BlogPost(BaseModel):
             return posts
 
         except Exception as e:
-            logger.error(f"Get user posts error: {str(e)}")
+            logger.error("Get user posts error: %s", e)
             return []
-        finally:
-            collection = None
 
     def get_post_by_id(self, post_id, user_id=None):
         """Get a specific post by ID"""
-        collection = None
         try:
             collection = self.get_collection()
 
@@ -469,14 +464,11 @@ class BlogPost(BaseModel):
             return None
 
         except Exception as e:
-            logger.error(f"Get post by ID error: {str(e)}")
+            logger.error("Get post by ID error: %s", e)
             return None
-        finally:
-            collection = None
 
     def update_post(self, post_id, user_id, update_data):
         """Update a blog post"""
-        collection = None
         try:
             collection = self.get_collection()
 
@@ -496,14 +488,11 @@ class BlogPost(BaseModel):
             return result.modified_count > 0
 
         except Exception as e:
-            logger.error(f"Update blog post error: {str(e)}")
+            logger.error("Update blog post error: %s", e)
             return False
-        finally:
-            collection = None
 
     def delete_post(self, post_id, user_id):
         """Delete a blog post"""
-        collection = None
         try:
             collection = self.get_collection()
 
@@ -517,21 +506,18 @@ class BlogPost(BaseModel):
                 {"_id": post_id, "user_id": user_id})
 
             if result.deleted_count > 0:
-                logger.info(f"Blog post deleted successfully: {post_id}")
+                logger.info("Blog post deleted successfully: %s", post_id)
                 return True
             else:
-                logger.warning(f"No blog post found to delete: {post_id}")
+                logger.warning("No blog post found to delete: %s", post_id)
                 return False
 
         except Exception as e:
-            logger.error(f"Delete blog post error: {str(e)}")
+            logger.error("Delete blog post error: %s", e)
             return False
-        finally:
-            collection = None
 
     def get_posts_count(self, user_id):
         """Get total count of posts for a user"""
-        collection = None
         try:
             collection = self.get_collection()
 
@@ -543,10 +529,8 @@ class BlogPost(BaseModel):
             return count
 
         except Exception as e:
-            logger.error(f"Get posts count error: {str(e)}")
+            logger.error("Get posts count error: %s", e)
             return 0
-        finally:
-            collection = None
 
 
 # Cleanup function for graceful shutdown
@@ -557,7 +541,7 @@ def cleanup_mongodb_connections():
             mongo_manager.close_connection()
             logger.info("MongoDB connections cleaned up successfully")
     except Exception as e:
-        logger.error(f"Error during MongoDB cleanup: {str(e)}")
+        logger.error("Error during MongoDB cleanup: %s", e)
 
 
 # Register cleanup function
@@ -1,33 +1,157 @@
-import datetime
-import json
+import atexit
+import copy
+import gzip
 import logging
 import os
 import threading
 import time
-from logging.handlers import RotatingFileHandler
+from logging.handlers import (MemoryHandler, QueueHandler, QueueListener,
+                              RotatingFileHandler)
 from pathlib import Path
-from queue import Empty, Queue
+from queue import Empty, Full, Queue
 
+import orjson
 import requests
 
+from app.monitoring.metrics import log_entries_dropped_total
+
 logger = logging.getLogger(__name__)
 
+# Listeners writing queued records to the log files, one per setup_logging
+_queue_listeners = []
+
+
+class StructuredQueueHandler(QueueHandler):
+    """Queue handler that keeps records structured for the JSON formatter"""
+
+    def prepare(self, record):
+        # Resolve the message and traceback in the calling thread, but keep
+        # the traceback in exc_text instead of merging it into the message
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info)
+        record.exc_info = None
+        return record
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler whose stream flush can be deferred to the end
+    of a batch of records.
+
+    The file size is tracked in memory (seeded from the file when it is
+    opened), so deciding whether to roll over doesn't stat or seek the file
+    and each record is formatted once.
+    """
+
+    defer_flush = False
+    _size = 0
+
+    def _open(self):
+        stream = super()._open()
+        self._size = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            # maxBytes is in bytes; non-ASCII text encodes to more than one
+            size = len(msg.encode(self.stream.encoding))
+            if self.maxBytes > 0 and self._size + size >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(msg)
+            self._size += size
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        if not self.defer_flush:
+            super().flush()
+
+
+class BatchingMemoryHandler(MemoryHandler):
+    """Memory handler that writes its buffer to the target in one batch,
+    flushing the target's stream once instead of once per record"""
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.target and self.buffer:
+                self.target.defer_flush = True
+                try:
+                    for record in self.buffer:
+                        self.target.handle(record)
+                finally:
+                    self.target.defer_flush = False
+                    self.target.flush()
+                self.buffer.clear()
+        finally:
+            self.release()
+
+
+class DrainFlushingQueueListener(QueueListener):
+    """Queue listener that flushes its batching handlers whenever it has
+    caught up with the queue: bursts are still written in batches, but
+    records aren't held back while logging is quiet"""
+
+    def handle(self, record):
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                if isinstance(handler, BatchingMemoryHandler):
+                    handler.flush()
+
+
+def _stop_queue_listeners():
+    """Flush queued records and stop the file writer threads"""
+    while _queue_listeners:
+        listener = _queue_listeners.pop()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+            if getattr(handler, "target", None):
+                handler.target.close()
+
+
+atexit.register(_stop_queue_listeners)
+
 
 class LokiHandler(logging.Handler):
     """Custom Loki handler for Flask application logs"""
 
+    # Extra record attributes used as labels. Only bounded values become
+    # labels; per-request values such as request_id and user_id stay in
+    # the JSON log line so each one doesn't create a stream.
+    EXTRA_LABELS = ("endpoint", "error_type")
+
     def __init__(
-        self, loki_url, tags=None, timeout=5, batch_size=100, flush_interval=5
+        self,
+        loki_url,
+        tags=None,
+        timeout=5,
+        batch_size=100,
+        flush_interval=5,
+        queue_size=10000,
     ):
         super().__init__()
         self.loki_url = loki_url.rstrip("/") + "/loki/api/v1/push"
         self.tags = tags or {}
+        # Labels that are the same for every record
+        self._static_labels = {**self.tags, "application": "flask-blog-app"}
         self.timeout = timeout
         self.batch_size = batch_size
         self.flush_interval = flush_interval
 
-        # Batch processing
-        self.log_queue = Queue()
+        # Batch processing (bounded so a slow Loki never blocks requests)
+        self.log_queue = Queue(maxsize=queue_size)
         self.batch_thread = threading.Thread(
             target=self._batch_sender, daemon=True)
         self.batch_thread.start()
@@ -38,37 +162,32 @@ class LokiHandler(logging.Handler):
             # Format the record
             log_entry = self.format(record)
 
-            # Create timestamp in nanoseconds
-            timestamp = str(int(time.time() * 1_000_000_000))
+            # Timestamp in nanoseconds, from when the record was created
+            # rather than when it reaches this (queued) handler
+            timestamp = str(int(record.created * 1_000_000_000))
 
             # Prepare labels
-            labels = dict(self.tags)
-            labels.update(
-                {
-                    "level": record.levelname.lower(),
-                    "logger": record.name,
-                    "filename": record.filename,
-                    "function": record.funcName,
-                    "application": "flask-blog-app",
-                }
-            )
-
-            # Add extra labels from record
-            if hasattr(record, "request_id"):
-                labels["request_id"] = record.request_id
-            if hasattr(record, "user_id"):
-                labels["user_id"] = record.user_id
-            if hasattr(record, "endpoint"):
-                labels["endpoint"] = record.endpoint
-            if hasattr(record, "error_type"):
-                labels["error_type"] = record.error_type
+            labels = dict(self._static_labels)
+            labels["level"] = record.levelname.lower()
+            labels["logger"] = record.name
+            labels["filename"] = record.filename
+            labels["function"] = record.funcName
+
+            # Add extra labels from record, with plain dict lookups
+            attrs = record.__dict__
+            for name in self.EXTRA_LABELS:
+                if name in attrs:
+                    labels[name] = attrs[name]
 
             # Create Loki entry
             loki_entry = {"streams": [
                 {"stream": labels, "values": [[timestamp, log_entry]]}]}
 
-            # Add to queue for batch processing
-            self.log_queue.put(loki_entry)
+            # Add to queue for batch processing, dropping when it is full
+            try:
+                self.log_queue.put_nowait(loki_entry)
+            except Full:
+                log_entries_dropped_total.inc()
 
         except Exception as e:
             # Don't let logging errors break the application
@@ -112,7 +231,8 @@ class LokiHandler(logging.Handler):
             merged_streams = {}
             for entry in batch:
                 for stream in entry["streams"]:
-                    stream_key = json.dumps(stream["stream"], sort_keys=True)
+                    stream_key = orjson.dumps(
+                        stream["stream"], option=orjson.OPT_SORT_KEYS)
                     if stream_key not in merged_streams:
                         merged_streams[stream_key] = {
                             "stream": stream["stream"],
@@ -125,10 +245,13 @@ class LokiHandler(logging.Handler):
             payload = {"streams": list(merged_streams.values())}
 
             # Send to Loki
-            headers = {"Content-Type": "application/json"}
+            headers = {
+                "Content-Type": "application/json",
+                "Content-Encoding": "gzip",
+            }
             response = requests.post(
                 self.loki_url,
-                data=json.dumps(payload),
+                data=gzip.compress(orjson.dumps(payload)),
                 headers=headers,
                 timeout=self.timeout,
             )
@@ -141,14 +264,67 @@ class LokiHandler(logging.Handler):
             print(f"Failed to send logs to Loki: {e}")
 
 
+# Where LokiJsonFormatter keeps a record's serialized line
+JSON_LINE_ATTRIBUTE = "_json_line"
+
+# Standard LogRecord attributes (and the cached JSON line); anything else
+# on a record came from extra=
+LOG_RECORD_ATTRIBUTES = frozenset(
+    {
+        "name",
+        "msg",
+        "args",
+        "levelname",
+        "levelno",
+        "pathname",
+        "filename",
+        "module",
+        "lineno",
+        "funcName",
+        "created",
+        "msecs",
+        "relativeCreated",
+        "thread",
+        "threadName",
+        "processName",
+        "process",
+        "taskName",
+        "message",
+        "exc_info",
+        "exc_text",
+        "stack_info",
+        JSON_LINE_ATTRIBUTE,
+    }
+)
+
+
 class LokiJsonFormatter(logging.Formatter):
     """JSON formatter for Loki with structured data"""
 
+    # (epoch second, formatted UTC second) of the last record, swapped as
+    # one tuple so concurrent formats never pair a second with another's text
+    _last_second = (None, "")
+
+    def _format_timestamp(self, record):
+        """ISO 8601 UTC timestamp from record.created; the date and time
+        part is only re-rendered when the second changes"""
+        second = int(record.created)
+        cached_second, formatted = self._last_second
+        if second != cached_second:
+            formatted = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._last_second = (second, formatted)
+        return f"{formatted}.{int(record.msecs):03d}Z"
+
     def format(self, record):
+        # The JSON file and Loki handlers both format each root record
+        # (the file handler later, from its batch); serialize it once
+        line = record.__dict__.get(JSON_LINE_ATTRIBUTE)
+        if line is not None:
+            return line
+
         # Create base log entry
         log_entry = {
-            "timestamp": datetime.datetime.fromtimestamp(
-                record.created).isoformat(),
+            "timestamp": self._format_timestamp(record),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -159,38 +335,21 @@ class LokiJsonFormatter(logging.Formatter):
             "thread_name": record.threadName,
         }
 
-        # Add exception info if present
-        if record.exc_info:
-            log_entry["exception"] = self.formatException(record.exc_info)
+        # Add exception info if present, rendering the traceback only once
+        # per record however many handlers format it
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_entry["exception"] = record.exc_text
 
         # Add extra attributes
         for key, value in record.__dict__.items():
-            if key not in [
-                "name",
-                "msg",
-                "args",
-                "levelname",
-                "levelno",
-                "pathname",
-                "filename",
-                "module",
-                "lineno",
-                "funcName",
-                "created",
-                "msecs",
-                "relativeCreated",
-                "thread",
-                "threadName",
-                "processName",
-                "process",
-                "message",
-                "exc_info",
-                "exc_text",
-                "stack_info",
-            ]:
+            if key not in LOG_RECORD_ATTRIBUTES:
                 log_entry[key] = str(value)
 
-        return json.dumps(log_entry)
+        line = orjson.dumps(log_entry, default=str).decode("utf-8")
+        setattr(record, JSON_LINE_ATTRIBUTE, line)
+        return line
 
 
 def setup_basic_logging():
@@ -265,11 +424,18 @@ def setup_logging(app):
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
 
-    # Loki handler for centralized logging
+    # One formatter for the JSON file and Loki, so each record is
+    # serialized once for both
+    json_formatter = LokiJsonFormatter()
+
+    # Loki handler for centralized logging. Like the file handlers it runs
+    # behind the root queue, so records are formatted off the request thread.
+    loki_handler = None
     if loki_url and loki_url != "http://YOUR_DROPLET_IP:3100":
         try:
             loki_handler = LokiHandler(
                 loki_url=loki_url,
+                queue_size=int(os.getenv("LOKI_QUEUE_SIZE", 10000)),
                 tags={
                     "application": "flask-blog-app",
                     "environment": os.getenv("FLASK_ENV", "production"),
@@ -277,26 +443,34 @@ def setup_logging(app):
                 },
             )
             loki_handler.setLevel(log_level)
-            loki_handler.setFormatter(LokiJsonFormatter())
-            root_logger.addHandler(loki_handler)
-            logger.info(f"Loki handler configured successfully: {loki_url}")
+            loki_handler.setFormatter(json_formatter)
+            logger.info("Loki handler configured successfully: %s", loki_url)
         except Exception as e:
-            logger.error(f"Failed to configure Loki handler: {e}")
+            loki_handler = None
+            logger.error("Failed to configure Loki handler: %s", e)
     else:
         logger.warning("Loki URL not configured, skipping Loki integration")
 
+    # Several processes can't rotate one shared file (a worker renaming it
+    # leaves the others writing to the backup), so multi-worker servers
+    # give each process its own files, e.g. app.<pid>.json
+    per_process = os.getenv("LOG_FILE_PER_PROCESS", "false").lower() == "true"
+    file_suffix = f".{os.getpid()}" if per_process else ""
+
     # Enhanced JSON logs for local file storage (backup)
-    json_log_file = log_dir / "app.json"
-    json_handler = RotatingFileHandler(
-        json_log_file, maxBytes=50 * 1024 * 1024, backupCount=5  # 50MB
+    json_log_file = log_dir / f"app{file_suffix}.json"
+    json_handler = BufferedRotatingFileHandler(
+        json_log_file,
+        maxBytes=50 * 1024 * 1024,  # 50MB
+        backupCount=5,
+        encoding="utf-8",
     )
     json_handler.setLevel(log_level)
-    json_handler.setFormatter(LokiJsonFormatter())
-    root_logger.addHandler(json_handler)
+    json_handler.setFormatter(json_formatter)
 
     # Enhanced access logs
-    access_log_file = log_dir / "access.log"
-    access_handler = RotatingFileHandler(
+    access_log_file = log_dir / f"access{file_suffix}.log"
+    access_handler = BufferedRotatingFileHandler(
         access_log_file, maxBytes=50 * 1024 * 1024, backupCount=5
     )
     access_handler.setLevel(logging.INFO)
@@ -307,8 +481,44 @@ def setup_logging(app):
 
     # Create access logger
     access_logger = logging.getLogger("access")
-    access_logger.addHandler(access_handler)
     access_logger.setLevel(logging.INFO)
     access_logger.propagate = False
 
-    logger.info(f"Enhanced logging configured - Log directory: {log_dir}")
+    # File writes happen on listener threads; request threads only enqueue.
+    # Replace the queue handlers of any previous setup (e.g. repeated
+    # create_app calls) so records aren't written twice.
+    _stop_queue_listeners()
+    for queued_logger in (root_logger, access_logger):
+        for handler in list(queued_logger.handlers):
+            if isinstance(handler, StructuredQueueHandler):
+                queued_logger.removeHandler(handler)
+
+    buffer_capacity = int(os.getenv("LOG_BUFFER_CAPACITY", 512))
+    for queued_logger, file_handler, other_handlers in (
+        (root_logger, json_handler, [loki_handler] if loki_handler else []),
+        (access_logger, access_handler, []),
+    ):
+        log_queue = Queue(-1)
+        queue_handler = StructuredQueueHandler(log_queue)
+        queue_handler.setLevel(file_handler.level)
+        queued_logger.addHandler(queue_handler)
+
+        # Records are written in batches, flushed at once on errors and
+        # whenever the listener drains the queue
+        buffered_handler = BatchingMemoryHandler(
+            buffer_capacity,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True,
+        )
+        buffered_handler.setLevel(file_handler.level)
+
+        listener = DrainFlushingQueueListener(
+            log_queue,
+            buffered_handler,
+            *other_handlers,
+            respect_handler_level=True)
+        listener.start()
+        _queue_listeners.append(listener)
+
+    logger.info("Enhanced logging configured - Log directory: %s", log_dir)
@@ -1,12 +1,13 @@
 import logging
+import os
 import threading
 import time
 from functools import wraps
 
 import psutil
-from flask import Response, g, has_app_context, request
+from flask import Response, g, has_request_context, request
 from prometheus_client import (CONTENT_TYPE_LATEST, CollectorRegistry, Counter,
-                               Gauge, Histogram, generate_latest)
+                               Gauge, Histogram, generate_latest, multiprocess)
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +45,9 @@ blog_generation_duration = Histogram(
 active_users = Gauge(
     "active_users",
     "Number of active users",
-    registry=REGISTRY)
+    registry=REGISTRY,
+    multiprocess_mode="livesum",
+)
 
 youtube_urls_processed = Counter(
     "youtube_urls_processed_total",
@@ -70,26 +73,42 @@ database_operations = Counter(
 )
 
 # System metrics
+# Host-level readings are the same in every worker, so under gunicorn's
+# multiprocess mode report one value instead of a series per pid
 cpu_usage = Gauge(
     "system_cpu_usage_percent",
     "CPU usage percentage",
-    registry=REGISTRY)
+    registry=REGISTRY,
+    multiprocess_mode="max",
+)
 
 memory_usage = Gauge(
-    "system_memory_usage_bytes", "Memory usage in bytes", registry=REGISTRY
+    "system_memory_usage_bytes",
+    "Memory usage in bytes",
+    registry=REGISTRY,
+    multiprocess_mode="max",
 )
 
 memory_usage_percent = Gauge(
-    "system_memory_usage_percent", "Memory usage percentage", registry=REGISTRY
+    "system_memory_usage_percent",
+    "Memory usage percentage",
+    registry=REGISTRY,
+    multiprocess_mode="max",
 )
 
 disk_usage = Gauge(
-    "system_disk_usage_percent", "Disk usage percentage", registry=REGISTRY
+    "system_disk_usage_percent",
+    "Disk usage percentage",
+    registry=REGISTRY,
+    multiprocess_mode="max",
 )
 
 # User activity metrics
 user_sessions = Gauge(
-    "user_sessions_active", "Number of active user sessions", registry=REGISTRY
+    "user_sessions_active",
+    "Number of active user sessions",
+    registry=REGISTRY,
+    multiprocess_mode="livesum",
 )
 
 blog_posts_created = Counter(
@@ -128,6 +147,12 @@ log_entries_total = Counter(
     registry=REGISTRY,
 )
 
+log_entries_dropped_total = Counter(
+    "log_entries_dropped_total",
+    "Total log entries dropped because the Loki queue was full",
+    registry=REGISTRY,
+)
+
 
 def collect_system_metrics(app):
     """Collect system metrics periodically"""
@@ -152,7 +177,7 @@ def collect_system_metrics(app):
 
             time.sleep(30)  # Collect every 30 seconds
         except Exception as e:
-            logger.error(f"Error collecting system metrics: {e}")
+            logger.error("Error collecting system metrics: %s", e)
             time.sleep(30)
 
 
@@ -165,21 +190,16 @@ class ContextAwareLogMetricsFilter(logging.Filter):
             level=record.levelname,
             logger=record.name).inc()
 
-        # Add context information to log records safely
-        if has_app_context():
-            try:
-                if not hasattr(record, "request_id"):
-                    record.request_id = getattr(g, "request_id", "no-request")
-
-                if not hasattr(record, "user_id"):
-                    record.user_id = getattr(g, "user_id", "anonymous")
-
-                if not hasattr(record, "endpoint"):
-                    record.endpoint = request.endpoint if request else "unknown"
-            except (AttributeError, RuntimeError):
-                record.request_id = "no-request"
-                record.user_id = "anonymous"
-                record.endpoint = "unknown"
+        # Add context information to log records. Outside a request there
+        # is nothing to look up, so skip straight to the defaults.
+        attrs = record.__dict__
+        if has_request_context():
+            if "request_id" not in attrs:
+                record.request_id = getattr(g, "request_id", "no-request")
+            if "user_id" not in attrs:
+                record.user_id = getattr(g, "user_id", "anonymous")
+            if "endpoint" not in attrs:
+                record.endpoint = request.endpoint or "unknown"
         else:
             record.request_id = "no-request"
             record.user_id = "anonymous"
@@ -234,6 +254,17 @@ def track_requests(f):
     return decorated_function
 
 
+def get_metrics_registry():
+    """Get the registry to expose, aggregated across workers when running
+    under a multi-process server with PROMETHEUS_MULTIPROC_DIR set"""
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
 def setup_metrics(app):
     """Setup Prometheus metrics for the Flask app"""
 
@@ -243,21 +274,29 @@ def setup_metrics(app):
         """Prometheus metrics endpoint"""
         try:
             return Response(
-                generate_latest(REGISTRY),
+                generate_latest(get_metrics_registry()),
                 mimetype=CONTENT_TYPE_LATEST)
         except Exception as e:
-            logger.error(f"Error generating metrics: {e}", exc_info=True)
+            logger.error("Error generating metrics: %s", e, exc_info=True)
             return "Error generating metrics", 500
 
-    # Start system metrics collection thread
-    metrics_thread = threading.Thread(
-        target=collect_system_metrics, args=(app,), daemon=True
-    )
-    metrics_thread.start()
-
-    # Add the metrics filter to all handlers
+    # Start system metrics collection thread (not for test instances)
+    if app.config.get("TESTING"):
+        logger.info("System metrics collection skipped in testing")
+    elif os.getenv("PROMETHEUS_ENABLED", "true").lower() == "true":
+        metrics_thread = threading.Thread(
+            target=collect_system_metrics, args=(app,), daemon=True
+        )
+        metrics_thread.start()
+    else:
+        logger.info("System metrics collection disabled")
+
+    # Add the metrics filter to all handlers, once per handler across
+    # repeated app setups so records aren't counted twice
     metrics_filter = ContextAwareLogMetricsFilter()
     for handler in logging.getLogger().handlers:
-        handler.addFilter(metrics_filter)
+        if not any(isinstance(f, ContextAwareLogMetricsFilter)
+                   for f in handler.filters):
+            handler.addFilter(metrics_filter)
 
     logger.info("Prometheus metrics setup completed")
@@ -1,23 +1,81 @@
+import itertools
 import logging
+import os
+import random
 import time
-import uuid
 
 from flask import g, request
 
 logger = logging.getLogger(__name__)
 
+# Probe and scrape endpoints are polled constantly; they are only traced
+# when they fail. Blog generation is slow and always worth a trace.
+UNTRACED_ENDPOINTS = frozenset(
+    {"health.health_check", "health.health_metrics", "metrics", "static"}
+)
+ALWAYS_TRACED_ENDPOINTS = frozenset({"blog.generate_blog"})
+
+# Request IDs only need to be unique per process: pid plus a counter
+_REQUEST_COUNTER = itertools.count()
+_PID = os.getpid()
+
+
+def _reset_request_ids():
+    """Give a forked worker its own pid prefix and counter"""
+    global _REQUEST_COUNTER, _PID
+    _REQUEST_COUNTER = itertools.count()
+    _PID = os.getpid()
+
+
+# Workers forked after this module was imported (e.g. gunicorn --preload)
+# would otherwise all carry the parent's pid
+os.register_at_fork(after_in_child=_reset_request_ids)
+
+
+def get_safe_response_size(response):
+    """Get the response size for logging from the Content-Length header.
+
+    The body is never read for this: streamed and passthrough responses
+    without a length are logged as -1.
+    """
+    content_length = getattr(response, "content_length", None)
+    return content_length if content_length is not None else -1
+
 
 def setup_tracing(app):
     """Setup request tracing for the Flask app"""
 
+    # Skip the per-request hooks entirely when tracing is switched off
+    if os.getenv("REQUEST_TRACING_ENABLED", "true").lower() != "true":
+        logger.info("Request tracing disabled")
+        return
+
+    # Fraction of other successful requests that are traced
+    sample_rate = float(os.getenv("REQUEST_TRACING_SAMPLE_RATE", "1.0"))
+
+    def should_trace(endpoint):
+        if endpoint in UNTRACED_ENDPOINTS:
+            return False
+        if endpoint in ALWAYS_TRACED_ENDPOINTS or sample_rate >= 1.0:
+            return True
+        return random.random() < sample_rate
+
     @app.before_request
     def before_request():
         """Setup tracing context for each request"""
         # Generate unique request ID
-        request_id = str(uuid.uuid4())
+        request_id = f"{_PID:x}-{next(_REQUEST_COUNTER):x}"
         g.request_id = request_id
         g.start_time = time.time()
         g.user_id = "anonymous"  # Will be updated if user is authenticated
+        g.trace_sampled = should_trace(request.endpoint)
+
+        # Requests are logged once, on completion. Only slow endpoints also
+        # get a start record so in-flight work shows up in the logs.
+        if request.endpoint not in ALWAYS_TRACED_ENDPOINTS:
+            return
+        if not logger.isEnabledFor(logging.INFO):
+            return
 
         # Enhanced request logging with structured data for Loki
         logger.info(
@@ -26,54 +84,23 @@ def setup_tracing(app):
                 "event": "request_started",
                 "request_id": request_id,
                 "method": request.method,
-                "url": request.url,
                 "path": request.path,
-                "query_string": request.query_string.decode("utf-8"),
-                "user_agent": request.headers.get("User-Agent", ""),
-                "remote_addr": request.remote_addr,
-                "content_type": request.content_type,
-                "content_length": request.content_length,
-                "endpoint": request.endpoint or "unknown",
+                "endpoint": request.endpoint,
             },
         )
 
     @app.after_request
     def after_request(response):
         """Log response details after each request"""
-        duration = time.time() - getattr(g, "start_time", time.time())
-        request_id = getattr(g, "request_id", "unknown")
+        if not logger.isEnabledFor(logging.INFO):
+            return response
 
-        # Safely calculate response size
-        def get_safe_response_size(response):
-            try:
-                # Check if response has content_length
-                if (
-                    hasattr(response, "content_length")
-                    and response.content_length is not None
-                ):
-                    return response.content_length
-
-                # For responses that support get_data()
-                if hasattr(response, "get_data"):
-                    # Check if response is in direct passthrough mode
-                    if (
-                        hasattr(response, "direct_passthrough")
-                        and response.direct_passthrough
-                    ):
-                        return -1  # Indicate unknown size for passthrough responses
-
-                    try:
-                        return len(response.get_data())
-                    except RuntimeError:
-                        # Fallback for responses in passthrough mode
-                        return -1
-
-                # Fallback for other response types
-                return 0
-
-            except Exception:
-                return 0
+        # Unsampled requests are still logged when they fail
+        if not getattr(g, "trace_sampled", True) and response.status_code < 400:
+            return response
 
+        duration = time.time() - getattr(g, "start_time", time.time())
+        request_id = getattr(g, "request_id", "unknown")
         response_size = get_safe_response_size(response)
 
         # Enhanced response logging for Loki
@@ -87,6 +114,11 @@ def setup_tracing(app):
                 "response_size": response_size,
                 "content_type": getattr(response, "content_type", "unknown"),
                 "method": request.method,
+                "path": request.path,
+                "query_string": request.query_string.decode("utf-8"),
+                "user_agent": request.headers.get("User-Agent", ""),
+                "remote_addr": request.remote_addr,
+                "request_content_length": request.content_length,
                 "endpoint": request.endpoint or "unknown",
                 "success": response.status_code < 400,
             },
@@ -1,24 +1,19 @@
 import datetime
 import logging
-import re
 
 from flask import (Blueprint, jsonify, redirect, render_template, request,
                    session, url_for)
 from flask_jwt_extended import create_access_token
 
 from app.models.user import User
+from app.services.auth_service import AuthService
+from app.utils.validators import is_valid_email
 
 logger = logging.getLogger(__name__)
 
 auth_bp = Blueprint("auth", __name__, template_folder="../../templates")
 
 
-def is_valid_email(email):
-    """Validate email format"""
-    pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    return re.match(pattern, email) is not None
-
-
 def is_valid_password(password):
     """Validate password strength"""
     return len(password) >= 8
@@ -97,14 +92,19 @@ def register():
 
         # Create JWT token
         access_token = create_access_token(
-            identity=str(user["_id"]), expires_delta=datetime.timedelta(days=1)
+            identity=str(user["_id"]),
+            additional_claims={
+                "username": user["username"],
+                "email": user["email"],
+            },
+            expires_delta=datetime.timedelta(days=1),
         )
 
         # Store in session
         session["access_token"] = access_token
         session["user_id"] = str(user["_id"])
 
-        logger.info(f"User registered successfully: {user['username']}")
+        logger.info("User registered successfully: %s", user['username'])
 
         if request.is_json:
             return jsonify(
@@ -123,7 +123,7 @@ def register():
             return redirect(url_for("blog.dashboard"))
 
     except Exception as e:
-        logger.error(f"Registration error: {str(e)}")
+        logger.error("Registration error: %s", e)
         error_msg = "Registration failed. Please try again."
         if request.is_json:
             return jsonify({"success": False, "message": error_msg}), 500
@@ -165,17 +165,22 @@ def login():
         user = user_model.authenticate_user(email, password)
 
         if user:
-            # Create JWT token
+            # Create JWT token; the profile claims let read-only pages
+            # show the user without a database lookup
             access_token = create_access_token(
-                identity=str(
-                    user["_id"]), expires_delta=datetime.timedelta(
-                    days=1))
+                identity=str(user["_id"]),
+                additional_claims={
+                    "username": user["username"],
+                    "email": user["email"],
+                },
+                expires_delta=datetime.timedelta(days=1),
+            )
 
             # Store in session
             session["access_token"] = access_token
             session["user_id"] = str(user["_id"])
 
-            logger.info(f"User logged in successfully: {user['username']}")
+            logger.info("User logged in successfully: %s", user['username'])
 
             if request.is_json:
                 return jsonify(
@@ -199,7 +204,7 @@ def login():
             return render_template("login.html", error=error_msg)
 
     except Exception as e:
-        logger.error(f"Login error: {str(e)}")
+        logger.error("Login error: %s", e)
         error_msg = "Login failed. Please try again."
         if request.is_json:
             return jsonify({"success": False, "message": error_msg}), 500
@@ -212,10 +217,10 @@ def logout():
     try:
         user_id = session.get("user_id")
         if user_id:
-            logger.info(f"User logged out: {user_id}")
+            logger.info("User logged out: %s", user_id)
 
-        # Clear session
-        session.clear()
+        # Clear session (an empty one is left untouched, so no cookie is set)
+        AuthService.clear_session()
 
         if request.is_json:
             return jsonify({"success": True,
@@ -224,7 +229,7 @@ def logout():
             return redirect(url_for("blog.index"))
 
     except Exception as e:
-        logger.error(f"Logout error: {str(e)}")
+        logger.error("Logout error: %s", e)
         if request.is_json:
             return jsonify({"success": False, "message": "Logout failed"}), 500
         else:
@@ -246,7 +251,7 @@ def set_session_token():
                 {"success": False, "message": "No token provided"}), 400
 
     except Exception as e:
-        logger.error(f"Set session token error: {str(e)}")
+        logger.error("Set session token error: %s", e)
         return jsonify({"success": False, "message": str(e)}), 500
 
 
@@ -272,6 +277,6 @@ def verify_token():
             return jsonify({"success": False, "message": "Invalid token"}), 401
 
     except Exception as e:
-        logger.error(f"Token verification error: {str(e)}")
+        logger.error("Token verification error: %s", e)
         return jsonify(
             {"success": False, "message": "Token verification failed"}), 500
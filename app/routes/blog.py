@@ -1,32 +1,279 @@
-import io
+import contextlib
+import hashlib
 import logging
+import multiprocessing
+import os
 import re
+import secrets
+import tempfile
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-from flask import (Blueprint, jsonify, redirect, render_template, request,
-                   send_file, session, url_for)
+from flask import (Blueprint, Response, current_app, jsonify, redirect,
+                   render_template, request, send_file, session, url_for)
+from werkzeug.exceptions import RequestEntityTooLarge
 
-from app.crew.tools import PDFGeneratorTool
 from app.models.user import BlogPost
 from app.services.auth_service import AuthService
 from app.services.blog_service import generate_blog_from_youtube
-from app.utils.security import retrieve_large_data, store_large_data
-from app.utils.validators import (extract_video_id, sanitize_filename,
-                                  validate_youtube_url)
+from app.utils.security import (clear_session, retrieve_large_data,
+                                store_large_data)
+from app.utils.validators import parse_youtube_url, sanitize_filename
 
 logger = logging.getLogger(__name__)
 
 blog_bp = Blueprint("blog", __name__, template_folder="../../templates")
 
+# PDFGeneratorTool holds no per-request state, so one instance is shared.
+# Created on the first download: importing fpdf is the bulk of this
+# module's import time and workers that never serve a PDF skip it.
+pdf_generator = None
+
+
+def _pdf_tool():
+    """Return the shared PDF generator, importing fpdf on first use"""
+    global pdf_generator
+    if pdf_generator is None:
+        from app.crew.tools import PDFGeneratorTool
+
+        pdf_generator = PDFGeneratorTool()
+    return pdf_generator
+
+
+# Optional process pool for PDF rendering (PDF_WORKERS > 0). Layout and
+# font work is CPU-bound and holds the GIL, so offloading it keeps the
+# other request threads of a worker responsive during large renders.
+_pdf_executor = None
+_pdf_executor_lock = threading.Lock()
+
+# Upper bound in seconds on waiting for a pooled render
+PDF_RENDER_TIMEOUT = 60
+# PDFs are rendered under a suffix the cache ignores until published;
+# partial files an abandoned render leaves behind are swept after this long
+PDF_PART_SUFFIX = ".part"
+PDF_PART_MAX_AGE = 600
+
+
+def _pdf_pool():
+    """Return the PDF rendering process pool, or None to render inline"""
+    global _pdf_executor
+    workers = current_app.config.get("PDF_WORKERS", 0)
+    if workers <= 0:
+        return None
+    with _pdf_executor_lock:
+        if _pdf_executor is None:
+            # Spawned, not forked: the parent runs logging and metrics
+            # threads whose locks a forked child could inherit held
+            _pdf_executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+    return _pdf_executor
+
+
+def _discard_pdf_pool(pool):
+    """Drop a broken pool so the next render starts a fresh one"""
+    global _pdf_executor
+    with _pdf_executor_lock:
+        if _pdf_executor is pool:
+            _pdf_executor = None
+    pool.shutdown(wait=False)
+
+
+def _render_pdf_file(blog_content, path):
+    """Render a blog into the PDF file at path (also run in the pool)"""
+    with open(path, "wb") as fileobj:
+        _pdf_tool().write_pdf(blog_content, fileobj)
+
+
+# Markdown H1 heading used as the blog title, compiled once at import
+_TITLE_RE = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+DEFAULT_BLOG_TITLE = "YouTube Blog Post"
+
+
+def _extract_title(blog_content):
+    """Return the blog's H1 title. Generated blogs open with it, so the
+    first line is checked before searching the whole text."""
+    first_line = blog_content.partition("\n")[0]
+    if first_line.startswith("# ") and first_line[2:].strip():
+        return first_line[1:].lstrip()
+
+    title_match = _TITLE_RE.search(blog_content)
+    return title_match.group(1) if title_match else DEFAULT_BLOG_TITLE
+
+
+# Generated blogs are reused for repeat requests of the same video for a day
+GENERATED_BLOG_TTL = 86400
+
+# Per-video locks for in-flight generations, see _single_flight
+_generation_locks = {}
+_generation_locks_guard = threading.Lock()
+
+# Asynchronous generations (Prefer: respond-async) run on a bounded pool;
+# further requests are turned away instead of queueing without limit.
+# Results are kept for polling through the large data store, which is
+# shared between workers when Redis is configured.
+GENERATION_JOB_TTL = 3600
+_generation_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("BLOG_WORKERS", 4)),
+    thread_name_prefix="blog-generation",
+)
+_generation_slots = threading.BoundedSemaphore(
+    int(os.getenv("BLOG_MAX_PENDING_JOBS", 16)))
+
+
+def _write_pdf_file(blog_content, directory=None):
+    """Render a blog into a new temporary PDF file and return its path"""
+    tmp = tempfile.NamedTemporaryFile(
+        dir=directory, suffix=PDF_PART_SUFFIX, delete=False)
+    tmp.close()
+    try:
+        pool = _pdf_pool()
+        if pool is None:
+            _render_pdf_file(blog_content, tmp.name)
+        else:
+            future = pool.submit(_render_pdf_file, blog_content, tmp.name)
+            try:
+                future.result(timeout=PDF_RENDER_TIMEOUT)
+            except BrokenProcessPool:
+                # A pool worker died (e.g. killed for memory); render this
+                # PDF inline rather than failing every later download
+                logger.warning("PDF process pool broken, rendering inline")
+                _discard_pdf_pool(pool)
+                _render_pdf_file(blog_content, tmp.name)
+            except TimeoutError:
+                # A started render can't be interrupted: drop it if still
+                # queued, and send later renders to a fresh pool instead of
+                # queueing them behind the slot it holds
+                future.cancel()
+                logger.warning(
+                    "PDF render timed out after %ss", PDF_RENDER_TIMEOUT)
+                _discard_pdf_pool(pool)
+                raise
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+    return tmp.name
+
+
+def _cached_pdf_path(blog_content, etag):
+    """Return the path of the cached PDF for this ETag, rendering it on a
+    miss. Files are published with an atomic rename, so workers never see
+    a partial PDF, and their mtime tracks the last time they were served.
+    """
+    cache_dir = current_app.config["PDF_CACHE_DIR"]
+    path = os.path.join(cache_dir, f"{etag}.pdf")
+    try:
+        os.utime(path)
+        return path
+    except FileNotFoundError:
+        pass
+
+    os.makedirs(cache_dir, exist_ok=True)
+    os.replace(_write_pdf_file(blog_content, cache_dir), path)
+    _prune_pdf_cache(cache_dir, current_app.config["PDF_CACHE_MAX_FILES"])
+    return path
+
+
+def _prune_pdf_cache(cache_dir, max_files):
+    """Remove the least recently served PDFs beyond max_files, and partial
+    files left by renders that were given up on"""
+    entries = []
+    stale_before = time.time() - PDF_PART_MAX_AGE
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            try:
+                if entry.name.endswith(".pdf"):
+                    entries.append((entry.stat().st_mtime, entry.path))
+                elif (entry.name.endswith(PDF_PART_SUFFIX)
+                        and entry.stat().st_mtime < stale_before):
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+    if len(entries) <= max_files:
+        return
+
+    entries.sort()
+    for _, stale_path in entries[:len(entries) - max_files]:
+        try:
+            os.unlink(stale_path)
+        except FileNotFoundError:
+            pass
+
+
+def _send_pdf(blog_content, filename, etag):
+    """Send a blog as a PDF download.
+
+    The PDF is served from a real file rather than memory, so the WSGI
+    server can use sendfile and Range requests work. Rendered PDFs are
+    reused from the on-disk cache; with the cache disabled, the file is a
+    temporary one whose name is unlinked once send_file has opened it.
+    """
+    send_kwargs = dict(
+        as_attachment=True,
+        download_name=filename,
+        mimetype="application/pdf",
+        conditional=True,
+        etag=False,
+    )
+    if current_app.config["PDF_CACHE_MAX_FILES"] > 0:
+        response = send_file(
+            _cached_pdf_path(blog_content, etag), **send_kwargs)
+    else:
+        path = _write_pdf_file(blog_content)
+        try:
+            response = send_file(path, **send_kwargs)
+        finally:
+            os.unlink(path)
+
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    return response
+
+
+def _pdf_etag(post):
+    """Weak ETag for a post's PDF, derived from what the PDF is built from.
+
+    The PDF bytes themselves differ per render (FPDF stamps a creation
+    date), hence weak.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(post["title"].encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(post["content"].encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _pdf_not_modified(etag):
+    """Return a 304 response if the client already has this PDF, else None"""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    return response
+
 
 @blog_bp.route("/")
 def index():
     """Render the main landing page"""
     try:
         logger.info("Index page accessed")
-        return render_template("index.html")
+        if AuthService.get_token_user():
+            return render_template("index.html")
+
+        # The anonymous page is the same for every visitor: render it once
+        # per app (every time in debug, so template edits show up)
+        if current_app.debug:
+            return render_template("index.html")
+        if current_app.anonymous_index_html is None:
+            current_app.anonymous_index_html = render_template("index.html")
+        return current_app.anonymous_index_html
     except Exception as e:
-        logger.error(f"Error loading index page: {str(e)}", exc_info=True)
+        logger.error("Error loading index page: %s", e, exc_info=True)
         return f"Error loading page: {str(e)}", 500
 
 
@@ -34,15 +281,15 @@ def index():
 def generate_page():
     """Render the generate blog page"""
     try:
-        current_user = AuthService.get_current_user()
+        current_user = AuthService.get_token_user()
         if not current_user:
             logger.warning("Unauthorized generate page access")
             return redirect(url_for("auth.login"))
         
-        logger.info(f"Generate page accessed by user: {current_user['username']}")
+        logger.info("Generate page accessed by user: %s", current_user['username'])
         return render_template("generate.html")
     except Exception as e:
-        logger.error(f"Error loading generate page: {str(e)}", exc_info=True)
+        logger.error("Error loading generate page: %s", e, exc_info=True)
         return (
             render_template(
                 "error.html", error=f"Error loading generate page: {str(e)}"
@@ -50,11 +297,279 @@ def generate_page():
             500,
         )
 
+
+@contextlib.contextmanager
+def _single_flight(key):
+    """Serialize work on ``key`` within this process.
+
+    Concurrent /generate requests for the same video queue behind the
+    first one instead of each running the transcript and LLM pipeline.
+    """
+    with _generation_locks_guard:
+        entry = _generation_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _generation_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _generation_locks[key]
+
+
+def _cached_blog(cache_key):
+    """Return the cached blog entry (content, title, word_count) or None"""
+    cached = retrieve_large_data(cache_key)
+    if not cached:
+        return None
+    if isinstance(cached, str):
+        # Entry cached before the title and word count were stored
+        cached = {"content": cached}
+    if "word_count" not in cached:
+        cached["title"] = _extract_title(cached["content"])
+        cached["word_count"] = len(cached["content"].split())
+    return cached
+
+
+def _blog_for_video(youtube_url, language, video_id):
+    """Return the blog entry for a video, generating it on a cache miss.
+
+    Returns ``(entry, error)``: the entry holds the content, title and word
+    count; error is the failure response for _generate_and_save.
+    """
+    # The cached entry carries the title and word count, so a reuse does
+    # no text scanning at all
+    cache_key = f"generated_blog_{video_id}_{language}"
+    entry = _cached_blog(cache_key)
+    if entry is not None:
+        logger.info("Using cached blog content for video: %s", video_id)
+        return entry, None
+
+    with _single_flight(cache_key):
+        # A concurrent request may have generated it while this one waited
+        entry = _cached_blog(cache_key)
+        if entry is not None:
+            logger.info("Using cached blog content for video: %s", video_id)
+            return entry, None
+
+        try:
+            logger.info("Starting blog content generation")
+            blog_content = generate_blog_from_youtube(
+                youtube_url, language, video_id=video_id)
+
+            logger.info(
+                "Blog content generated successfully: %s characters", len(blog_content)
+            )
+
+        except Exception as gen_error:
+            logger.error(
+                "Blog generation failed: %s", gen_error,
+                exc_info=True
+            )
+            return None, (
+                {
+                    "success": False,
+                    "message": f"Failed to generate blog: {str(gen_error)}",
+                },
+                500,
+                None,
+            )
+
+        # Check if generation was successful
+        if not blog_content or len(blog_content) < 100:
+            logger.error(
+                "Blog generation failed: Content too short or empty (%s chars)",
+                len(blog_content) if blog_content else 0,
+            )
+            return None, (
+                {
+                    "success": False,
+                    "message": "Failed to generate blog content. Please try with a different video.",
+                },
+                500,
+                None,
+            )
+
+        # Check for error responses
+        if blog_content.startswith("ERROR:"):
+            error_msg = blog_content.replace("ERROR:", "").strip()
+            logger.error("Blog generation error response: %s", error_msg)
+            return None, ({"success": False, "message": error_msg}, 500, None)
+
+        # Extract title from content
+        title = _extract_title(blog_content)
+
+        logger.info("Blog title extracted: %s", title)
+
+        # Counted once for both the saved post and the response
+        entry = {
+            "content": blog_content,
+            "title": title,
+            "word_count": len(blog_content.split()),
+        }
+        store_large_data(cache_key, entry, ttl=GENERATED_BLOG_TTL)
+        return entry, None
+
+
+def _generate_and_save(current_user, youtube_url, language, video_id, start_time):
+    """Generate (or reuse) the blog for a video and save it as a post.
+
+    Returns the JSON payload, its status code and the saved post ID (None
+    on failure). Database errors are raised to the caller.
+    """
+    entry, error = _blog_for_video(youtube_url, language, video_id)
+    if error:
+        return error
+
+    blog_content = entry["content"]
+    title = entry["title"]
+    word_count = entry["word_count"]
+
+    # Save blog post to database
+    blog_model = BlogPost()
+    try:
+        logger.info("Saving blog post to database")
+        blog_post = blog_model.create_post(
+            user_id=current_user["_id"],
+            youtube_url=youtube_url,
+            title=title,
+            content=blog_content,
+            video_id=video_id,
+            word_count=word_count,
+        )
+
+        logger.info("Blog post saved successfully: %s", blog_post['_id'])
+    except Exception as db_error:
+        logger.error(
+            "Database error creating blog post: %s", db_error, exc_info=True
+        )
+        raise
+
+    if not blog_post:
+        logger.error("Failed to save blog post to database")
+        return {"success": False, "message": "Failed to save blog post"}, 500, None
+
+    generation_time = time.time() - start_time
+
+    logger.info(
+        "Blog generation completed successfully in %.1fs", generation_time
+    )
+
+    payload = {
+        "success": True,
+        "blog_content": blog_content,
+        "generation_time": f"{generation_time:.1f}s",
+        "word_count": word_count,
+        "title": title,
+        "video_id": video_id,
+    }
+    return payload, 200, str(blog_post["_id"])
+
+
+def _remember_blog(blog_id):
+    """Point /download at the saved post. The post is persisted, so the
+    session only needs its ID; /download reads the content back from the
+    database."""
+    session["current_blog_id"] = blog_id
+
+
+def _run_generation_job(app, job_key, current_user, youtube_url, language,
+                        video_id, start_time):
+    """Background half of an asynchronous /generate request"""
+    try:
+        with app.app_context():
+            try:
+                payload, status_code, blog_id = _generate_and_save(
+                    current_user, youtube_url, language, video_id, start_time
+                )
+            except Exception as e:
+                logger.error(
+                    "Unexpected error during blog generation: %s", e,
+                    exc_info=True,
+                )
+                payload = {
+                    "success": False,
+                    "message": f"Error generating blog: {str(e)}",
+                }
+                status_code, blog_id = 500, None
+
+            store_large_data(
+                job_key,
+                {
+                    "status": "done",
+                    "status_code": status_code,
+                    "blog_id": blog_id,
+                    "payload": payload,
+                },
+                user_id=current_user["_id"],
+                ttl=GENERATION_JOB_TTL,
+            )
+    finally:
+        _generation_slots.release()
+
+
+def _submit_generation_job(current_user, youtube_url, language, video_id,
+                           start_time):
+    """Start generating in the background and return the job to poll"""
+    if not _generation_slots.acquire(blocking=False):
+        logger.warning("Blog generation rejected: too many jobs in progress")
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": "Too many blogs are being generated right now. Please try again shortly.",
+                }),
+            503,
+        )
+
+    try:
+        job_id = secrets.token_urlsafe(16)
+        job_key = f"generation_job_{job_id}"
+        store_large_data(
+            job_key,
+            {"status": "running"},
+            user_id=current_user["_id"],
+            ttl=GENERATION_JOB_TTL,
+        )
+        _generation_executor.submit(
+            _run_generation_job,
+            current_app._get_current_object(),
+            job_key,
+            current_user,
+            youtube_url,
+            language,
+            video_id,
+            start_time,
+        )
+    except Exception:
+        _generation_slots.release()
+        raise
+
+    logger.info("Blog generation job started: %s", job_id)
+    return (
+        jsonify(
+            {
+                "success": True,
+                "status": "running",
+                "job_id": job_id,
+                "status_url": url_for("blog.generation_status", job_id=job_id),
+            }
+        ),
+        202,
+    )
+
+
 @blog_bp.route("/generate", methods=["POST"])
 def generate_blog():
-    """Process YouTube URL and generate blog"""
+    """Process YouTube URL and generate blog.
+
+    Clients sending "Prefer: respond-async" get a 202 with a job to poll at
+    /generate/status/<job_id> instead of waiting on the request. Without
+    Redis the preference is ignored, since another worker could serve the
+    poll and not see the job.
+    """
     start_time = time.time()
-    blog_model = None
 
     try:
         current_user = AuthService.get_current_user()
@@ -75,7 +590,9 @@ def generate_blog():
             language = request.form.get("language", "en")
 
         logger.info(
-            f"Blog generation started for user: {current_user['username']}, URL: {youtube_url}"
+            "Blog generation started for user: %s, URL: %s",
+            current_user["username"],
+            youtube_url,
         )
 
         if not youtube_url:
@@ -85,10 +602,11 @@ def generate_blog():
                 400,
             )
 
-        # Validate URL format
-        if not validate_youtube_url(youtube_url):
+        # Validate the URL and extract the video ID in one match
+        video_id = parse_youtube_url(youtube_url)
+        if not video_id:
             logger.warning(
-                f"Blog generation failed: Invalid URL format - {youtube_url}"
+                "Blog generation failed: Invalid YouTube URL - %s", youtube_url
             )
             return (
                 jsonify(
@@ -97,177 +615,87 @@ def generate_blog():
                 400,
             )
 
-        # Extract video ID
-        video_id = extract_video_id(youtube_url)
-        if not video_id:
-            logger.warning(
-                f"Blog generation failed: Could not extract video ID from {youtube_url}"
-            )
-            return jsonify(
-                {"success": False, "message": "Invalid YouTube URL"}), 400
-
-        logger.info(f"Video ID extracted successfully: {video_id}")
-
-        # Track blog generation start
-        # generation_start = time.time()
-
-        # Generate blog content
-        try:
-            logger.info("Starting blog content generation")
-            blog_content = generate_blog_from_youtube(youtube_url, language)
-
-            logger.info(
-                f"Blog content generated successfully: {len(blog_content)} characters"
-            )
-
-        except Exception as gen_error:
-            logger.error(
-                f"Blog generation failed: {str(gen_error)}",
-                exc_info=True
-            )
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "message": f"Failed to generate blog: {str(gen_error)}",
-                    }),
-                500,
-            )
-
-        # Check if generation was successful
-        if not blog_content or len(blog_content) < 100:
-            logger.error(
-                f"Blog generation failed: Content too short or empty ({len(blog_content) if blog_content else 0} chars)"
-            )
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "message": "Failed to generate blog content. Please try with a different video.",
-                    }),
-                500,
-            )
-
-        # Check for error responses
-        if blog_content.startswith("ERROR:"):
-            error_msg = blog_content.replace("ERROR:", "").strip()
-            logger.error(f"Blog generation error response: {error_msg}")
-            return jsonify({"success": False, "message": error_msg}), 500
-
-        # Track successful generation
-        # generation_duration = time.time() - generation_start
-
-        # Extract title from content
-        title_match = re.search(r"^#\s+(.+)$", blog_content, re.MULTILINE)
-        title = title_match.group(1) if title_match else "YouTube Blog Post"
-
-        logger.info(f"Blog title extracted: {title}")
-
-        # Save blog post to database
-        blog_model = BlogPost()
-        try:
-            logger.info("Saving blog post to database")
-            blog_post = blog_model.create_post(
-                user_id=current_user["_id"],
-                youtube_url=youtube_url,
-                title=title,
-                content=blog_content,
-                video_id=video_id,
-            )
-
-            logger.info(f"Blog post saved successfully: {blog_post['_id']}")
-        except Exception as db_error:
-            logger.error(
-                f"Database error creating blog post: {str(db_error)}", exc_info=True
-            )
-            raise
+        logger.info("Video ID extracted successfully: %s", video_id)
 
-        if not blog_post:
-            logger.error("Failed to save blog post to database")
-            return (
-                jsonify({"success": False, "message": "Failed to save blog post"}),
-                500,
+        if ("respond-async" in request.headers.get("Prefer", "")
+                and getattr(current_app, "redis_client", None) is not None):
+            return _submit_generation_job(
+                current_user, youtube_url, language, video_id, start_time
             )
 
-        generation_time = time.time() - start_time
-        word_count = len(blog_content.split())
-
-        # Store large blog data in temporary storage
-        blog_data = {
-            "blog_content": blog_content,
-            "youtube_url": youtube_url,
-            "video_id": video_id,
-            "title": title,
-            "generation_time": generation_time,
-            "post_id": str(blog_post["_id"]),
-            "word_count": word_count,
-        }
-
-        # Store in temporary storage and keep only reference in session
-        storage_key = store_large_data(
-            "current_blog", blog_data, str(current_user["_id"])
+        payload, status_code, blog_id = _generate_and_save(
+            current_user, youtube_url, language, video_id, start_time
         )
+        if blog_id:
+            _remember_blog(blog_id)
 
-        # Store only the storage key in session
-        session["blog_storage_key"] = storage_key
-        session["blog_created"] = time.time()
-
-        logger.info(
-            f"Blog generation completed successfully in {generation_time:.1f}s"
-        )
-
-        return jsonify(
-            {
-                "success": True,
-                "blog_content": blog_content,
-                "generation_time": f"{generation_time:.1f}s",
-                "word_count": word_count,
-                "title": title,
-                "video_id": video_id,
-            }
-        )
+        return jsonify(payload), status_code
 
+    except RequestEntityTooLarge:
+        # Bodies over MAX_CONTENT_LENGTH keep their 413
+        raise
     except Exception as e:
         logger.error(
-            f"Unexpected error during blog generation: {str(e)}", exc_info=True
+            "Unexpected error during blog generation: %s", e, exc_info=True
         )
         return (
             jsonify({"success": False, "message": f"Error generating blog: {str(e)}"}),
             500,
         )
 
-    finally:
-        try:
-            if blog_model:
-                blog_model = None
-        except Exception:
-            pass
+
+@blog_bp.route("/generate/status/<job_id>")
+def generation_status(job_id):
+    """Poll an asynchronous blog generation job"""
+    current_user = AuthService.get_current_user()
+    if not current_user:
+        return (
+            jsonify({"success": False, "message": "Authentication required"}),
+            401,
+        )
+
+    # Jobs are stored per user, so other users' job IDs are not found
+    job = retrieve_large_data(
+        f"generation_job_{job_id}", user_id=current_user["_id"])
+    if not job:
+        return (
+            jsonify(
+                {"success": False, "message": "Generation job not found or expired"}
+            ),
+            404,
+        )
+
+    if job["status"] == "running":
+        return jsonify({"success": True, "status": "running"}), 202
+
+    if job["blog_id"]:
+        _remember_blog(job["blog_id"])
+
+    return jsonify(job["payload"]), job["status_code"]
 
 
 @blog_bp.route("/dashboard")
 def dashboard():
     """User dashboard"""
-    blog_model = None
-
     try:
         current_user = AuthService.get_current_user()
 
         if not current_user:
             logger.warning("Unauthorized dashboard access")
-            session.clear()
+            clear_session()
             return redirect(url_for("auth.login"))
 
-        logger.info(f"Dashboard accessed by user: {current_user['username']}")
+        logger.info("Dashboard accessed by user: %s", current_user['username'])
 
         blog_model = BlogPost()
         try:
             posts = blog_model.get_user_posts(current_user["_id"])
             logger.info(
-                f"Retrieved {len(posts)} posts for user {current_user['username']}"
+                "Retrieved %s posts for user %s", len(posts), current_user['username']
             )
         except Exception as db_error:
             logger.error(
-                f"Database error retrieving posts: {str(db_error)}", exc_info=True
+                "Database error retrieving posts: %s", db_error, exc_info=True
             )
             posts = []
 
@@ -277,95 +705,74 @@ def dashboard():
             posts=posts)
 
     except Exception as e:
-        logger.error(f"Dashboard error: {str(e)}", exc_info=True)
-        session.clear()
+        logger.error("Dashboard error: %s", e, exc_info=True)
+        clear_session()
         return redirect(url_for("auth.login"))
-    finally:
-        if blog_model:
-            blog_model = None
 
 
 @blog_bp.route("/download")
 def download_pdf():
     """Generate and download PDF"""
-    pdf_generator = None
-
     try:
         current_user = AuthService.get_current_user()
         if not current_user:
             logger.warning("Unauthorized PDF download attempt")
             return redirect(url_for("auth.login"))
 
-        # Retrieve blog data from temporary storage
-        storage_key = session.get("blog_storage_key")
-        blog_data = None
+        # Load the current blog post referenced by the session
+        post_id = session.get("current_blog_id")
+        post = None
 
-        if storage_key:
-            blog_data = retrieve_large_data(
-                "current_blog", str(current_user["_id"]))
+        if post_id:
+            post = BlogPost().get_post_by_id(post_id, current_user["_id"])
 
-        if not blog_data:
+        if not post:
             logger.warning(
-                f"PDF download failed: No blog data found for user {current_user['username']}"
+                "PDF download failed: No blog data found for user %s",
+                current_user["username"],
             )
             return (
                 jsonify({"success": False, "message": "No blog data found or expired"}),
                 404,
             )
 
-        blog_content = blog_data["blog_content"]
-        title = blog_data["title"]
+        blog_content = post["content"]
+        title = post["title"]
+
+        # Skip regenerating a PDF the client already has
+        etag = _pdf_etag(post)
+        not_modified = _pdf_not_modified(etag)
+        if not_modified:
+            return not_modified
 
         # Clean filename
         safe_title = sanitize_filename(title)
         filename = f"{safe_title}_blog.pdf"
 
         logger.info(
-            f"PDF generation started for user {current_user['username']}: {title}"
+            "PDF generation started for user %s: %s", current_user['username'], title
         )
 
-        # Generate PDF
-        try:
-            pdf_generator = PDFGeneratorTool()
-            pdf_bytes = pdf_generator.generate_pdf_bytes(blog_content)
-            logger.info(f"PDF download completed successfully: {filename}")
-        finally:
-            if pdf_generator:
-                pdf_generator = None
-
-        # Create in-memory file
-        mem_file = io.BytesIO()
-        mem_file.write(pdf_bytes)
-        mem_file.seek(0)
-
-        return send_file(
-            mem_file,
-            as_attachment=True,
-            download_name=filename,
-            mimetype="application/pdf",
-        )
+        response = _send_pdf(blog_content, filename, etag)
+        logger.info("PDF download completed successfully: %s", filename)
+        return response
 
     except Exception as e:
-        logger.error(f"PDF generation failed: {str(e)}", exc_info=True)
+        logger.error("PDF generation failed: %s", e, exc_info=True)
         return (
             jsonify({"success": False, "message": f"PDF generation failed: {str(e)}"}),
             500,
         )
-    finally:
-        if pdf_generator:
-            pdf_generator = None
 
 
 @blog_bp.route("/delete-post/<post_id>", methods=["DELETE"])
 def delete_post(post_id):
     """Delete a blog post"""
-    blog_model = None
-
     try:
         current_user = AuthService.get_current_user()
         if not current_user:
             logger.warning(
-                f"Unauthorized post deletion attempt for post {post_id}"
+                "Unauthorized post deletion attempt for post %s", post_id
             )
             return (
                 jsonify({"success": False, "message": "Authentication required"}),
@@ -373,7 +780,7 @@ def delete_post(post_id):
             )
 
         logger.info(
-            f"Post deletion requested by user {current_user['username']}: {post_id}"
+            "Post deletion requested by user %s: %s", current_user['username'], post_id
         )
 
         blog_model = BlogPost()
@@ -381,37 +788,32 @@ def delete_post(post_id):
             success = blog_model.delete_post(post_id, current_user["_id"])
         except Exception as db_error:
             logger.error(
-                f"Database error deleting post: {str(db_error)}", exc_info=True
+                "Database error deleting post: %s", db_error, exc_info=True
             )
             raise
 
         if success:
-            logger.info(f"Post deleted successfully: {post_id}")
+            logger.info("Post deleted successfully: %s", post_id)
             return jsonify({"success": True,
                             "message": "Post deleted successfully"})
         else:
-            logger.warning(f"Post not found for deletion: {post_id}")
+            logger.warning("Post not found for deletion: %s", post_id)
             return jsonify(
                 {"success": False, "message": "Post not found"}), 404
 
     except Exception as e:
-        logger.error(f"Error deleting post {post_id}: {str(e)}", exc_info=True)
+        logger.error("Error deleting post %s: %s", post_id, e, exc_info=True)
         return jsonify({"success": False, "message": str(e)}), 500
-    finally:
-        if blog_model:
-            blog_model = None
 
 
 @blog_bp.route("/get-post/<post_id>")
 def get_post(post_id):
     """Get a specific blog post for viewing"""
-    blog_model = None
-
     try:
         current_user = AuthService.get_current_user()
         if not current_user:
             logger.warning(
-                f"Unauthorized post access attempt for post {post_id}"
+                "Unauthorized post access attempt for post %s", post_id
             )
             return (
                 jsonify({"success": False, "message": "Authentication required"}),
@@ -419,7 +821,7 @@ def get_post(post_id):
             )
 
         logger.info(
-            f"Post retrieval requested by user {current_user['username']}: {post_id}"
+            "Post retrieval requested by user %s: %s", current_user['username'], post_id
         )
 
         blog_model = BlogPost()
@@ -427,104 +829,86 @@ def get_post(post_id):
             post = blog_model.get_post_by_id(post_id, current_user["_id"])
         except Exception as db_error:
             logger.error(
-                f"Database error retrieving post: {str(db_error)}", exc_info=True
+                "Database error retrieving post: %s", db_error, exc_info=True
             )
             raise
 
         if post:
-            logger.info(f"Post retrieved successfully: {post_id}")
-            return jsonify({"success": True, "post": post})
+            logger.info("Post retrieved successfully: %s", post_id)
+            # Clients re-opening a post they already have get a bodiless
+            # 304 (Flask-Compress only checks conditionals on compressed
+            # responses, so it's done here too)
+            response = jsonify({"success": True, "post": post})
+            response.add_etag()
+            response.cache_control.private = True
+            return response.make_conditional(request)
         else:
-            logger.warning(f"Post not found: {post_id}")
+            logger.warning("Post not found: %s", post_id)
             return jsonify(
                 {"success": False, "message": "Post not found"}), 404
 
     except Exception as e:
         logger.error(
-            f"Error retrieving post {post_id}: {str(e)}", exc_info=True
+            "Error retrieving post %s: %s", post_id, e, exc_info=True
         )
         return jsonify({"success": False, "message": str(e)}), 500
-    finally:
-        if blog_model:
-            blog_model = None
 
 
 @blog_bp.route("/download-post/<post_id>")
 def download_post_pdf(post_id):
     """Download PDF for a specific blog post"""
-    pdf_generator = None
-    blog_model = None
-
     try:
         current_user = AuthService.get_current_user()
         if not current_user:
             logger.warning(
-                f"Unauthorized PDF download attempt for post {post_id}"
+                "Unauthorized PDF download attempt for post %s", post_id
             )
             return redirect(url_for("auth.login"))
 
-        logger.info(f"PDF download requested for post: {post_id}")
+        logger.info("PDF download requested for post: %s", post_id)
 
         blog_model = BlogPost()
         try:
             post = blog_model.get_post_by_id(post_id, current_user["_id"])
         except Exception as db_error:
             logger.error(
-                f"Database error retrieving post for PDF: {str(db_error)}",
+                "Database error retrieving post for PDF: %s", db_error,
                 exc_info=True,
             )
             raise
 
         if not post:
-            logger.warning(f"Post not found for PDF download: {post_id}")
+            logger.warning("Post not found for PDF download: %s", post_id)
             return jsonify(
                 {"success": False, "message": "Post not found"}), 404
 
         blog_content = post["content"]
         title = post["title"]
 
+        # Skip regenerating a PDF the client already has
+        etag = _pdf_etag(post)
+        not_modified = _pdf_not_modified(etag)
+        if not_modified:
+            return not_modified
+
         # Clean filename
         safe_title = sanitize_filename(title)
         filename = f"{safe_title}_blog.pdf"
 
-        logger.info(f"PDF generation started for post {post_id}: {title}")
-
-        # Generate PDF
-        try:
-            pdf_generator = PDFGeneratorTool()
-            pdf_bytes = pdf_generator.generate_pdf_bytes(blog_content)
-            logger.info(f"PDF generated successfully for post {post_id}")
-        finally:
-            if pdf_generator:
-                pdf_generator = None
-
-        # Create in-memory file
-        mem_file = io.BytesIO()
-        mem_file.write(pdf_bytes)
-        mem_file.seek(0)
+        logger.info("PDF generation started for post %s: %s", post_id, title)
 
-        logger.info(f"PDF download completed for post {post_id}")
-
-        return send_file(
-            mem_file,
-            as_attachment=True,
-            download_name=filename,
-            mimetype="application/pdf",
-        )
+        response = _send_pdf(blog_content, filename, etag)
+        logger.info("PDF download completed for post %s", post_id)
+        return response
 
     except Exception as e:
         logger.error(
-            f"PDF generation failed for post {post_id}: {str(e)}", exc_info=True
+            "PDF generation failed for post %s: %s", post_id, e, exc_info=True
         )
         return (
             jsonify({"success": False, "message": f"PDF generation failed: {str(e)}"}),
             500,
         )
-    finally:
-        if blog_model:
-            blog_model = None
-        if pdf_generator:
-            pdf_generator = None
 
 
 @blog_bp.route("/contact")
@@ -534,7 +918,7 @@ def contact():
         logger.info("Contact page accessed")
         return render_template("contact.html")
     except Exception as e:
-        logger.error(f"Error loading contact page: {str(e)}", exc_info=True)
+        logger.error("Error loading contact page: %s", e, exc_info=True)
         return (
             render_template(
                 "error.html", error=f"Error loading contact page: {str(e)}"
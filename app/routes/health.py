@@ -13,6 +13,27 @@ logger = logging.getLogger(__name__)
 health_bp = Blueprint("health", __name__)
 
 
+def _system_stats():
+    """Return (cpu_percent, memory, disk), reusing a recent sample
+
+    ``psutil.cpu_percent`` blocks for its sampling interval, so the result
+    is kept for HEALTH_STATS_TTL seconds and shared between probes.
+    """
+    now = time.monotonic()
+    cached = getattr(current_app, "system_stats", None)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    stats = (
+        psutil.cpu_percent(interval=0.1),
+        psutil.virtual_memory(),
+        psutil.disk_usage("/"),
+    )
+    current_app.system_stats = (
+        now + current_app.config.get("HEALTH_STATS_TTL", 0), stats)
+    return stats
+
+
 @health_bp.route("/health")
 def health_check():
     """Health check endpoint with detailed system information"""
@@ -21,9 +42,8 @@ def health_check():
         db_connected = mongo_manager.is_connected()
 
         # Get system information
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage("/")
+        cpu_percent, memory, disk = _system_stats()
+        loki_url = os.getenv("LOKI_URL")
 
         health_data = {
             "status": "healthy" if db_connected else "unhealthy",
@@ -31,7 +51,7 @@ def health_check():
             "database": "connected" if db_connected else "disconnected",
             "secret_key_set": bool(current_app.secret_key),
             "temp_storage_items": len(current_app.temp_storage),
-            "loki_url": os.getenv("LOKI_URL", "not_configured"),
+            "loki_url": loki_url or "not_configured",
             "system": {
                 "cpu_percent": cpu_percent,
                 "memory_percent": memory.percent,
@@ -62,7 +82,7 @@ def health_check():
                 "database": health_data["database"],
                 "cpu_percent": cpu_percent,
                 "memory_percent": memory.percent,
-                "loki_configured": bool(os.getenv("LOKI_URL")),
+                "loki_configured": bool(loki_url),
             },
         )
 
@@ -98,9 +118,7 @@ def health_metrics():
     """Prometheus-compatible health metrics endpoint"""
     try:
         # Get system information
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage("/")
+        cpu_percent, memory, disk = _system_stats()
 
         # Check database connection
         db_connected = mongo_manager.is_connected()
@@ -138,7 +156,7 @@ def health_metrics():
         return Response(response_text, mimetype="text/plain")
 
     except Exception as e:
-        logger.error(f"Health metrics error: {e}", exc_info=True)
+        logger.error("Health metrics error: %s", e, exc_info=True)
         # Return error metric
         error_response = f'app_health_status 0\napp_error {{error="{str(e)}"}} 1\n'
         return Response(error_response, mimetype="text/plain"), 503
@@ -1,11 +1,4 @@
-import logging
-
-from flask import g, request, session
-from flask_jwt_extended import decode_token
-
-from app.models.user import User
-
-logger = logging.getLogger(__name__)
+from app.utils import security
 
 
 class AuthService:
@@ -13,61 +6,17 @@ class AuthService:
 
     @staticmethod
     def get_current_user():
-        """Get current user from various authentication sources"""
-        user_model = None
-        try:
-            token = None
-
-            # Check Authorization header
-            auth_header = request.headers.get("Authorization")
-            if auth_header and auth_header.startswith("Bearer "):
-                token = auth_header.split(" ")[1]
-
-            # Check session for token
-            if not token:
-                token = session.get("access_token")
+        """Get current user from various authentication sources.
 
-            # Check user_id directly in session as fallback
-            if not token:
-                user_id = session.get("user_id")
-                if user_id:
-                    user_model = User()
-                    current_user = user_model.get_user_by_id(user_id)
-                    if current_user:
-                        g.user_id = str(current_user["_id"])
-                        return current_user
+        Shares app.utils.security's per-request cache, so routes and
+        templates resolve the user with one token decode and lookup.
+        """
+        return security.get_current_user()
 
-            if token:
-                try:
-                    decoded_token = decode_token(token)
-                    current_user_id = decoded_token.get("sub")
-
-                    if current_user_id:
-                        user_model = User()
-                        current_user = user_model.get_user_by_id(
-                            current_user_id)
-                        if current_user:
-                            g.user_id = str(current_user["_id"])
-                            return current_user
-                except Exception:
-                    session.pop("access_token", None)
-
-            return None
-
-        except Exception as e:
-            logger.error(
-                "Error getting current user",
-                extra={
-                    "event": "user_authentication_error",
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                },
-                exc_info=True,
-            )
-            return None
-        finally:
-            if user_model:
-                user_model = None
+    @staticmethod
+    def get_token_user():
+        """Get the user named by the token claims, without a database read"""
+        return security.get_token_user()
 
     @staticmethod
     def is_authenticated():
@@ -77,4 +26,4 @@ class AuthService:
     @staticmethod
     def clear_session():
         """Clear user session"""
-        session.clear()
+        security.clear_session()
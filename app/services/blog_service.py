@@ -1,44 +1,103 @@
-import gc
+import functools
 import logging
 import os
 import re
 from contextlib import contextmanager
-from pathlib import Path
 
-from dotenv import load_dotenv
+from app.config import load_environment
+from app.utils.validators import extract_video_id, validate_youtube_url
 
 logger = logging.getLogger(__name__)
 
 # Load environment variables
-env_path = Path(__file__).resolve().parent.parent.parent / ".env"
-if env_path.exists():
-    load_dotenv(dotenv_path=env_path)
-else:
-    load_dotenv()
+load_environment()
 
 # Get API key
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL_NAME = os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini")
 
 
+def _compile_substitutions(rules):
+    """Compile (pattern, replacement, flags) rules into (regex, replacement)"""
+    return tuple(
+        (re.compile(pattern, flags), replacement)
+        for pattern, replacement, flags in rules
+    )
+
+
+# Clean-up passes for generated blogs, compiled once at import and applied
+# in order
+_MARKDOWN_CLEANUP = _compile_substitutions((
+    # Remove markdown artifacts
+    (r"\*\*([^*]+)\*\*", r"\1", 0),  # Remove bold asterisks
+    (r"\*([^*]+)\*", r"\1", 0),  # Remove italic asterisks
+    (r"_{2,}", "", 0),  # Remove underscores
+    (r"-{3,}", "", 0),  # Remove horizontal rules
+    (r"\|{2,}", "", 0),  # Remove pipe symbols
+    (r"`{3,}", "", 0),  # Remove code blocks
+    (r"`([^`]+)`", r"\1", 0),  # Remove inline code
+    # Fix spacing issues
+    (r"\n{3,}", "\n\n", 0),  # Max 2 newlines
+    (r"^\s+", "", re.MULTILINE),  # Remove leading spaces
+    (r"\s+$", "", re.MULTILINE),  # Remove trailing spaces
+    # Ensure proper heading format
+    (r"^#{4,}\s*", "### ", re.MULTILINE),  # Max 3 levels
+    (r"^(#{1,3})\s*(.+?)$", r"\1 \2\n", re.MULTILINE),
+    # Fix list formatting
+    (r"^\*\s+", "- ", re.MULTILINE),  # Convert asterisk lists to dashes
+    (r"^(\d+)\.\s+", r"\1. ", re.MULTILINE),  # Fix numbered lists
+))
+
+_FINAL_OUTPUT_CLEANUP = _compile_substitutions((
+    # Remove tool mentions and actions
+    (r"Action:\s*\w+", "", re.IGNORECASE),
+    (r"Tool:\s*\w+", "", re.IGNORECASE),
+    (r"BlogGeneratorTool", "", re.IGNORECASE),
+    (r"YouTubeTranscriptTool", "", re.IGNORECASE),
+    # Remove JSON artifacts and unmatched braces
+    (r'\{[^{}]*"[^"]*"[^{}]*\}', "", re.DOTALL),
+    (r"\{[^{}]*\}", "", re.DOTALL),
+    (r"[{}]", "", 0),
+    # Remove markdown artifacts but preserve proper formatting
+    (r"\*{3,}", "", 0),  # Remove excess asterisks
+    (r"-{3,}", "", 0),  # Remove horizontal rules
+    (r"\|{2,}", "", 0),  # Remove pipe symbols
+    (r"_{3,}", "", 0),  # Remove excess underscores
+    # Fix heading formatting with proper spacing
+    (r"^(\s*#{4,})\s*", r"\1### ", re.MULTILINE),
+    (r"^(\s*#{1,3})\s*(\S)", r"\1 \2", re.MULTILINE),
+    # Ensure proper spacing between sections
+    (r"\n{3,}", "\n\n", 0),
+    (r"^\s+", "", re.MULTILINE),
+    (r"\s+$", "", re.MULTILINE),
+    # Fix list formatting
+    (r"^\•\s+", "- ", re.MULTILINE),
+    (r"^\*\s+", "- ", re.MULTILINE),
+    (r"^(\d+)\.\s+", r"\1. ", re.MULTILINE),
+))
+
+
+@functools.lru_cache(maxsize=1)
+def _openai_client():
+    """Shared OpenAI client, created on first use.
+
+    The client is thread-safe and keeps a connection pool, so reusing it
+    saves each generation a new HTTP client and TLS handshake.
+    """
+    # Import OpenAI only when needed to avoid COM issues
+    from openai import OpenAI
+
+    return OpenAI(api_key=OPENAI_API_KEY)
+
+
 @contextmanager
 def openai_client_context():
-    """Context manager for OpenAI client to ensure proper cleanup"""
-    client = None
+    """Context manager handing out the shared OpenAI client"""
     try:
-        # Import OpenAI only when needed to avoid COM issues
-        from openai import OpenAI
-
-        client = OpenAI(api_key=OPENAI_API_KEY)
-        yield client
+        yield _openai_client()
     except Exception as e:
-        logger.error(f"OpenAI client error: {str(e)}")
+        logger.error("OpenAI client error: %s", e)
         raise
-    finally:
-        # Force cleanup
-        if client:
-            client = None
-        gc.collect()
 
 
 class BlogGeneratorTool:
@@ -113,60 +172,20 @@ class BlogGeneratorTool:
             cleaned_content = self._clean_markdown_content(generated_content)
 
             logger.info(
-                f"✅ Blog generation successful: {len(cleaned_content)} characters")
+                "✅ Blog generation successful: %s characters", len(cleaned_content))
             return cleaned_content
 
         except Exception as e:
-            logger.error(f"Blog generation failed: {str(e)}")
+            logger.error("Blog generation failed: %s", e)
             return f"ERROR: Blog generation failed - {str(e)}"
-        finally:
-            # Force garbage collection to clean up COM objects
-            gc.collect()
 
     def _clean_markdown_content(self, content: str) -> str:
         """Clean up markdown content to remove artifacts and improve formatting"""
         if not content:
             return content
 
-        # Remove markdown artifacts
-        content = re.sub(
-            r"\*\*([^*]+)\*\*",
-            r"\1",
-            content)  # Remove bold asterisks
-        # Remove italic asterisks
-        content = re.sub(r"\*([^*]+)\*", r"\1", content)
-        content = re.sub(r"_{2,}", "", content)  # Remove underscores
-        content = re.sub(r"-{3,}", "", content)  # Remove horizontal rules
-        content = re.sub(r"\|{2,}", "", content)  # Remove pipe symbols
-        content = re.sub(r"`{3,}", "", content)  # Remove code blocks
-        content = re.sub(r"`([^`]+)`", r"\1", content)  # Remove inline code
-
-        # Fix spacing issues
-        content = re.sub(r"\n{3,}", "\n\n", content)  # Max 2 newlines
-        content = re.sub(
-            r"^\s+", "", content, flags=re.MULTILINE
-        )  # Remove leading spaces
-        content = re.sub(
-            r"\s+$", "", content, flags=re.MULTILINE
-        )  # Remove trailing spaces
-
-        # Ensure proper heading format
-        content = re.sub(
-            r"^#{4,}\s*", "### ", content, flags=re.MULTILINE
-        )  # Max 3 levels
-        content = re.sub(
-            r"^(#{1,3})\s*(.+?)$",
-            r"\1 \2\n",
-            content,
-            flags=re.MULTILINE)
-
-        # Fix list formatting
-        content = re.sub(
-            r"^\*\s+", "- ", content, flags=re.MULTILINE
-        )  # Convert asterisk lists to dashes
-        content = re.sub(
-            r"^(\d+)\.\s+", r"\1. ", content, flags=re.MULTILINE
-        )  # Fix numbered lists
+        for pattern, replacement in _MARKDOWN_CLEANUP:
+            content = pattern.sub(replacement, content)
 
         # Ensure proper paragraph spacing
         lines = content.split("\n")
@@ -194,8 +213,14 @@ class BlogGeneratorTool:
         return "\n".join(formatted_lines).strip()
 
 
-def generate_blog_from_youtube(youtube_url: str, language: str = "en") -> str:
-    """Generate a blog article from a YouTube video URL"""
+def generate_blog_from_youtube(
+    youtube_url: str, language: str = "en", video_id: str = None
+) -> str:
+    """Generate a blog article from a YouTube video URL
+
+    Callers that already parsed the URL pass its ``video_id`` so it is not
+    validated and extracted a second time.
+    """
     import time
 
     start_time = time.time()
@@ -213,19 +238,18 @@ def generate_blog_from_youtube(youtube_url: str, language: str = "en") -> str:
             youtube_url, "SUPADATA_API_KEY not found in environment variables"
         )
 
-    if not youtube_url or not re.match(
-        r"^https?://(www\.)?(youtube\.com|youtu\.be)/", youtube_url
-    ):
-        return _create_error_response(
-            youtube_url, "Invalid YouTube URL provided")
+    if video_id is None:
+        if not validate_youtube_url(youtube_url):
+            return _create_error_response(
+                youtube_url, "Invalid YouTube URL provided")
 
-    video_id = _extract_video_id(youtube_url)
-    if not video_id:
-        return _create_error_response(
-            youtube_url, "Could not extract valid video ID from URL"
-        )
+        video_id = _extract_video_id(youtube_url)
+        if not video_id:
+            return _create_error_response(
+                youtube_url, "Could not extract valid video ID from URL"
+            )
 
-    logger.info(f"Starting blog generation for video ID: {video_id}")
+    logger.info("Starting blog generation for video ID: %s", video_id)
 
     try:
         logger.info("Using Supadata API approach...")
@@ -235,18 +259,18 @@ def generate_blog_from_youtube(youtube_url: str, language: str = "en") -> str:
             cleaned_output = _clean_final_output(result_text)
             duration = time.time() - start_time
             logger.info(
-                f"✅ Blog generated successfully in {duration:.2f}s (cleaned length: {len(cleaned_output)})")
+                "✅ Blog generated successfully in %.2fs (cleaned length: %s)", duration, len(cleaned_output))
             return cleaned_output
 
         duration = time.time() - start_time
-        logger.error(f"❌ Blog generation failed after {duration:.2f}s")
+        logger.error("❌ Blog generation failed after %.2fs", duration)
         return _create_error_response(
             youtube_url, "Could not generate blog content")
 
     except Exception as e:
         duration = time.time() - start_time
         logger.error(
-            f"❌ Blog generation failed after {duration:.2f}s: {str(e)}")
+            "❌ Blog generation failed after %.2fs: %s", duration, e)
         return _create_error_response(
             youtube_url, f"Unexpected error: {str(e)}")
 
@@ -264,11 +288,11 @@ def individual_components_test(youtube_url: str, language: str = "en") -> str:
 
         if transcript_result.startswith("ERROR:"):
             logger.error(
-                f"❌ Transcript extraction failed: {transcript_result}")
+                "❌ Transcript extraction failed: %s", transcript_result)
             return _create_error_response(youtube_url, transcript_result)
 
         logger.info(
-            f"✅ Transcript extraction successful: {len(transcript_result)} characters"
+            "✅ Transcript extraction successful: %s characters", len(transcript_result)
         )
 
 
@@ -278,15 +302,15 @@ def individual_components_test(youtube_url: str, language: str = "en") -> str:
         blog_result = blog_tool._run(transcript_result)
 
         if blog_result.startswith("ERROR:"):
-            logger.error(f"❌ Blog generation failed: {blog_result}")
+            logger.error("❌ Blog generation failed: %s", blog_result)
             return _create_error_response(youtube_url, blog_result)
 
         logger.info(
-            f"✅ Blog generation successful: {len(blog_result)} characters")
+            "✅ Blog generation successful: %s characters", len(blog_result))
         return blog_result
 
     except Exception as e:
-        logger.error(f"❌ Component test failed: {str(e)}")
+        logger.error("❌ Component test failed: %s", e)
         return _create_error_response(
             youtube_url,
             f"Component test failed: {str(e)}")
@@ -294,26 +318,7 @@ def individual_components_test(youtube_url: str, language: str = "en") -> str:
 
 def _extract_video_id(url: str) -> str:
     """Extract video ID from URL with enhanced patterns"""
-    if not url:
-        return None
-
-    patterns = [
-        r"youtube\.com/watch\?v=([^&]+)",
-        r"youtu\.be/([^?]+)",
-        r"youtube\.com/embed/([^?]+)",
-        r"youtube\.com/v/([^?]+)",
-        r"youtube\.com/shorts/([^?]+)",
-        r"m\.youtube\.com/watch\?v=([^&]+)",
-        r"youtube\.com/live/([^?]+)",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            video_id = match.group(1)
-            if re.match(r"^[a-zA-Z0-9_-]{11}$", video_id):
-                return video_id
-    return None
+    return extract_video_id(url)
 
 
 def _clean_final_output(content: str) -> str:
@@ -321,44 +326,8 @@ def _clean_final_output(content: str) -> str:
     if not content:
         return ""
 
-    # Remove tool mentions and actions
-    content = re.sub(r"Action:\s*\w+", "", content, flags=re.IGNORECASE)
-    content = re.sub(r"Tool:\s*\w+", "", content, flags=re.IGNORECASE)
-    content = re.sub(r"BlogGeneratorTool", "", content, flags=re.IGNORECASE)
-    content = re.sub(
-        r"YouTubeTranscriptTool",
-        "",
-        content,
-        flags=re.IGNORECASE)
-
-    # Remove JSON artifacts and unmatched braces
-    content = re.sub(r'\{[^{}]*"[^"]*"[^{}]*\}', "", content, flags=re.DOTALL)
-    content = re.sub(r"\{[^{}]*\}", "", content, flags=re.DOTALL)
-    content = re.sub(r"[{}]", "", content)
-
-    # Remove markdown artifacts but preserve proper formatting
-    content = re.sub(r"\*{3,}", "", content)  # Remove excess asterisks
-    content = re.sub(r"-{3,}", "", content)  # Remove horizontal rules
-    content = re.sub(r"\|{2,}", "", content)  # Remove pipe symbols
-    content = re.sub(r"_{3,}", "", content)  # Remove excess underscores
-
-    # Fix heading formatting with proper spacing
-    content = re.sub(r"^(\s*#{4,})\s*", r"\1### ", content, flags=re.MULTILINE)
-    content = re.sub(
-        r"^(\s*#{1,3})\s*(\S)",
-        r"\1 \2",
-        content,
-        flags=re.MULTILINE)
-
-    # Ensure proper spacing between sections
-    content = re.sub(r"\n{3,}", "\n\n", content)
-    content = re.sub(r"^\s+", "", content, flags=re.MULTILINE)
-    content = re.sub(r"\s+$", "", content, flags=re.MULTILINE)
-
-    # Fix list formatting
-    content = re.sub(r"^\•\s+", "- ", content, flags=re.MULTILINE)
-    content = re.sub(r"^\*\s+", "- ", content, flags=re.MULTILINE)
-    content = re.sub(r"^(\d+)\.\s+", r"\1. ", content, flags=re.MULTILINE)
+    for pattern, replacement in _FINAL_OUTPUT_CLEANUP:
+        content = pattern.sub(replacement, content)
 
     # Ensure proper paragraph structure with better spacing
     lines = content.split("\n")
@@ -1,19 +1,15 @@
 import json
 import logging
 import os
-from pathlib import Path
 
 import requests
-from dotenv import load_dotenv
+
+from app.config import load_environment
 
 logger = logging.getLogger(__name__)
 
 # Load environment variables
-env_path = Path(__file__).resolve().parent.parent.parent / ".env"
-if env_path.exists():
-    load_dotenv(dotenv_path=env_path)
-else:
-    load_dotenv()
+load_environment()
 
 # Get API key
 SUPADATA_API_KEY = os.getenv("SUPADATA_API_KEY")
@@ -36,7 +32,7 @@ class YouTubeTranscriptTool:
             endpoint = "https://api.supadata.ai/v1/youtube/transcript"
             params = {"url": youtube_url, "lang": lang, "text": "true"}
 
-            logger.info(f"Fetching transcript for URL: {youtube_url}")
+            logger.info("Fetching transcript for URL: %s", youtube_url)
 
             resp = session.get(endpoint, params=params, timeout=30)
             resp.raise_for_status()
@@ -46,21 +42,21 @@ class YouTubeTranscriptTool:
                 return f"ERROR: Transcript not found for video: {youtube_url}"
 
             logger.info(
-                f"✅ Transcript extraction successful: {len(data['content'])} characters"
+                "✅ Transcript extraction successful: %s characters", len(data['content'])
             )
             return data["content"]
 
         except requests.exceptions.HTTPError as e:
-            logger.error(f"HTTP error: {str(e)}")
+            logger.error("HTTP error: %s", e)
             return f"ERROR: HTTP error - {str(e)}"
         except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed: {str(e)}")
+            logger.error("Request failed: %s", e)
             return f"ERROR: Request failed - {str(e)}"
         except json.JSONDecodeError:
             logger.error("Invalid JSON response from API")
             return "ERROR: Invalid response from transcript API"
         except Exception as e:
-            logger.error(f"Unexpected error: {str(e)}")
+            logger.error("Unexpected error: %s", e)
             return f"ERROR: Unexpected error - {str(e)}"
         finally:
             if session:
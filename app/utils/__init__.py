@@ -1,12 +1,14 @@
 from .rate_limiter import RateLimiter
-from .security import get_current_user, inject_config, inject_user
-from .validators import extract_video_id, validate_youtube_url
+from .security import get_current_user, get_token_user, inject_user
+from .validators import (extract_video_id, parse_youtube_url,
+                         validate_youtube_url)
 
 __all__ = [
     "validate_youtube_url",
     "extract_video_id",
+    "parse_youtube_url",
     "get_current_user",
+    "get_token_user",
     "inject_user",
-    "inject_config",
     "RateLimiter",
 ]
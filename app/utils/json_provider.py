@@ -0,0 +1,29 @@
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+# Matches DefaultJSONProvider: sorted keys, and datetimes handed to its
+# default() so they keep Flask's HTTP date format
+ORJSON_OPTIONS = (
+    orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+)
+# What Flask passes for compact responses; orjson output is always compact
+COMPACT_DUMPS_KWARGS = {"separators": (",", ":")}
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson for jsonify and request.json"""
+
+    def dumps(self, obj, **kwargs):
+        # Options orjson has no equivalent for (e.g. indent in debug mode)
+        # go through the stdlib encoder
+        if kwargs and kwargs != COMPACT_DUMPS_KWARGS:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=ORJSON_OPTIONS).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
@@ -30,13 +30,13 @@ class RateLimiter:
         minute_requests = len(self.minute_buckets[identifier])
         if minute_requests >= self.requests_per_minute:
             logger.warning(
-                f"Rate limit exceeded (per minute) for {identifier}")
+                "Rate limit exceeded (per minute) for %s", identifier)
             return False
 
         # Check hour limit
         hour_requests = len(self.hour_buckets[identifier])
         if hour_requests >= self.requests_per_hour:
-            logger.warning(f"Rate limit exceeded (per hour) for {identifier}")
+            logger.warning("Rate limit exceeded (per hour) for %s", identifier)
             return False
 
         # Add current request
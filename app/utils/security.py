@@ -1,52 +1,107 @@
+import hashlib
+import json
 import logging
+import threading
+import time
 
 from flask import current_app, g, request, session
 from flask_jwt_extended import decode_token
+from werkzeug.local import LocalProxy
 
 logger = logging.getLogger(__name__)
 
+# Large data expires after one hour by default, in Redis and in memory
+LARGE_DATA_TTL = 3600
+REDIS_KEY_PREFIX = "blog:"
+# In-memory fallback keeps at most this many items, dropping the least
+# recently used first
+TEMP_STORAGE_MAX_ITEMS = 1000
+# Expired items are skipped on read, so stores sweep them out at most this
+# often (seconds) instead of scanning the whole storage every time
+STORAGE_SWEEP_INTERVAL = 60
+# Guards the in-memory storage: request threads store, read (which moves
+# items) and sweep it concurrently
+_temp_storage_lock = threading.Lock()
+# Verified JWT claims are reused for this many seconds (never past the
+# token's own expiry), so repeat requests skip signature verification
+TOKEN_CLAIMS_TTL = 30
+TOKEN_CLAIMS_MAX_ITEMS = 4096
+_token_claims_lock = threading.Lock()
+
+
+def _request_token():
+    """Return the JWT from the Authorization header or the session"""
+    auth_header = request.headers.get("Authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        return auth_header.split(" ")[1]
+    return session.get("access_token")
+
+
+def _decode_claims(token):
+    """Decode and verify a JWT, reusing a recent result for the same token.
+
+    Claims are kept per app (keyed by a digest, not the raw token) and only
+    successful decodes are cached.
+    """
+    cache = getattr(current_app, "token_claims", None)
+    if cache is None:
+        return decode_token(token)
+
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = time.time()
+    with _token_claims_lock:
+        entry = cache.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    claims = decode_token(token)
+    expires = now + TOKEN_CLAIMS_TTL
+    if claims.get("exp"):
+        expires = min(expires, claims["exp"])
+    with _token_claims_lock:
+        cache.pop(key, None)
+        cache[key] = (expires, claims)
+        while len(cache) > TOKEN_CLAIMS_MAX_ITEMS:
+            cache.pop(next(iter(cache)), None)
+    return claims
+
 
 def get_current_user():
     """Get current user from various authentication sources"""
     from app.models.user import User
 
-    user_model = None
-    try:
-        token = None
-
-        # Check Authorization header
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ")[1]
+    # Resolved at most once per request
+    if "current_user" in g:
+        return g.current_user
 
-        # Check session for token
-        if not token:
-            token = session.get("access_token")
+    try:
+        token = _request_token()
 
         # Check user_id directly in session as fallback
         if not token:
             user_id = session.get("user_id")
             if user_id:
-                user_model = User()
-                current_user = user_model.get_user_by_id(user_id)
+                current_user = User().get_user_by_id(user_id)
                 if current_user:
                     g.user_id = str(current_user["_id"])
+                    g.current_user = current_user
                     return current_user
 
         if token:
             try:
-                decoded_token = decode_token(token)
+                decoded_token = _decode_claims(token)
                 current_user_id = decoded_token.get("sub")
 
                 if current_user_id:
-                    user_model = User()
-                    current_user = user_model.get_user_by_id(current_user_id)
+                    current_user = User().get_user_by_id(current_user_id)
                     if current_user:
                         g.user_id = str(current_user["_id"])
+                        g.current_user = current_user
                         return current_user
             except Exception:
                 session.pop("access_token", None)
 
+        g.current_user = None
         return None
 
     except Exception as e:
@@ -59,69 +114,161 @@ def get_current_user():
             },
             exc_info=True,
         )
+        g.current_user = None
         return None
-    finally:
-        if user_model:
-            user_model = None
 
 
-def inject_config():
-    """Make config available in templates"""
-    return dict(config=current_app.config)
+def get_token_user():
+    """Get the current user from the token claims, without a database read.
+
+    Only has the ID, username and email; routes that read or change the
+    user's data should use get_current_user() instead. Tokens issued
+    without profile claims fall back to it.
+    """
+    if "current_user" in g:
+        return g.current_user
+    if "token_user" in g:
+        return g.token_user
+
+    token = _request_token()
+    if token:
+        try:
+            claims = _decode_claims(token)
+        except Exception:
+            claims = {}
+        if claims.get("sub") and "username" in claims:
+            g.token_user = {
+                "_id": claims["sub"],
+                "username": claims["username"],
+                "email": claims.get("email"),
+            }
+            return g.token_user
+    elif not session.get("user_id"):
+        # Anonymous: nothing to look up
+        return None
+
+    return get_current_user()
 
 
 def inject_user():
-    """Inject current user into all templates"""
-    current_user = get_current_user()
-    return dict(current_user=current_user,
-                user_logged_in=current_user is not None)
+    """Inject current user into all templates.
 
+    The values are lazy proxies: templates that never use them (e.g. the
+    error page) skip the token lookup entirely.
+    """
+    return dict(current_user=LocalProxy(get_token_user),
+                user_logged_in=LocalProxy(
+                    lambda: get_token_user() is not None))
 
-def store_large_data(key, data, user_id=None):
-    """Store large data outside of session to avoid cookie size limits"""
-    import time
 
+def store_large_data(key, data, user_id=None, ttl=LARGE_DATA_TTL):
+    """Store large data outside of session to avoid cookie size limits"""
     storage_key = f"{user_id}_{key}" if user_id else key
-    current_app.temp_storage[storage_key] = {
-        "data": data, "timestamp": time.time()}
 
-    # Clean old data (older than 1 hour)
-    cleanup_old_storage()
+    redis_client = getattr(current_app, "redis_client", None)
+    if redis_client is not None:
+        try:
+            redis_client.setex(
+                f"{REDIS_KEY_PREFIX}{storage_key}",
+                ttl,
+                json.dumps(data),
+            )
+            logger.debug("Stored large data in Redis with key: %s", storage_key)
+            return storage_key
+        except Exception as e:
+            logger.warning(
+                "Redis store failed, using in-memory storage: %s", e)
+
+    storage = current_app.temp_storage
+    max_items = current_app.config.get(
+        "TEMP_STORAGE_MAX_ITEMS", TEMP_STORAGE_MAX_ITEMS)
+    now = time.time()
+    expired = 0
+    with _temp_storage_lock:
+        # Re-inserting moves the key to the most recently used end
+        storage.pop(storage_key, None)
+        storage[storage_key] = {"data": data, "timestamp": now, "ttl": ttl}
+
+        # Clean expired data, then the least recently used beyond the limit
+        last_sweep = getattr(current_app, "temp_storage_swept_at", 0)
+        if now - last_sweep >= STORAGE_SWEEP_INTERVAL:
+            expired = _sweep_expired_storage(now)
+        while len(storage) > max_items:
+            storage.pop(next(iter(storage)), None)
 
-    logger.debug(f"Stored large data with key: {storage_key}")
+    if expired:
+        logger.info("Cleaned up %s expired storage items", expired)
+
+    logger.debug("Stored large data with key: %s", storage_key)
     return storage_key
 
 
 def retrieve_large_data(key, user_id=None):
     """Retrieve large data from temporary storage"""
-    import time
-
     storage_key = f"{user_id}_{key}" if user_id else key
-    stored_item = current_app.temp_storage.get(storage_key)
+
+    redis_client = getattr(current_app, "redis_client", None)
+    if redis_client is not None:
+        try:
+            payload = redis_client.get(f"{REDIS_KEY_PREFIX}{storage_key}")
+            if payload is not None:
+                logger.debug(
+                    "Retrieved large data from Redis with key: %s", storage_key)
+                return json.loads(payload)
+        except Exception as e:
+            logger.warning(
+                "Redis lookup failed, using in-memory storage: %s", e)
+
+    storage = current_app.temp_storage
+    with _temp_storage_lock:
+        stored_item = storage.get(storage_key)
+        if stored_item:
+            # Check if data has not expired
+            ttl = stored_item.get("ttl", LARGE_DATA_TTL)
+            if time.time() - stored_item["timestamp"] < ttl:
+                # Mark as most recently used
+                storage.pop(storage_key, None)
+                storage[storage_key] = stored_item
+            else:
+                # Remove expired data
+                storage.pop(storage_key, None)
+                stored_item = None
+                logger.debug(
+                    "Removed expired data with key: %s", storage_key)
     if stored_item:
-        # Check if data is not too old (1 hour)
-        if time.time() - stored_item["timestamp"] < 3600:
-            logger.debug(f"Retrieved large data with key: {storage_key}")
-            return stored_item["data"]
-        else:
-            # Remove expired data
-            current_app.temp_storage.pop(storage_key, None)
-            logger.debug(f"Removed expired data with key: {storage_key}")
+        logger.debug("Retrieved large data with key: %s", storage_key)
+        return stored_item["data"]
     return None
 
 
-def cleanup_old_storage():
-    """Clean up old temporary storage data"""
-    import time
+def clear_session():
+    """Clear the session and the user cached for this request"""
+    # An empty session has nothing to clear and nothing to rewrite
+    if session:
+        session.clear()
+    g.pop("current_user", None)
+    g.pop("token_user", None)
 
-    current_time = time.time()
-    expired_keys = []
-    for key, item in current_app.temp_storage.items():
-        if current_time - item["timestamp"] > 3600:  # 1 hour
-            expired_keys.append(key)
+
+def _sweep_expired_storage(current_time):
+    """Drop expired items and return how many; needs _temp_storage_lock"""
+    current_app.temp_storage_swept_at = current_time
+    storage = current_app.temp_storage
+    expired_keys = [
+        key
+        for key, item in storage.items()
+        if current_time - item["timestamp"] > item.get("ttl", LARGE_DATA_TTL)
+    ]
 
     for key in expired_keys:
-        current_app.temp_storage.pop(key, None)
+        storage.pop(key, None)
+    return len(expired_keys)
+
+
+def cleanup_old_storage():
+    """Clean up old temporary storage data"""
+    with _temp_storage_lock:
+        expired = _sweep_expired_storage(time.time())
 
-    if expired_keys:
-        logger.info(f"Cleaned up {len(expired_keys)} expired storage items")
+    if expired:
+        logger.info("Cleaned up %s expired storage items", expired)
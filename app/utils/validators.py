@@ -1,15 +1,39 @@
 import logging
 import re
+import string
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
+# YouTube URL patterns, compiled once at import. URLs are ASCII, so the
+# Unicode character tables are skipped with re.ASCII.
+_YOUTUBE_URL_RE = re.compile(
+    r"^https?://(www\.)?(youtube\.com|youtu\.be)/", re.ASCII)
+# Validates the URL and captures the video ID in a single anchored match
+_YOUTUBE_VIDEO_URL_RE = re.compile(
+    r"^https?://(?:www\.|m\.)?"
+    r"(?:youtube\.com/(?:watch\?v=|embed/|v/|shorts/|live/)|youtu\.be/)"
+    r"([a-zA-Z0-9_-]{11})(?=[?&#]|$)",
+    re.ASCII,
+)
+# Longer input is rejected before any parsing; real video URLs are short
+MAX_URL_LENGTH = 2048
+# youtube.com paths whose next segment is the video ID
+_VIDEO_PATH_PREFIXES = ("/embed/", "/v/", "/shorts/", "/live/")
+_VIDEO_ID_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+_EMAIL_RE = re.compile(
+    r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$", re.ASCII)
+# Filename cleanup; \w stays Unicode-aware so accented titles keep letters
+_FILENAME_INVALID_RE = re.compile(r"[^\w\s-]")
+_FILENAME_SEPARATOR_RE = re.compile(r"[-\s]+")
+
 
 def validate_youtube_url(url: str) -> bool:
     """Validate if the provided URL is a valid YouTube URL"""
     if not url:
         return False
 
-    return bool(re.match(r"^https?://(www\.)?(youtube\.com|youtu\.be)/", url))
+    return bool(_YOUTUBE_URL_RE.match(url))
 
 
 def extract_video_id(url: str) -> str:
@@ -17,32 +41,47 @@ def extract_video_id(url: str) -> str:
     if not url:
         return None
 
-    patterns = [
-        r"youtube\.com/watch\?v=([^&]+)",
-        r"youtu\.be/([^?]+)",
-        r"youtube\.com/embed/([^?]+)",
-        r"youtube\.com/v/([^?]+)",
-        r"youtube\.com/shorts/([^?]+)",
-        r"m\.youtube\.com/watch\?v=([^&]+)",
-        r"youtube\.com/live/([^?]+)",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            video_id = match.group(1)
-            if re.match(r"^[a-zA-Z0-9_-]{11}$", video_id):
-                return video_id
+    # Dispatch on host and path instead of trying each URL shape in turn
+    try:
+        parts = urlsplit(url if "://" in url else f"//{url}")
+        host = parts.hostname or ""
+    except ValueError:
+        # Malformed URL, e.g. an unbalanced IPv6 bracket
+        return None
+    path = parts.path
+    video_id = None
+    if host == "youtu.be" or host.endswith(".youtu.be"):
+        video_id = path[1:]
+    elif host == "youtube.com" or host.endswith(".youtube.com"):
+        if path == "/watch":
+            for param in parts.query.split("&"):
+                if param.startswith("v="):
+                    video_id = param[2:]
+                    break
+        elif path.startswith(_VIDEO_PATH_PREFIXES):
+            video_id = path.split("/", 3)[2]
+
+    if (video_id and len(video_id) == 11
+            and _VIDEO_ID_CHARS.issuperset(video_id)):
+        return video_id
     return None
 
 
+def parse_youtube_url(url: str) -> str:
+    """Validate a YouTube video URL and return its video ID, or None"""
+    if not url or len(url) > MAX_URL_LENGTH:
+        return None
+
+    match = _YOUTUBE_VIDEO_URL_RE.match(url)
+    return match.group(1) if match else None
+
+
 def is_valid_email(email: str) -> bool:
     """Validate email format"""
     if not email:
         return False
 
-    pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    return bool(re.match(pattern, email))
+    return bool(_EMAIL_RE.match(email))
 
 
 def is_valid_password(password: str) -> bool:
@@ -61,8 +100,8 @@ def sanitize_filename(filename: str) -> str:
     filename = filename.strip()
 
     # Remove or replace invalid characters
-    sanitized = re.sub(r"[^\w\s-]", "", filename)
-    sanitized = re.sub(r"[-\s]+", "-", sanitized)
+    sanitized = _FILENAME_INVALID_RE.sub("", filename)
+    sanitized = _FILENAME_SEPARATOR_RE.sub("-", sanitized)
 
     # Limit length and clean up
     result = sanitized[:50].strip("-")
@@ -0,0 +1,26 @@
+"""Gunicorn settings for the production image.
+
+Gunicorn loads ./gunicorn.conf.py automatically; command line flags (see
+the Dockerfile) still apply on top of it.
+"""
+import os
+import shutil
+
+
+def on_starting(server):
+    """Start every run with an empty Prometheus multiprocess directory,
+    so metric files of workers from a previous run aren't aggregated"""
+    multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if not multiproc_dir:
+        return
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drop the live gauges of a worker that exited"""
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
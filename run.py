@@ -50,7 +50,7 @@ def validate_environment():
 
     if missing_vars:
         logger.error(
-            f"Missing required environment variables: {', '.join(missing_vars)}"
+            "Missing required environment variables: %s", ', '.join(missing_vars)
         )
         print(f"\nERROR: Missing required environment variables:")
         for var in missing_vars:
@@ -62,10 +62,10 @@ def validate_environment():
     missing_optional = [var for var in optional_vars.keys() if not os.getenv(var)]
     if missing_optional:
         logger.warning(
-            f"Missing optional environment variables: {', '.join(missing_optional)}"
+            "Missing optional environment variables: %s", ', '.join(missing_optional)
         )
         for var in missing_optional:
-            logger.warning(f"  - {var}: {optional_vars[var]}")
+            logger.warning("  - %s: %s", var, optional_vars[var])
 
     logger.info("Environment validation completed successfully")
 
@@ -86,7 +86,11 @@ def create_application():
 
 
 def main():
-    """Main application entry point"""
+    """Development server entry point
+
+    Production runs under gunicorn with gthread workers (see the
+    Dockerfile); this serves requests from Werkzeug's threaded server.
+    """
     print("YouTube Blog Generator - Starting Application")
     print("=" * 60)
 
@@ -108,28 +112,34 @@ def main():
 
         # Pre-startup verification
         logger.info("\n=== Pre-startup Verification ===")
-        logger.info(f"Secret key set: {bool(app.secret_key)}")
+        logger.info("Secret key set: %s", bool(app.secret_key))
         logger.info(
-            f"Secret key length: {len(app.secret_key) if app.secret_key else 0}"
+            "Secret key length: %s", (len(app.secret_key) if app.secret_key else 0)
         )
-        logger.info(f"JWT configured: {bool(app.config.get('JWT_SECRET_KEY'))}")
+        logger.info("JWT configured: %s", bool(app.config.get('JWT_SECRET_KEY')))
         logger.info("Production-ready modular structure loaded")
         logger.info("Prometheus metrics enabled on /metrics endpoint")
         logger.info("Enhanced logging configured")
-        logger.info(f"Loki URL: {os.getenv('LOKI_URL', 'NOT_SET')}")
+        logger.info("Loki URL: %s", os.getenv('LOKI_URL', 'NOT_SET'))
 
-        logger.info(f"\nStarting application on {host}:{port}")
-        logger.info(f"Debug mode: {debug_mode}")
+        logger.info("\nStarting application on %s:%s", host, port)
+        logger.info("Debug mode: %s", debug_mode)
         logger.info("=" * 60 + "\n")
 
         # Start the application
-        app.run(host=host, port=port, debug=debug_mode, use_reloader=debug_mode)
+        app.run(
+            host=host,
+            port=port,
+            debug=debug_mode,
+            use_reloader=debug_mode,
+            threaded=True,
+        )
 
     except KeyboardInterrupt:
         logger.info("\nApplication stopped by user")
         print("\nApplication stopped by user")
     except Exception as e:
-        logger.error(f"Failed to start application: {str(e)}", exc_info=True)
+        logger.error("Failed to start application: %s", e, exc_info=True)
         print(f"\nERROR: Failed to start application: {str(e)}")
         sys.exit(1)
     finally:
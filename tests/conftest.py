@@ -25,13 +25,15 @@ os.environ['GA_MEASUREMENT_ID'] = 'G-TEST123'
 logging.basicConfig(level=logging.CRITICAL)
 
 @pytest.fixture
-def app():
+def app(tmp_path):
     """Create and configure a test Flask application"""
     from app import create_app
     
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['WTF_CSRF_ENABLED'] = False
+    app = create_app({
+        'TESTING': True,
+        'WTF_CSRF_ENABLED': False,
+        'PDF_CACHE_DIR': str(tmp_path / 'pdf-cache'),
+    })
     
     # Initialize temp storage
     app.temp_storage = {}
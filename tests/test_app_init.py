@@ -1,3 +1,4 @@
+import os
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -16,6 +17,67 @@ class TestAppFactory:
         assert app.config['JWT_SECRET_KEY'] is not None
         assert 'temp_storage' in dir(app)
     
+    def test_gc_tuned_once_per_process(self):
+        """Test startup objects are frozen and thresholds raised only once"""
+        from app import _tune_gc
+
+        _tune_gc.cache_clear()
+        try:
+            with patch.dict('os.environ', {'PYTHON_GC_TUNE': '1'}), \
+                    patch('app.gc') as mock_gc:
+                mock_gc.get_threshold.return_value = (700, 10, 10)
+                _tune_gc()
+                _tune_gc()
+        finally:
+            _tune_gc.cache_clear()
+
+        mock_gc.freeze.assert_called_once()
+        mock_gc.set_threshold.assert_called_once_with(7000, 20, 20)
+
+    def test_create_app_generates_secret_key_once(self):
+        """Test a missing secret key is generated once and shared"""
+        from app import _generated_secret_key, create_app
+
+        env = {k: '' for k in ('JWT_SECRET_KEY', 'FLASK_SECRET_KEY', 'SECRET_KEY')}
+        _generated_secret_key.cache_clear()
+        try:
+            with patch.dict('os.environ', env), patch('app.load_environment'):
+                first = create_app({'TESTING': True})
+                second = create_app({'TESTING': True})
+        finally:
+            _generated_secret_key.cache_clear()
+
+        assert first.config['SECRET_KEY']
+        assert first.config['SECRET_KEY'] == first.config['JWT_SECRET_KEY']
+        assert first.config['SECRET_KEY'] == second.config['SECRET_KEY']
+
+    def test_create_app_requires_secret_key_in_production(self):
+        """Test a missing secret key is an error outside debug and testing"""
+        from app import create_app
+
+        env = {k: '' for k in ('JWT_SECRET_KEY', 'FLASK_SECRET_KEY', 'SECRET_KEY', 'FLASK_DEBUG')}
+        with patch.dict('os.environ', env), patch('app.load_environment'):
+            with pytest.raises(RuntimeError, match='SECRET_KEY'):
+                create_app()
+
+    @pytest.mark.parametrize('env, expected', [
+        ({'REDIS_URL': '', 'ASYNC_BLOG_GENERATION': ''}, False),
+        ({'REDIS_URL': 'redis://localhost:6379/0'}, True),
+        ({'REDIS_URL': 'redis://localhost:6379/0', 'ASYNC_BLOG_GENERATION': 'false'}, False),
+        ({'REDIS_URL': '', 'ASYNC_BLOG_GENERATION': 'true'}, True),
+    ])
+    def test_async_generation_default(self, env, expected):
+        """Test job-based generation defaults on when Redis is configured"""
+        from app import create_app
+
+        env = {'ASYNC_BLOG_GENERATION': '', **env}
+        with patch.dict('os.environ', env), patch('app.load_environment'):
+            if not env['ASYNC_BLOG_GENERATION']:
+                os.environ.pop('ASYNC_BLOG_GENERATION')
+            app = create_app({'TESTING': True})
+
+        assert app.config['ASYNC_BLOG_GENERATION'] is expected
+
     def test_app_blueprints(self, app):
         """Test that all blueprints are registered"""
         blueprints = [bp.name for bp in app.blueprints.values()]
@@ -31,10 +93,49 @@ class TestAppFactory:
         assert response.status_code == 404
         
         # Test 401 handler (will redirect)
-        with patch('app.routes.blog.AuthService.get_current_user', return_value=None):
+        with patch('app.routes.blog.AuthService.get_token_user', return_value=None):
             response = client.get('/generate-page')
             assert response.status_code == 302
     
+    def test_not_found_logs_without_traceback(self, client):
+        """Test 404s are logged as a plain warning without exception info"""
+        with patch('app.logger') as mock_logger:
+            response = client.get('/nonexistent-page')
+
+        assert response.status_code == 404
+        mock_logger.warning.assert_called_once()
+        assert 'exc_info' not in mock_logger.warning.call_args.kwargs
+
+    def test_html_responses_are_compressed(self, client):
+        """Test HTML responses are gzip-encoded when the client accepts it"""
+        response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+
+    def test_json_provider_uses_orjson(self, app):
+        """Test jsonify output matches Flask's default encoding"""
+        import datetime
+
+        from flask import jsonify
+
+        from app.utils.json_provider import OrjsonProvider
+
+        assert isinstance(app.json, OrjsonProvider)
+
+        with app.test_request_context():
+            response = jsonify({
+                'b': 1,
+                'a': 'caf\u00e9',
+                'when': datetime.datetime(2024, 1, 2, 3, 4, 5),
+            })
+
+        assert response.mimetype == 'application/json'
+        assert response.get_data(as_text=True) == (
+            '{"a":"caf\u00e9","b":1,"when":"Tue, 02 Jan 2024 03:04:05 GMT"}\n'
+        )
+        assert app.json.loads('{"a": [1, 2]}') == {'a': [1, 2]}
+
     def test_template_filters(self, app):
         """Test custom template filters"""
         # Test nl2br filter
@@ -54,3 +155,29 @@ class TestAppFactory:
             moment = app.jinja_env.globals['moment']
             mock_moment = moment()
             assert hasattr(mock_moment, 'format')
+
+    def test_template_date_formatting(self, app):
+        """Test dates format from datetimes and ISO strings"""
+        import datetime
+
+        format_date = app.jinja_env.globals['format_date']
+        moment = app.jinja_env.globals['moment']
+        created = datetime.datetime(2024, 3, 5, 12, 0)
+
+        assert format_date(created) == 'Mar 05, 2024'
+        assert format_date('2024-03-05T12:00:00Z') == 'Mar 05, 2024'
+        assert format_date('not a date') == 'not a date'
+        assert moment(created).format('YYYY-MM-DD') == '2024-03-05'
+        assert moment('2024-03-05T12:00:00Z').format('MM/DD/YYYY') == '03/05/2024'
+
+    @patch('app.monitoring.metrics.threading.Thread')
+    def test_create_app_testing_skips_metrics_thread(self, mock_thread):
+        """Test app instances built for testing don't start the metrics thread"""
+        from app import create_app
+        from app.monitoring.metrics import collect_system_metrics
+
+        app = create_app({'TESTING': True})
+
+        assert app.config['TESTING'] is True
+        targets = [c.kwargs.get('target') for c in mock_thread.call_args_list]
+        assert collect_system_metrics not in targets
@@ -1,4 +1,5 @@
 import os
+from unittest.mock import patch
 
 import pytest
 
@@ -32,4 +33,18 @@ class TestConfiguration:
         
         assert config.DEBUG is False
         assert config.FLASK_ENV == 'production'
-        assert config.SESSION_COOKIE_SECURE is True
\ No newline at end of file
+        assert config.SESSION_COOKIE_SECURE is True
+
+    def test_load_environment_runs_once(self):
+        """Test the .env file is loaded once per process"""
+        from app.config import load_environment
+
+        load_environment.cache_clear()
+        try:
+            with patch('app.config.load_dotenv') as mock_load_dotenv:
+                load_environment()
+                load_environment()
+        finally:
+            load_environment.cache_clear()
+
+        mock_load_dotenv.assert_called_once()
@@ -348,6 +348,28 @@ Regular paragraph text"""
         assert result == b'PDF content'
         assert mock_pdf.output.call_count == 2
 
+    def test_write_pdf_to_file(self, tmp_path):
+        """Test the PDF is written straight into a file object"""
+        from app.crew.tools import PDFGeneratorTool
+
+        pdf_path = tmp_path / 'blog.pdf'
+        with open(pdf_path, 'wb') as fileobj:
+            PDFGeneratorTool().write_pdf('# Title\n\nSome content', fileobj)
+
+        assert pdf_path.read_bytes().startswith(b'%PDF')
+
+    @patch('app.crew.tools.FPDF')
+    def test_write_pdf_exception(self, mock_fpdf_class):
+        """Test write_pdf wraps layout failures like generate_pdf_bytes"""
+        import io
+
+        from app.crew.tools import PDFGeneratorTool
+
+        mock_fpdf_class.return_value.add_page.side_effect = Exception("FPDF error")
+
+        with pytest.raises(RuntimeError, match="PDF generation error"):
+            PDFGeneratorTool().write_pdf('# Title', io.BytesIO())
+
     @patch('app.crew.tools.FPDF')
     def test_add_header_footer(self, mock_fpdf_class):
         """Test header and footer addition (indirectly through multi-page)"""
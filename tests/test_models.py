@@ -1,3 +1,4 @@
+import sys
 from datetime import datetime
 from unittest.mock import MagicMock, Mock, call, patch
 
@@ -7,6 +8,15 @@ from werkzeug.security import check_password_hash, generate_password_hash
 
 
 class TestMongoDBConnectionManager:
+
+    @pytest.mark.skipif(sys.platform == 'win32', reason='COM exists on Windows')
+    def test_com_helpers_are_noops_off_windows(self):
+        """Test the COM helpers resolve to no-ops off Windows"""
+        from app.models import user
+
+        assert user.pythoncom is None
+        assert user._initialize_com_for_thread() is None
+        assert user._uninitialize_com_for_thread() is None
     
     @patch('app.models.user.MongoClient')
     def test_singleton_pattern(self, mock_client):
@@ -162,6 +172,16 @@ class TestUserModel:
         assert result['username'] == 'testuser'
         assert 'password_hash' not in result
 
+    @patch('app.models.user.mongo_manager')
+    def test_init_does_not_touch_connection(self, mock_manager):
+        """Test that creating a model defers connection checks to queries"""
+        from app.models.user import User
+
+        User()
+
+        mock_manager.is_connected.assert_not_called()
+        mock_manager.reconnect.assert_not_called()
+
 class TestBlogPostModel:
     
     @patch('app.models.user.mongo_manager')
@@ -185,6 +205,26 @@ class TestBlogPostModel:
         assert result is not None
         assert result['title'] == 'Test Title'
         assert result['word_count'] == 5  # Fixed from 4 to 5
+
+    @patch('app.models.user.mongo_manager')
+    def test_create_post_with_word_count(self, mock_manager):
+        """Test a word count passed by the caller is stored as given"""
+        from app.models.user import BlogPost
+
+        mock_collection = MagicMock()
+        mock_manager.get_collection.return_value = mock_collection
+        mock_collection.insert_one.return_value.inserted_id = ObjectId('507f1f77bcf86cd799439012')
+
+        result = BlogPost().create_post(
+            '507f1f77bcf86cd799439011',
+            'https://youtube.com/watch?v=test',
+            'Test Title',
+            'Test content',
+            'test_video_id',
+            word_count=42,
+        )
+
+        assert result['word_count'] == 42
     
     @patch('app.models.user.mongo_manager')
     def test_get_user_posts(self, mock_manager):
@@ -23,6 +23,229 @@ class TestLogging:
         if os.environ.get('LOKI_URL') != 'http://YOUR_DROPLET_IP:3100':
             mock_loki_handler_class.assert_called()
     
+    @patch('app.monitoring.logging.LokiHandler')
+    def test_setup_logging_queues_file_writes(self, mock_loki_handler_class, app):
+        """Test file handlers run behind a single set of queue handlers"""
+        from app.monitoring.logging import (StructuredQueueHandler,
+                                            _queue_listeners, setup_logging)
+
+        mock_loki_handler_class.return_value = MagicMock(level=20)
+
+        setup_logging(app)
+        setup_logging(app)
+
+        root_queue_handlers = [
+            h for h in logging.getLogger().handlers
+            if isinstance(h, StructuredQueueHandler)
+        ]
+        assert len(root_queue_handlers) == 1
+        assert len(_queue_listeners) == 2
+
+    @patch('app.monitoring.logging.LokiHandler')
+    def test_setup_logging_queues_loki_handler(self, mock_loki_handler_class, app):
+        """Test the Loki handler runs on the root listener, not the root logger"""
+        from app.monitoring.logging import _queue_listeners, setup_logging
+
+        loki_handler = MagicMock(level=20)
+        mock_loki_handler_class.return_value = loki_handler
+
+        setup_logging(app)
+
+        assert loki_handler not in logging.getLogger().handlers
+        assert any(loki_handler in listener.handlers for listener in _queue_listeners)
+
+    @patch('app.monitoring.logging.LokiHandler')
+    def test_setup_logging_per_process_files(self, mock_loki_handler_class, app, tmp_path):
+        """Test each process logs to its own files when configured"""
+        from app.monitoring.logging import _queue_listeners, setup_logging
+
+        mock_loki_handler_class.return_value = MagicMock(level=20)
+
+        env = {'LOG_FILE_PER_PROCESS': 'true', 'SHARED_LOG_PATH': str(tmp_path)}
+        with patch.dict(os.environ, env):
+            setup_logging(app)
+
+        file_names = sorted(
+            os.path.basename(listener.handlers[0].target.baseFilename)
+            for listener in _queue_listeners
+        )
+        assert file_names == [f'access.{os.getpid()}.log', f'app.{os.getpid()}.json']
+
+    def test_structured_queue_handler_keeps_exception_separate(self):
+        """Test queued records keep the traceback out of the message"""
+        import json
+        import sys
+        from queue import Queue
+
+        from app.monitoring.logging import (LokiJsonFormatter,
+                                            StructuredQueueHandler)
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            exc_info = sys.exc_info()
+
+        record = logging.LogRecord(
+            name='test', level=logging.ERROR, pathname='test.py', lineno=10,
+            msg='Failed %s', args=('job',), exc_info=exc_info
+        )
+        queue = Queue()
+        StructuredQueueHandler(queue).emit(record)
+
+        parsed = json.loads(LokiJsonFormatter().format(queue.get_nowait()))
+
+        assert parsed['message'] == 'Failed job'
+        assert 'ValueError: boom' in parsed['exception']
+
+    def test_formatter_renders_traceback_once(self):
+        """Test the rendered traceback is cached on the record"""
+        import sys
+
+        from app.monitoring.logging import LokiJsonFormatter
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            exc_info = sys.exc_info()
+
+        record = logging.LogRecord(
+            name='test', level=logging.ERROR, pathname='test.py', lineno=10,
+            msg='Failed', args=(), exc_info=exc_info
+        )
+        formatter = LokiJsonFormatter()
+
+        with patch.object(formatter, 'formatException',
+                          wraps=formatter.formatException) as mock_format:
+            formatter.format(record)
+            formatter.format(record)
+
+        mock_format.assert_called_once()
+        assert 'ValueError: boom' in record.exc_text
+
+    def test_loki_json_formatter_serializes_record_once(self):
+        """Test a record formatted by several handlers is serialized once"""
+        import json
+
+        import orjson
+
+        from app.monitoring.logging import LokiJsonFormatter
+
+        record = logging.LogRecord(
+            name='test', level=logging.INFO, pathname='test.py', lineno=10,
+            msg='Test message', args=(), exc_info=None
+        )
+        record.user_id = 'user-456'
+        formatter = LokiJsonFormatter()
+
+        with patch('app.monitoring.logging.orjson.dumps', wraps=orjson.dumps) as mock_dumps:
+            first = formatter.format(record)
+            second = LokiJsonFormatter().format(record)
+
+        mock_dumps.assert_called_once()
+        assert first == second
+        parsed = json.loads(first)
+        assert parsed['user_id'] == 'user-456'
+        assert '_json_line' not in parsed
+
+    def test_batching_memory_handler_writes_in_batches(self, tmp_path):
+        """Test buffered records reach the file on capacity or on error"""
+        from app.monitoring.logging import (BatchingMemoryHandler,
+                                            BufferedRotatingFileHandler)
+
+        log_file = tmp_path / 'app.json'
+        file_handler = BufferedRotatingFileHandler(log_file, maxBytes=1024 * 1024)
+        handler = BatchingMemoryHandler(
+            3, flushLevel=logging.ERROR, target=file_handler)
+
+        def record(level, msg):
+            return logging.LogRecord(
+                name='test', level=level, pathname='test.py', lineno=10,
+                msg=msg, args=(), exc_info=None
+            )
+
+        handler.handle(record(logging.INFO, 'one'))
+        handler.handle(record(logging.INFO, 'two'))
+        assert log_file.read_text() == ''
+
+        handler.handle(record(logging.INFO, 'three'))
+        assert log_file.read_text().splitlines() == ['one', 'two', 'three']
+
+        handler.handle(record(logging.ERROR, 'four'))
+        assert log_file.read_text().splitlines()[-1] == 'four'
+
+        handler.close()
+        file_handler.close()
+
+    def test_queue_listener_flushes_batch_when_drained(self, tmp_path):
+        """Test buffered records are written once the listener queue is empty"""
+        from queue import Queue
+
+        from app.monitoring.logging import (BatchingMemoryHandler,
+                                            BufferedRotatingFileHandler,
+                                            DrainFlushingQueueListener)
+
+        log_file = tmp_path / 'app.json'
+        file_handler = BufferedRotatingFileHandler(log_file, maxBytes=1024 * 1024)
+        handler = BatchingMemoryHandler(
+            512, flushLevel=logging.ERROR, target=file_handler)
+        log_queue = Queue(-1)
+        listener = DrainFlushingQueueListener(log_queue, handler)
+
+        def record(msg):
+            return logging.LogRecord(
+                name='test', level=logging.INFO, pathname='test.py', lineno=10,
+                msg=msg, args=(), exc_info=None
+            )
+
+        log_queue.put(record('two'))
+        listener.handle(record('one'))
+        assert log_file.read_text() == ''
+
+        listener.handle(log_queue.get())
+        assert log_file.read_text().splitlines() == ['one', 'two']
+
+        handler.close()
+        file_handler.close()
+
+    def test_buffered_rotating_file_handler_rolls_over(self, tmp_path):
+        """Test rollover uses the tracked size without seeking the file"""
+        from app.monitoring.logging import BufferedRotatingFileHandler
+
+        log_file = tmp_path / 'app.json'
+        log_file.write_text('existing\n')
+        handler = BufferedRotatingFileHandler(log_file, maxBytes=40, backupCount=1)
+
+        with patch.object(handler.stream, 'seek') as mock_seek:
+            for i in range(4):
+                handler.handle(logging.LogRecord(
+                    name='test', level=logging.INFO, pathname='test.py',
+                    lineno=10, msg=f'message {i}', args=(), exc_info=None
+                ))
+            mock_seek.assert_not_called()
+        handler.close()
+
+        assert (tmp_path / 'app.json.1').read_text() == (
+            'existing\nmessage 0\nmessage 1\nmessage 2\n')
+        assert log_file.read_text() == 'message 3\n'
+
+    def test_buffered_rotating_file_handler_counts_encoded_bytes(self, tmp_path):
+        """Test the rollover size counts UTF-8 bytes, not characters"""
+        from app.monitoring.logging import BufferedRotatingFileHandler
+
+        log_file = tmp_path / 'app.json'
+        handler = BufferedRotatingFileHandler(
+            log_file, maxBytes=30, backupCount=1, encoding='utf-8')
+
+        for _ in range(2):
+            handler.handle(logging.LogRecord(
+                name='test', level=logging.INFO, pathname='test.py',
+                lineno=10, msg='\u00e9' * 10, args=(), exc_info=None
+            ))
+        handler.close()
+
+        assert (tmp_path / 'app.json.1').stat().st_size == 21
+        assert log_file.stat().st_size == 21
+
     def test_loki_json_formatter(self):
         """Test Loki JSON formatter"""
         from app.monitoring.logging import LokiJsonFormatter
@@ -47,6 +270,155 @@ class TestLogging:
         assert parsed['level'] == 'INFO'
         assert parsed['logger'] == 'test'
 
+    def test_loki_json_formatter_timestamp(self):
+        """Test the timestamp is taken from the record as UTC"""
+        from app.monitoring.logging import LokiJsonFormatter
+
+        record = logging.LogRecord(
+            name='test', level=logging.INFO, pathname='test.py', lineno=10,
+            msg='Test message', args=(), exc_info=None
+        )
+        record.created = 1700000000.25
+        record.msecs = 250.0
+
+        import json
+        parsed = json.loads(LokiJsonFormatter().format(record))
+
+        assert parsed['timestamp'] == '2023-11-14T22:13:20.250Z'
+
+    def test_loki_json_formatter_timestamp_reuses_second(self):
+        """Test records in the same second reuse the formatted second"""
+        import json
+        import time
+
+        from app.monitoring.logging import LokiJsonFormatter
+
+        formatter = LokiJsonFormatter()
+
+        def timestamp_for(created):
+            record = logging.LogRecord(
+                name='test', level=logging.INFO, pathname='test.py', lineno=10,
+                msg='Test message', args=(), exc_info=None
+            )
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+            return json.loads(formatter.format(record))['timestamp']
+
+        with patch('app.monitoring.logging.time.strftime', wraps=time.strftime) as mock_strftime:
+            assert timestamp_for(1700000000.125) == '2023-11-14T22:13:20.125Z'
+            assert timestamp_for(1700000000.5) == '2023-11-14T22:13:20.500Z'
+            assert timestamp_for(1700000001.0) == '2023-11-14T22:13:21.000Z'
+
+        assert mock_strftime.call_count == 2
+
+    def test_loki_json_formatter_non_ascii_and_extras(self):
+        """Test formatter output keeps non-ASCII text and stringifies extras"""
+        import json
+
+        from app.monitoring.logging import LokiJsonFormatter
+
+        record = logging.LogRecord(
+            name='test', level=logging.INFO, pathname='test.py', lineno=10,
+            msg='Café %s', args=('ready',), exc_info=None
+        )
+        record.duration_ms = 12.5
+
+        parsed = json.loads(LokiJsonFormatter().format(record))
+
+        assert parsed['message'] == 'Café ready'
+        assert parsed['duration_ms'] == '12.5'
+
+    @patch('app.monitoring.logging.threading.Thread')
+    def test_loki_handler_drops_when_queue_full(self, mock_thread):
+        """Test Loki handler drops entries instead of blocking"""
+        from app.monitoring.logging import LokiHandler
+        from app.monitoring.metrics import log_entries_dropped_total
+
+        handler = LokiHandler('http://test-loki:3100', queue_size=1)
+        record = logging.LogRecord(
+            name='test', level=logging.INFO, pathname='test.py', lineno=10,
+            msg='Test message', args=(), exc_info=None
+        )
+
+        dropped_before = log_entries_dropped_total._value.get()
+        handler.emit(record)
+        handler.emit(record)
+
+        assert handler.log_queue.qsize() == 1
+        assert log_entries_dropped_total._value.get() == dropped_before + 1
+
+    @patch('app.monitoring.logging.threading.Thread')
+    def test_loki_handler_keeps_request_ids_out_of_labels(self, mock_thread):
+        """Test per-request values are logged but not used as stream labels"""
+        from app.monitoring.logging import LokiHandler, LokiJsonFormatter
+
+        handler = LokiHandler('http://test-loki:3100')
+        handler.setFormatter(LokiJsonFormatter())
+        record = logging.LogRecord(
+            name='test', level=logging.INFO, pathname='test.py', lineno=10,
+            msg='Test message', args=(), exc_info=None
+        )
+        record.request_id = 'req-123'
+        record.user_id = 'user-456'
+        record.endpoint = 'blog.index'
+
+        handler.emit(record)
+
+        stream = handler.log_queue.get_nowait()['streams'][0]
+        assert 'request_id' not in stream['stream']
+        assert 'user_id' not in stream['stream']
+        assert stream['stream']['endpoint'] == 'blog.index'
+        assert 'req-123' in stream['values'][0][1]
+
+    @patch('app.monitoring.logging.threading.Thread')
+    def test_loki_handler_labels(self, mock_thread):
+        """Test stream labels combine the handler tags with the record"""
+        from app.monitoring.logging import LokiHandler
+
+        handler = LokiHandler('http://test-loki:3100', tags={'env': 'test'})
+        record = logging.LogRecord(
+            name='test', level=logging.ERROR, pathname='test.py', lineno=10,
+            msg='Test message', args=(), exc_info=None, func='handler'
+        )
+        record.error_type = 'ValueError'
+
+        handler.emit(record)
+
+        labels = handler.log_queue.get_nowait()['streams'][0]['stream']
+        assert labels == {
+            'env': 'test',
+            'application': 'flask-blog-app',
+            'level': 'error',
+            'logger': 'test',
+            'filename': 'test.py',
+            'function': 'handler',
+            'error_type': 'ValueError',
+        }
+
+    @patch('app.monitoring.logging.requests.post')
+    @patch('app.monitoring.logging.threading.Thread')
+    def test_loki_handler_send_batch_merges_streams(self, mock_thread, mock_post):
+        """Test entries with the same labels are pushed as one gzipped stream"""
+        import gzip
+        import json
+
+        from app.monitoring.logging import LokiHandler
+
+        mock_post.return_value = MagicMock(status_code=204)
+        handler = LokiHandler('http://loki:3100')
+
+        handler._send_batch([
+            {'streams': [{'stream': {'level': 'info', 'app': 'a'}, 'values': [['1', 'one']]}]},
+            {'streams': [{'stream': {'app': 'a', 'level': 'info'}, 'values': [['2', 'two']]}]},
+        ])
+
+        payload = json.loads(gzip.decompress(mock_post.call_args.kwargs['data']))
+        assert payload == {'streams': [{
+            'stream': {'level': 'info', 'app': 'a'},
+            'values': [['1', 'one'], ['2', 'two']],
+        }]}
+
+
 class TestMetrics:
     
     @patch('logging.getLogger')
@@ -62,6 +434,70 @@ class TestMetrics:
         assert b'flask_http_requests_total' in response.data
         assert b'blog_generation_requests_total' in response.data
     
+    def test_metrics_registry_multiprocess(self, tmp_path):
+        """Test worker metrics are aggregated when multiprocess mode is set"""
+        from prometheus_client import multiprocess
+
+        from app.monitoring.metrics import REGISTRY, get_metrics_registry
+
+        assert get_metrics_registry() is REGISTRY
+
+        with patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': str(tmp_path)}):
+            with patch.object(multiprocess, 'MultiProcessCollector') as mock_collector:
+                registry = get_metrics_registry()
+
+        assert registry is not REGISTRY
+        mock_collector.assert_called_once_with(registry)
+
+    def test_log_metrics_filter_defaults_outside_request(self):
+        """Test records logged outside a request get default context"""
+        from app.monitoring.metrics import ContextAwareLogMetricsFilter
+
+        record = logging.LogRecord(
+            name='test', level=logging.INFO, pathname='test.py',
+            lineno=1, msg='hello', args=(), exc_info=None
+        )
+
+        assert ContextAwareLogMetricsFilter().filter(record) is True
+        assert record.request_id == 'no-request'
+        assert record.user_id == 'anonymous'
+        assert record.endpoint == 'unknown'
+
+    def test_log_metrics_filter_request_context(self, app):
+        """Test records logged inside a request pick up its context"""
+        from flask import g
+
+        from app.monitoring.metrics import ContextAwareLogMetricsFilter
+
+        record = logging.LogRecord(
+            name='test', level=logging.INFO, pathname='test.py',
+            lineno=1, msg='hello', args=(), exc_info=None
+        )
+        record.user_id = 'user-1'
+
+        with app.test_request_context('/'):
+            g.request_id = 'req-1'
+            ContextAwareLogMetricsFilter().filter(record)
+
+        assert record.request_id == 'req-1'
+        assert record.user_id == 'user-1'
+        assert record.endpoint == 'blog.index'
+
+    def test_log_metrics_filter_on_queue_handlers(self, app):
+        """Test the queued root handler carries the metrics filter once"""
+        from app import create_app
+        from app.monitoring.logging import StructuredQueueHandler
+        from app.monitoring.metrics import ContextAwareLogMetricsFilter
+
+        create_app({'TESTING': True})
+
+        for handler in logging.getLogger().handlers:
+            filters = [f for f in handler.filters
+                       if isinstance(f, ContextAwareLogMetricsFilter)]
+            assert len(filters) == 1
+        assert any(isinstance(handler, StructuredQueueHandler)
+                   for handler in logging.getLogger().handlers)
+
     @patch('app.monitoring.metrics.psutil')
     def test_collect_system_metrics(self, mock_psutil):
         """Test system metrics collection"""
@@ -90,3 +526,86 @@ class TestTracing:
 
             # Verify logging calls were made
             assert mock_logger.info.called
+
+    @patch.dict(os.environ, {'REQUEST_TRACING_ENABLED': 'false'})
+    def test_request_tracing_disabled(self):
+        """Test tracing hooks are not installed when disabled"""
+        from flask import Flask
+
+        from app.monitoring.tracing import setup_tracing
+
+        app = Flask(__name__)
+        setup_tracing(app)
+
+        assert not app.before_request_funcs
+        assert not app.after_request_funcs
+
+    def test_request_tracing_skips_healthy_probes(self, client):
+        """Test health probes are only traced when they fail"""
+        with patch('app.monitoring.tracing.logger') as mock_logger, \
+                patch('app.routes.health.mongo_manager') as mock_mongo:
+            mock_mongo.is_connected.return_value = True
+            client.get('/health')
+            assert not mock_logger.info.called
+
+            mock_mongo.is_connected.return_value = False
+            response = client.get('/health')
+            assert response.status_code == 503
+            mock_logger.info.assert_called_once()
+            assert mock_logger.info.call_args.args[0] == 'Request completed'
+
+    def test_request_tracing_skipped_when_info_disabled(self, client):
+        """Test no request records are built when INFO is filtered out"""
+        with patch('app.monitoring.tracing.logger') as mock_logger:
+            mock_logger.isEnabledFor.return_value = False
+            client.get('/')
+
+        assert not mock_logger.info.called
+
+    def test_request_tracing_logs_once_per_request(self, client):
+        """Test an ordinary request produces a single completion record"""
+        with patch('app.monitoring.tracing.logger') as mock_logger:
+            client.get('/', headers={'User-Agent': 'probe'})
+
+        mock_logger.info.assert_called_once()
+        assert mock_logger.info.call_args.args[0] == 'Request completed'
+        assert mock_logger.info.call_args.kwargs['extra']['user_agent'] == 'probe'
+
+    def test_safe_response_size_does_not_read_body(self):
+        """Test the logged response size comes from the header only"""
+        from flask import Response
+
+        from app.monitoring.tracing import get_safe_response_size
+
+        assert get_safe_response_size(Response(b'12345')) == 5
+
+        streamed = Response(iter([b'chunk']))
+        with patch.object(streamed, 'get_data') as mock_get_data:
+            assert get_safe_response_size(streamed) == -1
+        mock_get_data.assert_not_called()
+
+    def test_request_ids_are_unique_per_process(self, client):
+        """Test each request gets a distinct pid-counter request ID"""
+        from flask import g
+
+        request_ids = []
+        for _ in range(2):
+            with client:
+                client.get('/')
+                request_ids.append(g.request_id)
+
+        assert request_ids[0] != request_ids[1]
+        assert all(rid.startswith(f"{os.getpid():x}-") for rid in request_ids)
+
+    def test_request_ids_reset_in_forked_child(self):
+        """Test a forked worker restarts the counter under its own pid"""
+        from app.monitoring import tracing
+
+        try:
+            with patch('app.monitoring.tracing.os.getpid', return_value=0xabc):
+                tracing._reset_request_ids()
+
+            assert tracing._PID == 0xabc
+            assert next(tracing._REQUEST_COUNTER) == 0
+        finally:
+            tracing._reset_request_ids()
@@ -490,6 +490,7 @@ class TestAuthRoutes:
         assert response.status_code == 200
         data = json.loads(response.data)
         assert data['success'] is True
+        assert 'Set-Cookie' not in response.headers
 
     # SET SESSION TOKEN TESTS
 
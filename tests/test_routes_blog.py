@@ -1,10 +1,21 @@
 import io
 import json
+import os
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 
+def _dict_redis():
+    """Redis client stand-in backed by a dict (setex/get only)"""
+    store = {}
+    redis_client = MagicMock()
+    redis_client.setex.side_effect = lambda key, ttl, value: store.__setitem__(key, value)
+    redis_client.get.side_effect = store.get
+    return redis_client
+
+
 class TestBlogRoutes:
     
     def test_index(self, client):
@@ -13,7 +24,7 @@ class TestBlogRoutes:
         assert response.status_code == 200
         assert b'BlogGen Pro' in response.data
     
-    @patch('app.routes.blog.AuthService.get_current_user')
+    @patch('app.routes.blog.AuthService.get_token_user')
     def test_generate_page_authenticated(self, mock_get_user, client):
         """Test generate page with authenticated user"""
         mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
@@ -22,7 +33,7 @@ class TestBlogRoutes:
         assert response.status_code == 200
         assert b'Generate' in response.data
     
-    @patch('app.routes.blog.AuthService.get_current_user')
+    @patch('app.routes.blog.AuthService.get_token_user')
     def test_generate_page_unauthenticated(self, mock_get_user, client):
         """Test generate page without authentication"""
         mock_get_user.return_value = None
@@ -55,6 +66,45 @@ class TestBlogRoutes:
         assert data['success'] is True
         assert 'blog_content' in data
     
+    @patch('app.routes.blog.AuthService.get_current_user')
+    @patch('app.routes.blog.generate_blog_from_youtube')
+    @patch('app.routes.blog.BlogPost')
+    def test_generate_blog_reuses_cached_content(self, mock_blog_post_class, mock_generate, mock_get_user, client):
+        """Test repeat generation for the same video skips the generator"""
+        mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
+        mock_generate.return_value = '# Test Blog\n\n' + 'A' * 100
+        mock_blog_post_class.return_value.create_post.return_value = {'_id': '456'}
+
+        for url in ('https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+                    'https://youtu.be/dQw4w9WgXcQ?t=30'):
+            response = client.post('/generate', json={'youtube_url': url, 'language': 'en'})
+            assert response.status_code == 200
+            assert json.loads(response.data)['success'] is True
+            assert json.loads(response.data)['word_count'] == 4
+
+        mock_generate.assert_called_once_with(
+            'https://www.youtube.com/watch?v=dQw4w9WgXcQ', 'en', video_id='dQw4w9WgXcQ')
+
+    @patch('app.routes.blog.AuthService.get_current_user')
+    @patch('app.routes.blog.generate_blog_from_youtube')
+    @patch('app.routes.blog.BlogPost')
+    def test_generate_blog_reuses_legacy_cached_content(self, mock_blog_post_class, mock_generate, mock_get_user, client, app):
+        """Test a cache entry holding only the content is still reused"""
+        mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
+        mock_blog_post_class.return_value.create_post.return_value = {'_id': '456'}
+        app.temp_storage['generated_blog_dQw4w9WgXcQ_en'] = {
+            'data': '# Cached Blog\n\n' + 'A' * 100,
+            'timestamp': time.time(),
+        }
+
+        response = client.post('/generate', json={
+            'youtube_url': 'https://youtu.be/dQw4w9WgXcQ', 'language': 'en'})
+
+        data = json.loads(response.data)
+        assert data['success'] is True
+        assert data['title'] == 'Cached Blog'
+        mock_generate.assert_not_called()
+
     @patch('app.routes.blog.AuthService.get_current_user')
     def test_generate_blog_unauthenticated(self, mock_get_user, client):
         """Test blog generation without authentication"""
@@ -83,26 +133,80 @@ class TestBlogRoutes:
         assert b'Dashboard' in response.data or b'testuser' in response.data
     
     @patch('app.routes.blog.AuthService.get_current_user')
-    @patch('app.routes.blog.retrieve_large_data')
-    @patch('app.routes.blog.PDFGeneratorTool')
-    def test_download_pdf(self, mock_pdf_tool_class, mock_retrieve, mock_get_user, client):
+    @patch('app.routes.blog.BlogPost')
+    @patch('app.routes.blog.pdf_generator')
+    def test_download_pdf(self, mock_pdf_tool, mock_blog_post_class, mock_get_user, client):
         """Test PDF download"""
         mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
-        mock_retrieve.return_value = {
-            'blog_content': '# Test Blog\nContent',
+        mock_blog_post_class.return_value.get_post_by_id.return_value = {
+            'content': '# Test Blog\nContent',
             'title': 'Test Blog'
         }
         
-        mock_pdf_tool = mock_pdf_tool_class.return_value
-        mock_pdf_tool.generate_pdf_bytes.return_value = b'PDF content'
+        mock_pdf_tool.write_pdf.side_effect = lambda content, fileobj: fileobj.write(b'PDF content')
         
         with client.session_transaction() as session:
-            session['blog_storage_key'] = 'test_key'
+            session['current_blog_id'] = '456'
         
         response = client.get('/download')
         assert response.status_code == 200
         assert response.content_type == 'application/pdf'
+        assert response.data == b'PDF content'
     
+    @patch('app.routes.blog.AuthService.get_current_user')
+    @patch('app.routes.blog.BlogPost')
+    @patch('app.routes.blog.pdf_generator')
+    def test_download_pdf_range_and_cleanup(self, mock_pdf_tool, mock_blog_post_class, mock_get_user, app, client):
+        """Test uncached PDF downloads support ranges and remove their temp file"""
+        app.config['PDF_CACHE_MAX_FILES'] = 0
+        mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
+        mock_blog_post_class.return_value.get_post_by_id.return_value = {'content': '# Test Blog', 'title': 'Test Blog'}
+        mock_pdf_tool.write_pdf.side_effect = lambda content, fileobj: fileobj.write(b'PDF content')
+
+        with client.session_transaction() as session:
+            session['current_blog_id'] = '456'
+
+        with patch('app.routes.blog.os.unlink', wraps=os.unlink) as mock_unlink:
+            response = client.get('/download', headers={'Range': 'bytes=0-2'})
+
+        assert response.status_code == 206
+        assert response.data == b'PDF'
+        mock_unlink.assert_called_once()
+        assert not os.path.exists(mock_unlink.call_args.args[0])
+
+        # A repeat request with the ETag is answered without a new PDF
+        response = client.get('/download', headers={'If-None-Match': response.headers['ETag']})
+
+        assert response.status_code == 304
+        mock_pdf_tool.write_pdf.assert_called_once()
+
+    @patch('app.routes.blog.AuthService.get_current_user')
+    @patch('app.routes.blog.BlogPost')
+    @patch('app.routes.blog.pdf_generator')
+    def test_download_pdf_reuses_cached_file(self, mock_pdf_tool, mock_blog_post_class, mock_get_user, app, client):
+        """Test a PDF is rendered once per content and the cache is bounded"""
+        app.config['PDF_CACHE_MAX_FILES'] = 1
+        mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
+        mock_blog_post_class.return_value.get_post_by_id.return_value = {'content': '# Test Blog', 'title': 'Test Blog'}
+        mock_pdf_tool.write_pdf.side_effect = lambda content, fileobj: fileobj.write(content.encode())
+
+        with client.session_transaction() as session:
+            session['current_blog_id'] = '456'
+
+        first = client.get('/download')
+        second = client.get('/download')
+
+        assert first.data == second.data == b'# Test Blog'
+        mock_pdf_tool.write_pdf.assert_called_once()
+
+        # Other content gets its own PDF, evicting the older one
+        mock_blog_post_class.return_value.get_post_by_id.return_value = {'content': '# Other', 'title': 'Other'}
+        third = client.get('/download')
+
+        assert third.data == b'# Other'
+        assert mock_pdf_tool.write_pdf.call_count == 2
+        assert os.listdir(app.config['PDF_CACHE_DIR']) == [f"{third.headers['ETag'][3:-1]}.pdf"]
+
     @patch('app.routes.blog.AuthService.get_current_user')
     @patch('app.routes.blog.BlogPost')
     def test_delete_post(self, mock_blog_post_class, mock_get_user, client):
@@ -120,6 +224,31 @@ class TestBlogRoutes:
 
     # Additional comprehensive tests for better coverage
 
+    def test_index_anonymous_rendered_once(self, app, client):
+        """Test the anonymous landing page is rendered once and reused"""
+        from flask import render_template
+
+        with patch('app.routes.blog.render_template', wraps=render_template) as mock_render:
+            first = client.get('/')
+            second = client.get('/')
+
+        assert first.status_code == second.status_code == 200
+        assert first.data == second.data
+        mock_render.assert_called_once_with('index.html')
+
+    @patch('app.utils.security.get_token_user')
+    @patch('app.routes.blog.AuthService.get_token_user')
+    def test_index_authenticated_not_cached(self, mock_get_user, mock_template_user, app, client):
+        """Test logged-in visitors get a fresh render with their links"""
+        mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
+        mock_template_user.return_value = mock_get_user.return_value
+
+        response = client.get('/')
+
+        assert response.status_code == 200
+        assert b'/dashboard' in response.data
+        assert app.anonymous_index_html is None
+
     def test_index_exception(self, client):
         """Test index page with exception during rendering"""
         with patch('app.routes.blog.render_template', side_effect=Exception("Template error")):
@@ -127,7 +256,7 @@ class TestBlogRoutes:
             assert response.status_code == 500
             assert b'Error loading page' in response.data
 
-    @patch('app.routes.blog.AuthService.get_current_user')
+    @patch('app.routes.blog.AuthService.get_token_user')
     def test_generate_page_exception(self, mock_get_user, client):
         """Test generate page with exception"""
         mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
@@ -176,13 +305,24 @@ class TestBlogRoutes:
         assert 'valid YouTube URL' in data['message']
 
     @patch('app.routes.blog.AuthService.get_current_user')
-    @patch('app.routes.blog.validate_youtube_url')
-    @patch('app.routes.blog.extract_video_id')
-    def test_generate_blog_invalid_video_id(self, mock_extract_id, mock_validate, mock_get_user, client):
+    @patch('app.routes.blog.generate_blog_from_youtube')
+    def test_generate_blog_oversized_body(self, mock_generate, mock_get_user, client):
+        """Test oversized request bodies are refused before generation"""
+        mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
+
+        response = client.post('/generate', json={
+            'youtube_url': 'https://youtu.be/dQw4w9WgXcQ?' + 'a' * 20000
+        })
+
+        assert response.status_code == 413
+        mock_generate.assert_not_called()
+
+    @patch('app.routes.blog.AuthService.get_current_user')
+    @patch('app.routes.blog.parse_youtube_url')
+    def test_generate_blog_invalid_video_id(self, mock_parse_url, mock_get_user, client):
         """Test blog generation with invalid video ID"""
         mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
-        mock_validate.return_value = True
-        mock_extract_id.return_value = None
+        mock_parse_url.return_value = None
 
         response = client.post('/generate', json={
             'youtube_url': 'https://youtube.com/watch?v=invalid'
@@ -191,17 +331,15 @@ class TestBlogRoutes:
         assert response.status_code == 400
         data = json.loads(response.data)
         assert data['success'] is False
-        assert 'Invalid YouTube URL' in data['message']
+        assert 'valid YouTube URL' in data['message']
 
     @patch('app.routes.blog.AuthService.get_current_user')
-    @patch('app.routes.blog.validate_youtube_url')
-    @patch('app.routes.blog.extract_video_id')
+    @patch('app.routes.blog.parse_youtube_url')
     @patch('app.routes.blog.generate_blog_from_youtube')
-    def test_generate_blog_generation_exception(self, mock_generate, mock_extract_id, mock_validate, mock_get_user, client):
+    def test_generate_blog_generation_exception(self, mock_generate, mock_parse_url, mock_get_user, client):
         """Test blog generation with exception during generation"""
         mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
-        mock_validate.return_value = True
-        mock_extract_id.return_value = 'dQw4w9WgXcQ'
+        mock_parse_url.return_value = 'dQw4w9WgXcQ'
         mock_generate.side_effect = Exception("Generation failed")
 
         response = client.post('/generate', json={
@@ -214,14 +352,12 @@ class TestBlogRoutes:
         assert 'Failed to generate blog' in data['message']
 
     @patch('app.routes.blog.AuthService.get_current_user')
-    @patch('app.routes.blog.validate_youtube_url')
-    @patch('app.routes.blog.extract_video_id')
+    @patch('app.routes.blog.parse_youtube_url')
     @patch('app.routes.blog.generate_blog_from_youtube')
-    def test_generate_blog_short_content(self, mock_generate, mock_extract_id, mock_validate, mock_get_user, client):
+    def test_generate_blog_short_content(self, mock_generate, mock_parse_url, mock_get_user, client):
         """Test blog generation with too short content"""
         mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
-        mock_validate.return_value = True
-        mock_extract_id.return_value = 'dQw4w9WgXcQ'
+        mock_parse_url.return_value = 'dQw4w9WgXcQ'
         mock_generate.return_value = 'Short content'  # Less than 100 chars
 
         response = client.post('/generate', json={
@@ -234,14 +370,12 @@ class TestBlogRoutes:
         assert 'Failed to generate blog content' in data['message']
 
     @patch('app.routes.blog.AuthService.get_current_user')
-    @patch('app.routes.blog.validate_youtube_url')
-    @patch('app.routes.blog.extract_video_id')
+    @patch('app.routes.blog.parse_youtube_url')
     @patch('app.routes.blog.generate_blog_from_youtube')
-    def test_generate_blog_error_response(self, mock_generate, mock_extract_id, mock_validate, mock_get_user, client):
+    def test_generate_blog_error_response(self, mock_generate, mock_parse_url, mock_get_user, client):
         """Test blog generation with error response from generator"""
         mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
-        mock_validate.return_value = True
-        mock_extract_id.return_value = 'dQw4w9WgXcQ'
+        mock_parse_url.return_value = 'dQw4w9WgXcQ'
         mock_generate.return_value = 'ERROR: API key not found'
 
         response = client.post('/generate', json={
@@ -255,15 +389,13 @@ class TestBlogRoutes:
         assert 'API key not found' in data['message'] or 'Failed to generate blog content' in data['message']
 
     @patch('app.routes.blog.AuthService.get_current_user')
-    @patch('app.routes.blog.validate_youtube_url')
-    @patch('app.routes.blog.extract_video_id')
+    @patch('app.routes.blog.parse_youtube_url')
     @patch('app.routes.blog.generate_blog_from_youtube')
     @patch('app.routes.blog.BlogPost')
-    def test_generate_blog_db_save_failure(self, mock_blog_post_class, mock_generate, mock_extract_id, mock_validate, mock_get_user, client):
+    def test_generate_blog_db_save_failure(self, mock_blog_post_class, mock_generate, mock_parse_url, mock_get_user, client):
         """Test blog generation with database save failure"""
         mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
-        mock_validate.return_value = True
-        mock_extract_id.return_value = 'dQw4w9WgXcQ'
+        mock_parse_url.return_value = 'dQw4w9WgXcQ'
         mock_generate.return_value = '# Test Blog\n\n' + 'A' * 100  # Long enough content
 
         mock_blog_post = mock_blog_post_class.return_value
@@ -280,15 +412,13 @@ class TestBlogRoutes:
         assert 'Error generating blog' in data['message']
 
     @patch('app.routes.blog.AuthService.get_current_user')
-    @patch('app.routes.blog.validate_youtube_url')
-    @patch('app.routes.blog.extract_video_id')
+    @patch('app.routes.blog.parse_youtube_url')
     @patch('app.routes.blog.generate_blog_from_youtube')
     @patch('app.routes.blog.BlogPost')
-    def test_generate_blog_db_exception(self, mock_blog_post_class, mock_generate, mock_extract_id, mock_validate, mock_get_user, client):
+    def test_generate_blog_db_exception(self, mock_blog_post_class, mock_generate, mock_parse_url, mock_get_user, client):
         """Test blog generation with database exception"""
         mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
-        mock_validate.return_value = True
-        mock_extract_id.return_value = 'dQw4w9WgXcQ'
+        mock_parse_url.return_value = 'dQw4w9WgXcQ'
         mock_generate.return_value = '# Test Blog\n\n' + 'A' * 100
 
         mock_blog_post = mock_blog_post_class.return_value
@@ -303,18 +433,99 @@ class TestBlogRoutes:
         assert data['success'] is False
         assert 'Error generating blog' in data['message']
 
+    @patch('app.routes.blog.AuthService.get_current_user')
+    @patch('app.routes.blog.generate_blog_from_youtube')
+    @patch('app.routes.blog.BlogPost')
+    def test_generate_blog_async_job(self, mock_blog_post_class, mock_generate, mock_get_user, app, client):
+        """Test Prefer: respond-async returns a job that can be polled"""
+        import time
+
+        app.redis_client = _dict_redis()
+        mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
+        mock_generate.return_value = '# Async Blog\n\n' + 'A' * 100
+        mock_blog_post_class.return_value.create_post.return_value = {'_id': '456'}
+
+        response = client.post(
+            '/generate',
+            json={'youtube_url': 'https://youtube.com/watch?v=dQw4w9WgXcQ'},
+            headers={'Prefer': 'respond-async'},
+        )
+
+        assert response.status_code == 202
+        data = json.loads(response.data)
+        assert data['status'] == 'running'
+
+        deadline = time.time() + 5
+        while True:
+            status = client.get(data['status_url'])
+            if status.status_code != 202 or time.time() > deadline:
+                break
+            time.sleep(0.05)
+
+        assert status.status_code == 200
+        result = json.loads(status.data)
+        assert result['success'] is True
+        assert result['title'] == 'Async Blog'
+        with client.session_transaction() as session:
+            assert session['current_blog_id'] == '456'
+
+    @patch('app.routes.blog.AuthService.get_current_user')
+    def test_generation_status_unknown_job(self, mock_get_user, client):
+        """Test polling a job that doesn't exist for this user"""
+        mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
+
+        response = client.get('/generate/status/not-a-job')
+
+        assert response.status_code == 404
+
+    @patch('app.routes.blog.AuthService.get_current_user')
+    def test_generate_blog_async_rejected_when_busy(self, mock_get_user, app, client):
+        """Test async generations are turned away when all slots are taken"""
+        app.redis_client = _dict_redis()
+        mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
+
+        with patch('app.routes.blog._generation_slots') as mock_slots:
+            mock_slots.acquire.return_value = False
+            response = client.post(
+                '/generate',
+                json={'youtube_url': 'https://youtube.com/watch?v=dQw4w9WgXcQ'},
+                headers={'Prefer': 'respond-async'},
+            )
+
+        assert response.status_code == 503
+
+    @patch('app.routes.blog.AuthService.get_current_user')
+    @patch('app.routes.blog.generate_blog_from_youtube')
+    @patch('app.routes.blog.BlogPost')
+    def test_generate_blog_async_without_redis(self, mock_blog_post_class, mock_generate, mock_get_user, client):
+        """Test Prefer: respond-async is ignored when there is no Redis"""
+        mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
+        mock_generate.return_value = '# Sync Blog\n\n' + 'A' * 100
+        mock_blog_post_class.return_value.create_post.return_value = {'_id': '456'}
+
+        with patch('app.routes.blog._generation_executor') as mock_executor:
+            response = client.post(
+                '/generate',
+                json={'youtube_url': 'https://youtube.com/watch?v=dQw4w9WgXcQ'},
+                headers={'Prefer': 'respond-async'},
+            )
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['success'] is True
+        assert data['title'] == 'Sync Blog'
+        mock_executor.submit.assert_not_called()
+
     @patch('app.routes.blog.AuthService.get_current_user')
     def test_generate_blog_form_data(self, mock_get_user, client):
         """Test blog generation with form data instead of JSON"""
         mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
 
-        with patch('app.routes.blog.validate_youtube_url') as mock_validate, \
-             patch('app.routes.blog.extract_video_id') as mock_extract_id, \
+        with patch('app.routes.blog.parse_youtube_url') as mock_parse_url, \
              patch('app.routes.blog.generate_blog_from_youtube') as mock_generate, \
              patch('app.routes.blog.BlogPost') as mock_blog_post_class:
 
-            mock_validate.return_value = True
-            mock_extract_id.return_value = 'dQw4w9WgXcQ'
+            mock_parse_url.return_value = 'dQw4w9WgXcQ'
             mock_generate.return_value = '# Test Blog\n\n' + 'A' * 100
 
             mock_blog_post = mock_blog_post_class.return_value
@@ -338,13 +549,11 @@ class TestBlogRoutes:
         """Test blog generation when no title can be extracted"""
         mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
 
-        with patch('app.routes.blog.validate_youtube_url') as mock_validate, \
-             patch('app.routes.blog.extract_video_id') as mock_extract_id, \
+        with patch('app.routes.blog.parse_youtube_url') as mock_parse_url, \
              patch('app.routes.blog.generate_blog_from_youtube') as mock_generate, \
              patch('app.routes.blog.BlogPost') as mock_blog_post_class:
 
-            mock_validate.return_value = True
-            mock_extract_id.return_value = 'dQw4w9WgXcQ'
+            mock_parse_url.return_value = 'dQw4w9WgXcQ'
             mock_generate.return_value = 'Content without title heading\n\n' + 'A' * 100
 
             mock_blog_post = mock_blog_post_class.return_value
@@ -400,14 +609,14 @@ class TestBlogRoutes:
         assert response.status_code == 302  # Redirect to login
 
     @patch('app.routes.blog.AuthService.get_current_user')
-    @patch('app.routes.blog.retrieve_large_data')
-    def test_download_pdf_no_data(self, mock_retrieve, mock_get_user, client):
+    @patch('app.routes.blog.BlogPost')
+    def test_download_pdf_no_data(self, mock_blog_post_class, mock_get_user, client):
         """Test PDF download when no blog data found"""
         mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
-        mock_retrieve.return_value = None
+        mock_blog_post_class.return_value.get_post_by_id.return_value = None
 
         with client.session_transaction() as session:
-            session['blog_storage_key'] = 'test_key'
+            session['current_blog_id'] = '456'
 
         response = client.get('/download')
         assert response.status_code == 404
@@ -427,24 +636,25 @@ class TestBlogRoutes:
         assert 'No blog data found' in data['message']
 
     @patch('app.routes.blog.AuthService.get_current_user')
-    @patch('app.routes.blog.retrieve_large_data')
-    @patch('app.routes.blog.PDFGeneratorTool')
-    def test_download_pdf_generation_exception(self, mock_pdf_tool_class, mock_retrieve, mock_get_user, client):
+    @patch('app.routes.blog.BlogPost')
+    @patch('app.routes.blog.pdf_generator')
+    def test_download_pdf_generation_exception(self, mock_pdf_tool, mock_blog_post_class, mock_get_user, client):
         """Test PDF download with generation exception"""
         mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
-        mock_retrieve.return_value = {
-            'blog_content': '# Test Blog\nContent',
+        mock_blog_post_class.return_value.get_post_by_id.return_value = {
+            'content': '# Test Blog\nContent',
             'title': 'Test Blog'
         }
 
-        mock_pdf_tool = mock_pdf_tool_class.return_value
-        mock_pdf_tool.generate_pdf_bytes.side_effect = Exception("PDF generation failed")
+        mock_pdf_tool.write_pdf.side_effect = Exception("PDF generation failed")
 
         with client.session_transaction() as session:
-            session['blog_storage_key'] = 'test_key'
+            session['current_blog_id'] = '456'
 
-        response = client.get('/download')
+        with patch('app.routes.blog.os.unlink', wraps=os.unlink) as mock_unlink:
+            response = client.get('/download')
         assert response.status_code == 500
+        assert not os.path.exists(mock_unlink.call_args.args[0])
         data = json.loads(response.data)
         assert data['success'] is False
         assert 'PDF generation failed' in data['message']
@@ -522,6 +732,26 @@ class TestBlogRoutes:
         assert data['success'] is True
         assert data['post']['title'] == 'Test Post'
 
+    @patch('app.routes.blog.AuthService.get_current_user')
+    @patch('app.routes.blog.BlogPost')
+    def test_get_post_not_modified(self, mock_blog_post_class, mock_get_user, client):
+        """Test re-fetching an unchanged post returns 304 without a body"""
+        mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
+        mock_blog_post_class.return_value.get_post_by_id.return_value = {
+            '_id': '456',
+            'title': 'Test Post',
+            'content': 'Test content',
+        }
+
+        first = client.get('/get-post/456')
+        etag = first.headers['ETag']
+        second = client.get('/get-post/456', headers={'If-None-Match': etag})
+
+        assert first.status_code == 200
+        assert 'private' in first.headers['Cache-Control']
+        assert second.status_code == 304
+        assert second.data == b''
+
     @patch('app.routes.blog.AuthService.get_current_user')
     @patch('app.routes.blog.BlogPost')
     def test_get_post_not_found(self, mock_blog_post_class, mock_get_user, client):
@@ -576,8 +806,8 @@ class TestBlogRoutes:
 
     @patch('app.routes.blog.AuthService.get_current_user')
     @patch('app.routes.blog.BlogPost')
-    @patch('app.routes.blog.PDFGeneratorTool')
-    def test_download_post_pdf_success(self, mock_pdf_tool_class, mock_blog_post_class, mock_get_user, client):
+    @patch('app.routes.blog.pdf_generator')
+    def test_download_post_pdf_success(self, mock_pdf_tool, mock_blog_post_class, mock_get_user, client):
         """Test successful post PDF download"""
         mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
 
@@ -590,13 +820,86 @@ class TestBlogRoutes:
         mock_blog_post = mock_blog_post_class.return_value
         mock_blog_post.get_post_by_id.return_value = mock_post
 
-        mock_pdf_tool = mock_pdf_tool_class.return_value
-        mock_pdf_tool.generate_pdf_bytes.return_value = b'PDF content'
+        mock_pdf_tool.write_pdf.side_effect = lambda content, fileobj: fileobj.write(b'PDF content')
 
         response = client.get('/download-post/456')
         assert response.status_code == 200
         assert response.content_type == 'application/pdf'
 
+    @patch('app.routes.blog.AuthService.get_current_user')
+    @patch('app.routes.blog.BlogPost')
+    @patch('app.routes.blog.pdf_generator')
+    def test_download_post_pdf_headers(self, mock_pdf_tool, mock_blog_post_class, mock_get_user, client):
+        """Test post PDF download sets attachment headers for non-ASCII titles"""
+        mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
+        mock_blog_post_class.return_value.get_post_by_id.return_value = {
+            '_id': '456', 'title': 'Café Post', 'content': '# Café Post'
+        }
+        mock_pdf_tool.write_pdf.side_effect = lambda content, fileobj: fileobj.write(b'PDF content')
+
+        response = client.get('/download-post/456')
+
+        assert response.status_code == 200
+        assert response.data == b'PDF content'
+        assert response.headers['Content-Length'] == str(len(b'PDF content'))
+        disposition = response.headers['Content-Disposition']
+        assert disposition.startswith('attachment')
+        assert 'filename=Cafe-Post_blog.pdf' in disposition
+        assert "filename*=UTF-8''Caf%C3%A9-Post_blog.pdf" in disposition
+
+    @patch('app.routes.blog.AuthService.get_current_user')
+    @patch('app.routes.blog.BlogPost')
+    @patch('app.routes.blog.pdf_generator')
+    def test_download_post_pdf_range(self, mock_pdf_tool, mock_blog_post_class, mock_get_user, client):
+        """Test post PDF downloads are served from a file and support ranges"""
+        mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
+        mock_blog_post_class.return_value.get_post_by_id.return_value = {
+            '_id': '456', 'title': 'Test Post', 'content': '# Test Post'
+        }
+        written = []
+
+        def write_pdf(content, fileobj):
+            written.append(fileobj.name)
+            fileobj.write(b'PDF content')
+
+        mock_pdf_tool.write_pdf.side_effect = write_pdf
+
+        response = client.get('/download-post/456', headers={'Range': 'bytes=0-2'})
+
+        assert response.status_code == 206
+        assert response.data == b'PDF'
+        assert not os.path.exists(written[0])
+
+    @patch('app.routes.blog.AuthService.get_current_user')
+    @patch('app.routes.blog.BlogPost')
+    @patch('app.routes.blog.pdf_generator')
+    def test_download_post_pdf_not_modified(self, mock_pdf_tool, mock_blog_post_class, mock_get_user, client):
+        """Test a repeat download with a matching ETag skips PDF generation"""
+        mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
+        mock_blog_post_class.return_value.get_post_by_id.return_value = {
+            '_id': '456', 'title': 'Test Post', 'content': '# Test Post'
+        }
+        mock_pdf_tool.write_pdf.side_effect = lambda content, fileobj: fileobj.write(b'PDF content')
+
+        first = client.get('/download-post/456')
+        etag = first.headers['ETag']
+        second = client.get('/download-post/456', headers={'If-None-Match': etag})
+
+        assert first.status_code == 200
+        assert etag.startswith('W/')
+        assert second.status_code == 304
+        assert second.headers['ETag'] == etag
+        mock_pdf_tool.write_pdf.assert_called_once()
+
+        # Edited content gets a new ETag and a fresh PDF
+        mock_blog_post_class.return_value.get_post_by_id.return_value = {
+            '_id': '456', 'title': 'Test Post', 'content': '# Test Post\nEdited'
+        }
+        third = client.get('/download-post/456', headers={'If-None-Match': etag})
+
+        assert third.status_code == 200
+        assert third.headers['ETag'] != etag
+
     @patch('app.routes.blog.AuthService.get_current_user')
     @patch('app.routes.blog.BlogPost')
     def test_download_post_pdf_db_exception(self, mock_blog_post_class, mock_get_user, client):
@@ -613,8 +916,8 @@ class TestBlogRoutes:
 
     @patch('app.routes.blog.AuthService.get_current_user')
     @patch('app.routes.blog.BlogPost')
-    @patch('app.routes.blog.PDFGeneratorTool')
-    def test_download_post_pdf_generation_exception(self, mock_pdf_tool_class, mock_blog_post_class, mock_get_user, client):
+    @patch('app.routes.blog.pdf_generator')
+    def test_download_post_pdf_generation_exception(self, mock_pdf_tool, mock_blog_post_class, mock_get_user, client):
         """Test post PDF download with generation exception"""
         mock_get_user.return_value = {'_id': '123', 'username': 'testuser'}
 
@@ -627,8 +930,7 @@ class TestBlogRoutes:
         mock_blog_post = mock_blog_post_class.return_value
         mock_blog_post.get_post_by_id.return_value = mock_post
 
-        mock_pdf_tool = mock_pdf_tool_class.return_value
-        mock_pdf_tool.generate_pdf_bytes.side_effect = Exception("PDF generation failed")
+        mock_pdf_tool.write_pdf.side_effect = Exception("PDF generation failed")
 
         response = client.get('/download-post/456')
         assert response.status_code == 500
@@ -654,3 +956,137 @@ class TestBlogRoutes:
             assert response.status_code == 500
             # Check that error template was called
             assert any('error.html' in str(call) for call in mock_render.call_args_list)
+
+    @patch('app.routes.blog.pdf_generator', None)
+    def test_pdf_tool_created_once(self):
+        """Test the PDF generator is created on first use and then shared"""
+        from app.crew.tools import PDFGeneratorTool
+        from app.routes.blog import _pdf_tool
+
+        tool = _pdf_tool()
+
+        assert isinstance(tool, PDFGeneratorTool)
+        assert _pdf_tool() is tool
+
+    @patch('app.routes.blog.generate_blog_from_youtube')
+    def test_concurrent_generations_run_once(self, mock_generate, app):
+        """Test concurrent requests for one video share a single generation"""
+        import threading
+
+        from app.routes.blog import _blog_for_video, _generation_locks
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_generate(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return '# Shared Blog\n\n' + 'A' * 100
+
+        mock_generate.side_effect = slow_generate
+        results = []
+
+        def request_blog():
+            with app.app_context():
+                results.append(_blog_for_video(
+                    'https://youtu.be/dQw4w9WgXcQ', 'en', 'dQw4w9WgXcQ'))
+
+        threads = [threading.Thread(target=request_blog) for _ in range(3)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        mock_generate.assert_called_once()
+        assert [entry['title'] for entry, error in results] == ['Shared Blog'] * 3
+        assert not _generation_locks
+
+    @patch('app.routes.blog.pdf_generator')
+    def test_pdf_rendered_in_process_pool(self, mock_pdf_tool, app, tmp_path):
+        """Test PDFs render in worker processes when PDF_WORKERS is set"""
+        import app.routes.blog as blog_module
+
+        app.config['PDF_WORKERS'] = 1
+        try:
+            with app.app_context():
+                path = blog_module._write_pdf_file('# Pool Blog\n\nBody text', str(tmp_path))
+                assert blog_module._pdf_pool() is blog_module._pdf_executor
+        finally:
+            if blog_module._pdf_executor is not None:
+                blog_module._pdf_executor.shutdown()
+                blog_module._pdf_executor = None
+
+        with open(path, 'rb') as fileobj:
+            assert fileobj.read(4) == b'%PDF'
+        mock_pdf_tool.write_pdf.assert_not_called()
+
+    @patch('app.routes.blog.pdf_generator')
+    def test_pdf_rendered_inline_when_pool_broken(self, mock_pdf_tool, app, tmp_path):
+        """Test a broken PDF process pool is dropped and the PDF rendered inline"""
+        from concurrent.futures.process import BrokenProcessPool
+
+        import app.routes.blog as blog_module
+
+        broken_pool = MagicMock()
+        broken_pool.submit.return_value.result.side_effect = BrokenProcessPool()
+        app.config['PDF_WORKERS'] = 1
+        blog_module._pdf_executor = broken_pool
+        try:
+            with app.app_context():
+                path = blog_module._write_pdf_file('# Pool Blog\n\nBody text', str(tmp_path))
+        finally:
+            blog_module._pdf_executor = None
+
+        assert os.path.exists(path)
+        mock_pdf_tool.write_pdf.assert_called_once()
+        broken_pool.submit.return_value.result.assert_called_once_with(
+            timeout=blog_module.PDF_RENDER_TIMEOUT)
+        broken_pool.shutdown.assert_called_once_with(wait=False)
+
+    @patch('app.routes.blog.pdf_generator')
+    def test_pdf_render_timeout_discards_pool(self, mock_pdf_tool, app, tmp_path):
+        """Test a timed out pooled render is cancelled and leaves no file"""
+        import app.routes.blog as blog_module
+
+        slow_pool = MagicMock()
+        future = slow_pool.submit.return_value
+        future.result.side_effect = TimeoutError()
+        app.config['PDF_WORKERS'] = 1
+        blog_module._pdf_executor = slow_pool
+        try:
+            with app.app_context(), pytest.raises(TimeoutError):
+                blog_module._write_pdf_file('# Slow Blog', str(tmp_path))
+            assert blog_module._pdf_executor is None
+        finally:
+            blog_module._pdf_executor = None
+
+        future.cancel.assert_called_once()
+        slow_pool.shutdown.assert_called_once_with(wait=False)
+        assert os.listdir(tmp_path) == []
+        mock_pdf_tool.write_pdf.assert_not_called()
+
+    def test_prune_pdf_cache_sweeps_stale_partial_files(self, tmp_path):
+        """Test abandoned partial renders are removed, recent ones kept"""
+        from app.routes.blog import PDF_PART_MAX_AGE, _prune_pdf_cache
+
+        stale = tmp_path / 'tmpstale.part'
+        stale.write_bytes(b'partial')
+        old = time.time() - PDF_PART_MAX_AGE - 1
+        os.utime(stale, (old, old))
+        (tmp_path / 'tmprecent.part').write_bytes(b'partial')
+        (tmp_path / 'cached.pdf').write_bytes(b'%PDF')
+
+        _prune_pdf_cache(str(tmp_path), 1)
+
+        assert sorted(os.listdir(tmp_path)) == ['cached.pdf', 'tmprecent.part']
+
+    def test_extract_title(self):
+        """Test the blog title comes from the first H1 heading"""
+        from app.routes.blog import _extract_title
+
+        assert _extract_title('# My Blog\n\nBody') == 'My Blog'
+        assert _extract_title('Intro\n\n#  Later Title\nBody') == 'Later Title'
+        assert _extract_title('No heading here') == 'YouTube Blog Post'
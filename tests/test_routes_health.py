@@ -263,4 +263,19 @@ class TestHealthRoutes:
         assert response.status_code == 503
         content = response.get_data(as_text=True)
         assert 'app_health_status 0' in content
-        assert 'System monitoring error' in content
\ No newline at end of file
+        assert 'System monitoring error' in content
+
+    @patch('app.routes.health.mongo_manager')
+    @patch('app.routes.health.psutil')
+    def test_health_reuses_recent_system_stats(self, mock_psutil, mock_mongo, client):
+        """Test repeated probes share one system sample"""
+        mock_mongo.is_connected.return_value = True
+        mock_psutil.cpu_percent.return_value = 10.0
+        mock_psutil.virtual_memory.return_value = MagicMock(percent=20.0, used=1, total=2)
+        mock_psutil.disk_usage.return_value = MagicMock(used=1, total=2, free=1)
+
+        assert client.get('/health').status_code == 200
+        assert client.get('/health-metrics').status_code == 200
+
+        mock_psutil.cpu_percent.assert_called_once()
+        assert mock_mongo.is_connected.call_count == 2
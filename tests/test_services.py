@@ -176,6 +176,24 @@ class TestBlogGeneratorTool:
         # Should fix numbered lists
         assert '1. numbered list' in result or '1.numbered list' in result
 
+    def test_openai_client_is_shared(self):
+        """Test generations reuse one OpenAI client"""
+        from app.services.blog_service import (_openai_client,
+                                               openai_client_context)
+
+        _openai_client.cache_clear()
+        try:
+            with patch('openai.OpenAI') as mock_openai:
+                with openai_client_context() as first:
+                    pass
+                with openai_client_context() as second:
+                    pass
+        finally:
+            _openai_client.cache_clear()
+
+        assert first is second
+        mock_openai.assert_called_once()
+
 
 class TestBlogServiceFunctions:
 
@@ -195,6 +213,21 @@ class TestBlogServiceFunctions:
         assert not result.startswith('ERROR:')
         mock_individual_test.assert_called_once()
 
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key', 'SUPADATA_API_KEY': 'test-key'})
+    @patch('app.services.blog_service.individual_components_test')
+    @patch('app.services.blog_service._extract_video_id')
+    def test_generate_blog_with_parsed_video_id(self, mock_extract_id, mock_individual_test):
+        """Test a video ID parsed by the caller skips URL re-parsing"""
+        from app.services.blog_service import generate_blog_from_youtube
+
+        mock_individual_test.return_value = "A" * 600
+
+        result = generate_blog_from_youtube(
+            'https://youtube.com/watch?v=dQw4w9WgXcQ', video_id='dQw4w9WgXcQ')
+
+        assert not result.startswith('ERROR:')
+        mock_extract_id.assert_not_called()
+
     @patch.dict('os.environ', {}, clear=True)
     def test_generate_blog_missing_openai_key(self):
         """Test blog generation with missing OpenAI API key"""
@@ -494,8 +527,8 @@ class TestBlogServiceFunctions:
 
 class TestAuthService:
     
-    @patch('app.services.auth_service.User')
-    @patch('app.services.auth_service.decode_token')
+    @patch('app.models.user.User')
+    @patch('app.utils.security.decode_token')
     def test_get_current_user_with_token(self, mock_decode, mock_user_class, app):
         """Test getting current user with JWT token"""
         from app.services.auth_service import AuthService
@@ -513,7 +546,7 @@ class TestAuthService:
             assert user is not None
             assert user['username'] == 'testuser'
     
-    @patch('app.services.auth_service.User')
+    @patch('app.models.user.User')
     def test_get_current_user_with_session(self, mock_user_class, app):
         """Test getting current user from session"""
         from app.services.auth_service import AuthService
@@ -29,10 +29,29 @@ class TestValidators:
         assert extract_video_id('https://youtu.be/dQw4w9WgXcQ') == 'dQw4w9WgXcQ'
         assert extract_video_id('https://youtube.com/embed/dQw4w9WgXcQ') == 'dQw4w9WgXcQ'
         
+        assert extract_video_id('youtube.com/watch?feature=share&v=dQw4w9WgXcQ') == 'dQw4w9WgXcQ'
+        assert extract_video_id('https://youtu.be/dQw4w9WgXcQ?t=42') == 'dQw4w9WgXcQ'
+
         # Invalid URLs
         assert extract_video_id('https://vimeo.com/123') is None
+        assert extract_video_id('https://evil.com/?youtube.com/watch?v=dQw4w9WgXcQ') is None
+        assert extract_video_id('http://[invalid') is None
         assert extract_video_id('') is None
     
+    def test_parse_youtube_url(self):
+        """Test combined URL validation and video ID extraction"""
+        from app.utils.validators import parse_youtube_url
+
+        assert parse_youtube_url('https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=1') == 'dQw4w9WgXcQ'
+        assert parse_youtube_url('https://youtu.be/dQw4w9WgXcQ') == 'dQw4w9WgXcQ'
+        assert parse_youtube_url('https://m.youtube.com/shorts/dQw4w9WgXcQ') == 'dQw4w9WgXcQ'
+
+        assert parse_youtube_url('https://youtube.com/watch?v=invalid') is None
+        assert parse_youtube_url('https://vimeo.com/watch?v=dQw4w9WgXcQ') is None
+        assert parse_youtube_url('https://evil.com/?youtube.com/watch?v=dQw4w9WgXcQ') is None
+        assert parse_youtube_url('') is None
+        assert parse_youtube_url('https://youtu.be/dQw4w9WgXcQ?' + 'a' * 2048) is None
+
     def test_sanitize_filename(self):
         """Test filename sanitization"""
         from app.utils.validators import sanitize_filename
@@ -94,6 +113,89 @@ class TestSecurity:
             assert user is not None
             assert user['username'] == 'testuser'
     
+    @patch('app.models.user.User')
+    @patch('app.utils.security.decode_token')
+    def test_get_current_user_cached_per_request(self, mock_decode, mock_user_class, app):
+        """Test the user is resolved once per request"""
+        from app.utils.security import get_current_user
+
+        mock_decode.return_value = {'sub': '123'}
+        mock_user_class.return_value.get_user_by_id.return_value = {
+            '_id': '123',
+            'username': 'testuser'
+        }
+
+        with app.test_request_context(headers={'Authorization': 'Bearer test-token'}):
+            assert get_current_user()['username'] == 'testuser'
+            assert get_current_user()['username'] == 'testuser'
+
+        mock_decode.assert_called_once()
+        mock_user_class.return_value.get_user_by_id.assert_called_once()
+
+    @patch('app.models.user.User')
+    @patch('app.utils.security.decode_token')
+    def test_get_token_user_from_claims(self, mock_decode, mock_user_class, app):
+        """Test the token user comes from the claims without a database read"""
+        from app.utils.security import get_token_user
+
+        mock_decode.return_value = {
+            'sub': '123', 'username': 'testuser', 'email': 'test@example.com'
+        }
+
+        with app.test_request_context(headers={'Authorization': 'Bearer test-token'}):
+            user = get_token_user()
+
+        assert user == {'_id': '123', 'username': 'testuser', 'email': 'test@example.com'}
+        mock_user_class.assert_not_called()
+
+    @patch('app.models.user.User')
+    @patch('app.utils.security.decode_token')
+    def test_get_token_user_without_claims_reads_database(self, mock_decode, mock_user_class, app):
+        """Test tokens without profile claims fall back to the database"""
+        from app.utils.security import get_token_user
+
+        mock_decode.return_value = {'sub': '123'}
+        mock_user_class.return_value.get_user_by_id.return_value = {
+            '_id': '123',
+            'username': 'testuser'
+        }
+
+        with app.test_request_context(headers={'Authorization': 'Bearer test-token'}):
+            assert get_token_user()['username'] == 'testuser'
+
+        mock_user_class.return_value.get_user_by_id.assert_called_once_with('123')
+
+    @patch('app.utils.security.decode_token')
+    def test_token_claims_reused_until_expiry(self, mock_decode, app):
+        """Test a token is verified once and its claims reused until expiry"""
+        import time
+
+        from app.utils.security import _decode_claims
+
+        with app.test_request_context():
+            mock_decode.return_value = {'sub': '123', 'exp': time.time() + 3600}
+            assert _decode_claims('fresh-token')['sub'] == '123'
+            assert _decode_claims('fresh-token')['sub'] == '123'
+            assert mock_decode.call_count == 1
+
+            # Claims are never served past the token's own expiry
+            mock_decode.return_value = {'sub': '123', 'exp': time.time() - 1}
+            _decode_claims('expired-token')
+            _decode_claims('expired-token')
+            assert mock_decode.call_count == 3
+
+        assert b'fresh-token' not in b''.join(app.token_claims)
+
+    @patch('app.utils.security.decode_token')
+    def test_get_token_user_anonymous(self, mock_decode, app):
+        """Test anonymous requests skip token decoding entirely"""
+        from app.utils.security import get_token_user
+
+        with app.test_request_context():
+            assert get_token_user() is None
+
+        mock_decode.assert_not_called()
+
     def test_store_and_retrieve_large_data(self, app):
         """Test storing and retrieving large data"""
         from app.utils.security import retrieve_large_data, store_large_data
@@ -105,7 +207,27 @@ class TestSecurity:
             retrieved = retrieve_large_data('test_key', 'user123')
             
             assert retrieved == data
-    
+
+    def test_store_and_retrieve_large_data_redis(self, app):
+        """Test large data round-trips through Redis when configured"""
+        import json
+
+        from app.utils.security import retrieve_large_data, store_large_data
+
+        mock_redis = MagicMock()
+        app.redis_client = mock_redis
+
+        with app.test_request_context():
+            data = {'blog_content': 'test' * 1000}
+            key = store_large_data('current_blog', data, 'user123')
+
+            mock_redis.setex.assert_called_once_with(
+                'blog:user123_current_blog', 3600, json.dumps(data))
+            assert key not in app.temp_storage
+
+            mock_redis.get.return_value = json.dumps(data)
+            assert retrieve_large_data('current_blog', 'user123') == data
+
     def test_cleanup_old_storage(self, app):
         """Test cleanup of old storage data"""
         import time
@@ -121,4 +243,99 @@ class TestSecurity:
             
             cleanup_old_storage()
             
-            assert 'user123_old_key' not in app.temp_storage
\ No newline at end of file
+            assert 'user123_old_key' not in app.temp_storage
+
+    def test_store_sweeps_expired_storage_periodically(self, app):
+        """Test stores only scan for expired items once per sweep interval"""
+        import time
+
+        from app.utils.security import store_large_data
+
+        with app.test_request_context():
+            store_large_data('old_key', 'old')
+            app.temp_storage['old_key']['timestamp'] = time.time() - 3700
+
+            store_large_data('new_key', 'new')
+            assert 'old_key' in app.temp_storage
+
+            app.temp_storage_swept_at -= 60
+            store_large_data('newer_key', 'newer')
+            assert 'old_key' not in app.temp_storage
+
+    def test_storage_evicts_least_recently_used(self, app):
+        """Test the in-memory storage drops the least recently used item"""
+        from app.utils.security import retrieve_large_data, store_large_data
+
+        app.config['TEMP_STORAGE_MAX_ITEMS'] = 2
+        with app.test_request_context():
+            store_large_data('first', 'a')
+            store_large_data('second', 'b')
+            assert retrieve_large_data('first') == 'a'
+
+            store_large_data('third', 'c')
+
+            assert list(app.temp_storage) == ['first', 'third']
+            assert retrieve_large_data('second') is None
+
+    def test_storage_sweep_during_concurrent_stores(self, app):
+        """Test sweeping the storage while other threads store into it"""
+        import threading
+
+        from app.utils.security import cleanup_old_storage, store_large_data
+
+        errors = []
+
+        def store_items(prefix):
+            try:
+                with app.test_request_context():
+                    for i in range(500):
+                        store_large_data(f'{prefix}{i}', i)
+            except Exception as e:
+                errors.append(e)
+
+        def sweep():
+            try:
+                with app.app_context():
+                    for _ in range(200):
+                        cleanup_old_storage()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=store_items, args=(p,)) for p in 'ab']
+        threads.append(threading.Thread(target=sweep))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        assert errors == []
+        assert len(app.temp_storage) == 1000
+
+    def test_clear_session(self, app):
+        """Test clearing the session only touches a non-empty session"""
+        from flask import session
+
+        from app.utils.security import clear_session
+
+        with app.test_request_context():
+            clear_session()
+            assert not session.modified
+
+            session['user_id'] = 'user123'
+            session['current_blog_id'] = 'post123'
+            clear_session()
+            assert not session
+
+    @patch('app.utils.security.get_token_user')
+    def test_inject_user_is_lazy(self, mock_get_token_user, app):
+        """Test the template user is only resolved when a template uses it"""
+        from app.utils.security import inject_user
+
+        mock_get_token_user.return_value = {'_id': '123', 'username': 'testuser'}
+
+        with app.test_request_context():
+            context = inject_user()
+            mock_get_token_user.assert_not_called()
+
+            assert context['current_user']['username'] == 'testuser'
+            assert context['user_logged_in']